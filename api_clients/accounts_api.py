@@ -45,6 +45,24 @@ class AccountsAPI(APIClient):
         """
         return self.get(f'accounts/{account_id}/balance')
     
+    def create_account(self, account_data):
+        """
+        Create an account for an existing user (admin function)
+        
+        :param account_data: Account data including account_id, user_id, account_type and balance
+        :return: API response
+        """
+        return self.post('admin/accounts', json_data=account_data)
+    
+    def create_payee(self, payee_data):
+        """
+        Add a bill payment payee
+        
+        :param payee_data: Payee data including payee_id, name and account_number
+        :return: API response
+        """
+        return self.post('payees', json_data=payee_data)
+    
     def transfer_funds(self, from_account_id, to_account_id, amount, memo=None):
         """
         Transfer funds between accounts
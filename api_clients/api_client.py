@@ -4,6 +4,8 @@ import os
 import logging
 from json import JSONDecodeError
 
+from api_clients.cassette import get_cassette
+
 class APIClient:
     """
     Base API client for making requests to the bank API
@@ -20,13 +22,17 @@ class APIClient:
         with open(config_path, 'r') as f:
             self.config = json.load(f)
         
-        self.base_url = base_url if base_url else self.config.get('api_base_url')
+        self.base_url = base_url or os.environ.get('API_BASE_URL') or self.config.get('api_base_url')
         self.token = token
         self.timeout = (
             self.config.get('api_timeouts', {}).get('connect', 5),
             self.config.get('api_timeouts', {}).get('read', 10)
         )
         self.logger = logging.getLogger('api_client')
+        # Record/replay of API traffic (see api_clients/cassette.py)
+        self.cassette = get_cassette()
+        # Optional requests.Session for connection reuse in bulk callers (one request per connection if None)
+        self.session = None
     
     def authenticate(self, username, password):
         """
@@ -41,7 +47,7 @@ class APIClient:
         
         self.logger.info(f"Authenticating user: {username}")
         
-        response = requests.post(endpoint, json=payload, timeout=self.timeout)
+        response = self._send('POST', endpoint, json_data=payload)
         if response.status_code == 200:
             self.token = response.json().get('token')
             self.logger.info("Authentication successful")
@@ -78,12 +84,7 @@ class APIClient:
         
         self.logger.debug(f"GET request: {url}")
         
-        response = requests.get(
-            url, 
-            params=params, 
-            headers=self.get_headers(),
-            timeout=self.timeout
-        )
+        response = self._send('GET', url, params=params)
         
         self._log_response(response)
         return response
@@ -101,13 +102,7 @@ class APIClient:
         
         self.logger.debug(f"POST request: {url}")
         
-        response = requests.post(
-            url, 
-            data=data, 
-            json=json_data, 
-            headers=self.get_headers(),
-            timeout=self.timeout
-        )
+        response = self._send('POST', url, data=data, json_data=json_data)
         
         self._log_response(response)
         return response
@@ -125,13 +120,7 @@ class APIClient:
         
         self.logger.debug(f"PUT request: {url}")
         
-        response = requests.put(
-            url, 
-            data=data, 
-            json=json_data, 
-            headers=self.get_headers(),
-            timeout=self.timeout
-        )
+        response = self._send('PUT', url, data=data, json_data=json_data)
         
         self._log_response(response)
         return response
@@ -147,15 +136,40 @@ class APIClient:
         
         self.logger.debug(f"DELETE request: {url}")
         
-        response = requests.delete(
-            url, 
-            headers=self.get_headers(),
-            timeout=self.timeout
-        )
+        response = self._send('DELETE', url)
         
         self._log_response(response)
         return response
     
+    def _send(self, method, url, params=None, data=None, json_data=None):
+        """
+        Send a request, going through the cassette when record/replay is enabled
+        
+        :param method: HTTP method
+        :param url: Full request URL
+        :param params: Query parameters
+        :param data: Form data
+        :param json_data: JSON data
+        :return: API response
+        """
+        headers = self.get_headers()
+        
+        def send_request():
+            return (self.session or requests).request(
+                method,
+                url,
+                params=params,
+                data=data,
+                json=json_data,
+                headers=headers,
+                timeout=self.timeout
+            )
+        
+        if self.cassette:
+            return self.cassette.send(send_request, method, url, params=params, data=data, json_data=json_data,
+                                      authenticated='Authorization' in headers)
+        return send_request()
+    
     def _log_response(self, response):
         """
         Log API response
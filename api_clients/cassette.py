@@ -0,0 +1,305 @@
+import os
+import glob
+import gzip
+import json
+import base64
+import atexit
+import hashlib
+import logging
+import threading
+from collections import deque
+from datetime import timedelta
+from urllib.parse import urlparse, parse_qsl
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Environment variables read by APIClient (set by run_tests.py --api-record/--api-replay)
+CASSETTE_MODE_ENV = "API_CASSETTE_MODE"
+CASSETTE_PATH_ENV = "API_CASSETTE"
+
+# Replaces secrets in recorded responses, which are kept as fixtures
+REDACTED = "<redacted>"
+SENSITIVE_HEADERS = ("authorization", "cookie", "set-cookie")
+
+_cassettes = {}
+_cassettes_lock = threading.Lock()
+
+
+class CassetteMiss(Exception):
+    """
+    Raised in replay mode when no recorded interaction matches a request
+    """
+
+
+def request_key(method, url, params=None, data=None, json_data=None, authenticated=False):
+    """
+    Build the key a request is matched on: method, path, normalized params, body hash and
+    whether the request carried credentials
+
+    The host is left out so a cassette recorded against one environment replays against another.
+    Request bodies (which may hold passwords) only appear as a truncated SHA-256.
+
+    :param method: HTTP method
+    :param url: Full request URL (query string params are merged with params)
+    :param params: Query parameters
+    :param data: Form data
+    :param json_data: JSON data
+    :param authenticated: True if the request had an Authorization header
+    :return: Key string
+    """
+    parsed = urlparse(url)
+    query = parse_qsl(parsed.query, keep_blank_values=True)
+    for name, value in (params or {}).items():
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple)) else [value]
+        query.extend((name, str(v)) for v in values)
+    normalized_params = "&".join(f"{name}={value}" for name, value in sorted(query))
+
+    if json_data is not None:
+        body = json.dumps(json_data, sort_keys=True, separators=(',', ':'), default=str).encode()
+    elif isinstance(data, dict):
+        body = json.dumps(sorted(data.items()), separators=(',', ':'), default=str).encode()
+    elif isinstance(data, str):
+        body = data.encode()
+    else:
+        body = data or b""
+    body_hash = hashlib.sha256(body).hexdigest()[:16] if body else "-"
+
+    auth = "auth" if authenticated else "anon"
+    return f"{method.upper()} {parsed.path.rstrip('/') or '/'}?{normalized_params} {body_hash} {auth}"
+
+
+def _is_sensitive(field):
+    name = field.lower().replace('_', '').replace('-', '')
+    return name.endswith(("token", "password"))
+
+
+def redact(value):
+    """
+    Replace token and password values in decoded JSON
+
+    :param value: Decoded JSON value
+    :return: Tuple (redacted copy, True if anything was replaced)
+    """
+    if isinstance(value, dict):
+        redacted, changed = {}, False
+        for field, item in value.items():
+            if _is_sensitive(field) and isinstance(item, str):
+                redacted[field], changed = REDACTED, True
+            else:
+                redacted[field], item_changed = redact(item)
+                changed = changed or item_changed
+        return redacted, changed
+    if isinstance(value, list):
+        items = [redact(item) for item in value]
+        return [item for item, _ in items], any(changed for _, changed in items)
+    return value, False
+
+
+def _serialize_response(response):
+    entry = {
+        "status": response.status_code,
+        "reason": response.reason,
+        "headers": {
+            name: REDACTED if name.lower() in SENSITIVE_HEADERS else value for name, value in response.headers.items()
+        },
+        "url": response.url,
+    }
+    try:
+        entry["text"] = response.content.decode('utf-8')
+    except UnicodeDecodeError:
+        entry["base64"] = base64.b64encode(response.content).decode('ascii')
+        return entry
+    try:
+        body, changed = redact(json.loads(entry["text"]))
+    except ValueError:
+        return entry
+    if changed:
+        entry["text"] = json.dumps(body)
+    return entry
+
+
+def _build_response(entry):
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.reason = entry.get("reason")
+    response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+    response.url = entry.get("url")
+    response.encoding = 'utf-8'
+    response.elapsed = timedelta(0)
+    if "base64" in entry:
+        response._content = base64.b64decode(entry["base64"])
+    else:
+        response._content = entry.get("text", "").encode('utf-8')
+    return response
+
+
+def recording_parts(path):
+    """
+    Per-process recording files of a cassette (<path>.<pid>)
+
+    :param path: Cassette path
+    :return: Sorted list of part file paths
+    """
+    return sorted(part for part in glob.glob(glob.escape(path) + ".*") if part.rsplit(".", 1)[1].isdigit())
+
+
+def start_recording(path):
+    """
+    Delete an earlier recording of a cassette and its leftover part files
+
+    :param path: Cassette path
+    """
+    for existing in [path] + recording_parts(path):
+        if os.path.exists(existing):
+            os.remove(existing)
+
+
+def merge_recording(path):
+    """
+    Append the per-process part files to the cassette and delete them
+
+    A gzip file may hold several members, so the parts are concatenated as they are.
+    Close the cassettes of this process (close_cassettes()) before merging.
+
+    :param path: Cassette path
+    :return: Number of parts merged
+    """
+    parts = recording_parts(path)
+    with open(path, 'ab') as merged:
+        for part in parts:
+            with open(part, 'rb') as f:
+                merged.write(f.read())
+            os.remove(part)
+    return len(parts)
+
+
+class Cassette:
+    """
+    Record/replay store of API request/response pairs.
+
+    The file is gzip-compressed JSON lines, one interaction per line. Every recording
+    process writes its own part file (<path>.<pid>), so a test runner, its behave child
+    and parallel workers never truncate each other's traffic; merge_recording() combines
+    the parts, and replay also reads parts that were not merged. Tokens, passwords and
+    auth headers in responses are redacted before they are written. On replay the
+    interactions are indexed by request key; repeated identical requests are served
+    in recorded order and the last recording is reused once they run out.
+    """
+
+    def __init__(self, path, mode=REPLAY):
+        """
+        Initialize the cassette
+
+        :param path: Path to the cassette file (.jsonl.gz)
+        :param mode: 'record' to capture traffic, 'replay' to serve it without network
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unsupported cassette mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index = {}
+        self._file = None
+
+        if mode == REPLAY:
+            self._load()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.part_path = f"{path}.{os.getpid()}"
+            self._file = gzip.open(self.part_path, 'wt', encoding='utf-8')
+            logger.info(f"Recording API traffic to {self.part_path}")
+
+    def _load(self):
+        count = 0
+        files = ([self.path] if os.path.exists(self.path) else []) + recording_parts(self.path)
+        if not files:
+            raise FileNotFoundError(f"No cassette at {self.path}")
+        for path in files:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    interaction = json.loads(line)
+                    self._index.setdefault(interaction["key"], deque()).append(interaction["response"])
+                    count += 1
+        logger.info(f"Loaded {count} recorded API interactions ({len(self._index)} unique requests) from {self.path}")
+
+    def send(self, send_request, method, url, params=None, data=None, json_data=None, authenticated=False):
+        """
+        Serve a request from the cassette or send it and record the response
+
+        :param send_request: Callable that performs the real request and returns a requests.Response
+        :param method: HTTP method
+        :param url: Request URL
+        :param params: Query parameters
+        :param data: Form data
+        :param json_data: JSON data
+        :param authenticated: True if the request has an Authorization header
+        :return: requests.Response (the real, unredacted one in record mode)
+        """
+        key = request_key(method, url, params, data, json_data, authenticated)
+
+        if self.mode == REPLAY:
+            with self._lock:
+                recorded = self._index.get(key)
+                if not recorded:
+                    self.misses += 1
+                    raise CassetteMiss(f"No recorded interaction for {key} in {self.path}")
+                self.hits += 1
+                entry = recorded.popleft() if len(recorded) > 1 else recorded[0]
+            return _build_response(entry)
+
+        response = send_request()
+        line = json.dumps({"key": key, "response": _serialize_response(response)}, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+        return response
+
+    def close(self):
+        """Close the cassette file (record mode)"""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+                logger.info(f"Saved recorded API traffic to {self.part_path}")
+
+
+def get_cassette(path=None, mode=None):
+    """
+    Get the process-wide cassette for a path, creating it on first use
+
+    :param path: Cassette path (defaults to the API_CASSETTE environment variable)
+    :param mode: 'record' or 'replay' (defaults to the API_CASSETTE_MODE environment variable)
+    :return: Cassette, or None when record/replay is not enabled
+    """
+    path = path or os.environ.get(CASSETTE_PATH_ENV)
+    mode = mode or os.environ.get(CASSETTE_MODE_ENV)
+    if not path or not mode:
+        return None
+
+    with _cassettes_lock:
+        cassette = _cassettes.get(path)
+        if cassette is None:
+            cassette = Cassette(path, mode)
+            _cassettes[path] = cassette
+            atexit.register(cassette.close)
+        return cassette
+
+
+def close_cassettes():
+    """Close every cassette of this process."""
+    with _cassettes_lock:
+        for cassette in _cassettes.values():
+            cassette.close()
@@ -98,6 +98,22 @@ class UserManagementAPI(APIClient):
         self.logger.info(f"Setting status for user {user_id} to {status}")
         return self.put(endpoint, json_data=payload)
     
+    def set_user_password(self, user_id, password):
+        """
+        Set a user's password (admin function)
+        
+        :param user_id: User ID
+        :param password: New password
+        :return: API response
+        """
+        endpoint = f'admin/users/{user_id}/password'
+        payload = {
+            "password": password
+        }
+        
+        self.logger.info(f"Setting password for user {user_id}")
+        return self.put(endpoint, json_data=payload)
+    
     def request_password_reset(self, username_or_email):
         """
         Initiate password reset process
@@ -0,0 +1,123 @@
+from datetime import date, timedelta
+
+TITLE = "Banking Application"
+
+
+def _document(body):
+    return f"<html><head><title>{TITLE}</title></head><body>{body}</body></html>"
+
+
+def login_page():
+    return _document("""
+        <form id="login-form">
+            <input id="login-username" type="text">
+            <input id="login-password" type="password">
+            <input id="remember-me" type="checkbox">
+            <button id="btn-login" data-navigate="dashboard">Log In</button>
+            <a href="/forgot-password">Forgot Password</a>
+            <a href="/forgot-username">Forgot Username</a>
+            <a href="/register" data-navigate="register">Register</a>
+        </form>
+    """)
+
+
+def dashboard_page():
+    return _document("""
+        <h1 id="dashboard-header">Welcome back</h1>
+        <section id="account-summary">
+            <div>Checking <span id="checking-balance">$5,000.00</span></div>
+            <div>Savings <span id="savings-balance">$10,000.00</span></div>
+        </section>
+        <nav>
+            <a id="transaction-history-link" data-navigate="transactions">Transaction History</a>
+            <a id="transfer-funds-link">Transfer Funds</a>
+            <a id="bill-pay-link">Pay Bills</a>
+            <a id="external-transfer-link">External Transfer</a>
+        </nav>
+        <ul id="registered-payees">
+            <li>Electric Company</li>
+            <li>Mortgage Lender</li>
+            <li>Internet Provider</li>
+        </ul>
+    """)
+
+
+def transactions_page(num_transactions=50):
+    descriptions = ["Debit Card Purchase - Amazon", "Direct Deposit", "ATM Withdrawal", "Bill Payment", "Transfer In"]
+    today = date.today()
+    rows = []
+    for i in range(num_transactions):
+        rows.append(
+            '<li class="transaction-item">'
+            f'<span class="transaction-date">{(today - timedelta(days=i)).strftime("%m/%d/%Y")}</span>'
+            f'<span class="transaction-description">{descriptions[i % len(descriptions)]}</span>'
+            f'<span class="transaction-amount">${(i * 37) % 1000 + 0.99:,.2f}</span>'
+            '</li>'
+        )
+    return _document(f"""
+        <h1 id="transaction-history-header">Transaction History</h1>
+        <select id="filter-transactions">
+            <option value="all">All</option>
+            <option value="deposits">Deposits</option>
+            <option value="withdrawals">Withdrawals</option>
+            <option value="transfers">Transfers</option>
+        </select>
+        <input id="date-range-start" type="text">
+        <input id="date-range-end" type="text">
+        <button id="apply-filter">Apply</button>
+        <button id="download-csv">Download CSV</button>
+        <ul id="transaction-list">{''.join(rows)}</ul>
+        <button id="pagination-prev" class="disabled">Previous</button>
+        <button id="pagination-next">Next</button>
+    """)
+
+
+def profile_page():
+    return _document("""
+        <h1 id="profile-management-header">Profile Management</h1>
+        <ul id="profile-menu">
+            <li><a>Personal Information</a></li>
+            <li><a>Change Password</a></li>
+            <li><a>Security Questions</a></li>
+            <li><a>Two-Factor Authentication</a></li>
+        </ul>
+        <section id="personal-information-section">
+            <div id="full-name">Jane Doe</div>
+            <div id="email-address">jane.doe@example.com</div>
+            <div id="phone-number">(555) 123-4567</div>
+            <div id="mailing-address">123 Main St, Springfield, IL 62701</div>
+        </section>
+        <button id="edit-button">Edit</button>
+        <button id="logout-button">Log Out</button>
+    """)
+
+
+def registration_page():
+    return _document("""
+        <div id="registration-progress">Step 1 of 5</div>
+        <h2>Personal Information</h2>
+        <input id="first-name" type="text">
+        <input id="last-name" type="text">
+        <input id="email" type="text">
+        <input id="phone" type="text">
+        <input id="date-of-birth" type="text">
+        <input id="ssn" type="text">
+        <button id="previous-btn">Previous</button>
+        <button id="next-btn">Next</button>
+    """)
+
+
+def default_pages(num_transactions=50):
+    """
+    Get the canned pages keyed by the URL path segment that loads them
+
+    :param num_transactions: Number of rows on the transaction history page
+    :return: Dictionary of page name to HTML
+    """
+    return {
+        "login": login_page(),
+        "dashboard": dashboard_page(),
+        "transactions": transactions_page(num_transactions),
+        "profile": profile_page(),
+        "register": registration_page(),
+    }
@@ -0,0 +1,393 @@
+import re
+import time
+import uuid
+from html.parser import HTMLParser
+
+from selenium.webdriver.common.options import ArgOptions
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# Elements that never have a closing tag
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+
+class FakeNode:
+    """A DOM node of a canned page."""
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = dict(attrs or {})
+        self.parent = parent
+        self.children = []
+        self.text_parts = []
+        self.id = str(uuid.uuid4())
+        self.value = self.attrs.get('value', '')
+        self.selected = 'checked' in self.attrs or 'selected' in self.attrs
+
+    @property
+    def classes(self):
+        return self.attrs.get('class', '').split()
+
+    @property
+    def own_text(self):
+        return " ".join(part.strip() for part in self.text_parts if part.strip())
+
+    @property
+    def text(self):
+        """Visible text of the node and its descendants, like WebElement.text"""
+        if not self.is_displayed():
+            return ""
+        parts = [self.own_text] + [child.text for child in self.children]
+        return " ".join(part for part in parts if part)
+
+    def iter_descendants(self):
+        for child in self.children:
+            yield child
+            yield from child.iter_descendants()
+
+    def is_displayed(self):
+        node = self
+        while node is not None:
+            if 'hidden' in node.attrs or 'display:none' in node.attrs.get('style', '').replace(' ', ''):
+                return False
+            node = node.parent
+        return True
+
+    def get_attribute(self, name):
+        if name == 'value':
+            return self.value
+        if name in ('checked', 'selected'):
+            return "true" if self.selected else None
+        return self.attrs.get(name)
+
+
+class _DomBuilder(HTMLParser):
+    """Builds a FakeNode tree from HTML."""
+
+    def __init__(self):
+        super().__init__()
+        self.root = FakeNode('#document')
+        self._current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        node = FakeNode(tag, {name: (value if value is not None else '') for name, value in attrs}, self._current)
+        self._current.children.append(node)
+        if tag not in VOID_TAGS:
+            self._current = node
+
+    def handle_startendtag(self, tag, attrs):
+        node = FakeNode(tag, {name: (value if value is not None else '') for name, value in attrs}, self._current)
+        self._current.children.append(node)
+
+    def handle_endtag(self, tag):
+        node = self._current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self._current = node.parent
+
+    def handle_data(self, data):
+        self._current.text_parts.append(data)
+
+
+def parse_html(html):
+    """
+    Parse canned HTML into a FakeNode tree
+
+    :param html: HTML markup
+    :return: Document node
+    """
+    builder = _DomBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+# Selector matching (the subset of CSS and XPath used by the page objects)
+
+_CSS_PART = re.compile(r"""
+    (?P<tag>^[a-zA-Z][\w-]*) |
+    \#(?P<id>[\w-]+) |
+    \.(?P<cls>[\w-]+) |
+    \[(?P<attr>[\w-]+)(?:(?P<op>\^?=)['"]?(?P<val>[^'"\]]*)['"]?)?\]
+""", re.VERBOSE)
+
+
+def _parse_css_compound(compound):
+    conditions = []
+    position = 0
+    while position < len(compound):
+        match = _CSS_PART.match(compound, position)
+        if not match:
+            raise ValueError(f"Unsupported CSS selector: {compound}")
+        conditions.append(match)
+        position = match.end()
+    return conditions
+
+
+def _matches_css_compound(node, conditions):
+    for condition in conditions:
+        if condition.group('tag') and node.tag != condition.group('tag').lower():
+            return False
+        if condition.group('id') and node.attrs.get('id') != condition.group('id'):
+            return False
+        if condition.group('cls') and condition.group('cls') not in node.classes:
+            return False
+        if condition.group('attr'):
+            actual = node.attrs.get(condition.group('attr'))
+            if actual is None:
+                return False
+            if condition.group('op') == '=' and actual != condition.group('val'):
+                return False
+            if condition.group('op') == '^=' and not actual.startswith(condition.group('val')):
+                return False
+    return True
+
+
+def select_css(scope, selector):
+    """
+    Find nodes under scope matching a CSS selector (descendant combinators, tag, #id, .class, [attr], [attr=v], [attr^=v])
+
+    :param scope: Node to search under
+    :param selector: CSS selector
+    :return: List of matching nodes in document order
+    """
+    results = []
+    for group in selector.split(','):
+        compounds = [_parse_css_compound(part) for part in group.split()]
+        candidates = [scope]
+        for conditions in compounds:
+            found = []
+            for candidate in candidates:
+                for node in candidate.iter_descendants():
+                    if _matches_css_compound(node, conditions) and node not in found:
+                        found.append(node)
+            candidates = found
+        results.extend(node for node in candidates if node not in results)
+    return results
+
+
+_XPATH_STEP = re.compile(r"(?P<axis>//|/)(?P<tag>[\w.*-]+)(?P<predicates>(?:\[[^\]]*\])*)")
+_XPATH_PREDICATE = re.compile(r"""
+    @(?P<attr>[\w-]+)\s*=\s*['"](?P<attr_val>[^'"]*)['"] |
+    contains\(\s*text\(\)\s*,\s*['"](?P<text_val>[^'"]*)['"]\s*\) |
+    contains\(\s*@(?P<cattr>[\w-]+)\s*,\s*['"](?P<cattr_val>[^'"]*)['"]\s*\) |
+    text\(\)\s*=\s*['"](?P<eq_text>[^'"]*)['"]
+""", re.VERBOSE)
+
+
+def _matches_xpath_step(node, tag, predicates):
+    if tag != '*' and node.tag != tag.lower():
+        return False
+    for predicate in predicates:
+        if predicate.group('attr') and node.attrs.get(predicate.group('attr')) != predicate.group('attr_val'):
+            return False
+        if predicate.group('text_val') is not None and predicate.group('text_val') not in node.own_text:
+            return False
+        if predicate.group('cattr') and predicate.group('cattr_val') not in node.attrs.get(predicate.group('cattr'), ''):
+            return False
+        if predicate.group('eq_text') is not None and node.own_text != predicate.group('eq_text'):
+            return False
+    return True
+
+
+def select_xpath(scope, expression):
+    """
+    Find nodes matching a simple XPath expression (/ and // steps with @attr, text() and contains() predicates, | unions)
+
+    :param scope: Node to search under
+    :param expression: XPath expression
+    :return: List of matching nodes in document order
+    """
+    results = []
+    for branch in expression.split('|'):
+        branch = branch.strip()
+        if branch.startswith('.'):
+            branch = branch[1:]
+        candidates = [scope]
+        for step in _XPATH_STEP.finditer(branch):
+            predicates = list(_XPATH_PREDICATE.finditer(step.group('predicates')))
+            found = []
+            for candidate in candidates:
+                pool = candidate.iter_descendants() if step.group('axis') == '//' else candidate.children
+                for node in pool:
+                    if _matches_xpath_step(node, step.group('tag'), predicates) and node not in found:
+                        found.append(node)
+            candidates = found
+        results.extend(node for node in candidates if node not in results)
+    return results
+
+
+class FakeCommandExecutor:
+    """
+    In-memory command executor that answers W3C WebDriver commands from canned pages.
+
+    Clicking an element with a data-navigate attribute loads that page, and
+    driver.get() loads the page registered for the last path segment of the URL.
+    """
+
+    def __init__(self, pages, start_page=None, latency=0.0):
+        """
+        Initialize the executor
+
+        :param pages: Dictionary of page name to HTML (or callable returning HTML)
+        :param start_page: Page loaded when the session starts
+        :param latency: Simulated round-trip time per command in seconds
+        """
+        self.pages = pages
+        self.latency = latency
+        self.command_count = 0
+        self.document = None
+        self.current_page = None
+        self._elements = {}
+        self._handlers = {
+            Command.NEW_SESSION: self._new_session,
+            Command.GET: self._get,
+            Command.GET_TITLE: lambda params: self.document_title(),
+            Command.GET_CURRENT_URL: lambda params: f"fake://{self.current_page}",
+            Command.FIND_ELEMENT: lambda params: self._find(self.document, params, single=True),
+            Command.FIND_ELEMENTS: lambda params: self._find(self.document, params, single=False),
+            Command.FIND_CHILD_ELEMENT: lambda params: self._find(self._node(params), params, single=True),
+            Command.FIND_CHILD_ELEMENTS: lambda params: self._find(self._node(params), params, single=False),
+            Command.GET_ELEMENT_TEXT: lambda params: self._node(params).text,
+            Command.CLICK_ELEMENT: self._click,
+            Command.CLEAR_ELEMENT: self._clear,
+            Command.SEND_KEYS_TO_ELEMENT: self._send_keys,
+            Command.IS_ELEMENT_SELECTED: lambda params: self._node(params).selected,
+            Command.IS_ELEMENT_ENABLED: lambda params: 'disabled' not in self._node(params).attrs,
+            Command.GET_ELEMENT_ATTRIBUTE: lambda params: self._node(params).get_attribute(params['name']),
+            Command.GET_ELEMENT_PROPERTY: lambda params: self._node(params).get_attribute(params['name']),
+            Command.GET_ELEMENT_TAG_NAME: lambda params: self._node(params).tag,
+            Command.W3C_EXECUTE_SCRIPT: self._execute_script,
+            Command.SET_TIMEOUTS: lambda params: None,
+            Command.W3C_MAXIMIZE_WINDOW: lambda params: None,
+            Command.DELETE_ALL_COOKIES: lambda params: None,
+            Command.QUIT: lambda params: None,
+        }
+        if start_page:
+            self.load(start_page)
+
+    def load(self, page):
+        html = self.pages[page]
+        self.document = parse_html(html() if callable(html) else html)
+        self.current_page = page
+        self._elements = {}
+
+    def document_title(self):
+        titles = select_css(self.document, 'title')
+        return titles[0].own_text if titles else ""
+
+    def execute(self, command, params):
+        self.command_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        handler = self._handlers.get(command)
+        if handler is None:
+            return {"status": "unknown command", "value": {"message": f"Fake driver does not support {command}"}}
+        try:
+            return {"value": handler(params or {})}
+        except _CommandError as e:
+            return {"status": e.status, "value": {"message": e.message}}
+
+    def _new_session(self, params):
+        return {"sessionId": str(uuid.uuid4()), "capabilities": {"browserName": "fake", "platformName": "linux"}}
+
+    def _get(self, params):
+        page = params['url'].rstrip('/').rsplit('/', 1)[-1]
+        if page not in self.pages:
+            raise _CommandError("unknown error", f"No canned page for {params['url']}")
+        self.load(page)
+
+    def _register(self, node):
+        self._elements[node.id] = node
+        return {ELEMENT_KEY: node.id}
+
+    def _node(self, params):
+        node = self._elements.get(params.get('id'))
+        if node is None:
+            raise _CommandError("stale element reference", "Element is not attached to the current page")
+        return node
+
+    def _find(self, scope, params, single):
+        using, value = params['using'], params['value']
+        if using == 'css selector':
+            nodes = select_css(scope, value)
+        elif using == 'xpath':
+            nodes = select_xpath(scope, value)
+        elif using == 'tag name':
+            nodes = select_css(scope, value)
+        else:
+            raise _CommandError("invalid argument", f"Unsupported locator strategy: {using}")
+
+        if single:
+            if not nodes:
+                raise _CommandError("no such element", f"Unable to locate element: {using}={value}")
+            return self._register(nodes[0])
+        return [self._register(node) for node in nodes]
+
+    def _click(self, params):
+        node = self._node(params)
+        if node.attrs.get('type') in ('checkbox', 'radio'):
+            node.selected = not node.selected if node.attrs['type'] == 'checkbox' else True
+        target = node.attrs.get('data-navigate')
+        if target:
+            self.load(target)
+
+    def _clear(self, params):
+        self._node(params).value = ''
+
+    def _send_keys(self, params):
+        node = self._node(params)
+        node.value += params.get('text', '')
+
+    def _execute_script(self, params):
+        script = params.get('script', '')
+        args = params.get('args', [])
+        element = self._elements.get(args[0].get(ELEMENT_KEY)) if args and isinstance(args[0], dict) else None
+
+        if script.startswith('/* isDisplayed */'):
+            return element.is_displayed() if element else False
+        if script.startswith('/* getAttribute */'):
+            return element.get_attribute(args[1]) if element else None
+        # Other scripts are treated as no-ops
+        return None
+
+
+class _CommandError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class FakeWebDriver(WebDriver):
+    """
+    Selenium WebDriver backed by FakeCommandExecutor.
+
+    It is a real selenium WebDriver, so page objects, waits and expected
+    conditions run unchanged and every round trip goes through execute().
+    """
+
+    def __init__(self, pages, start_page=None, latency=0.0, base_url="fake://mybank"):
+        """
+        Initialize the fake driver
+
+        :param pages: Dictionary of page name to HTML (or callable returning HTML)
+        :param start_page: Page loaded when the session starts
+        :param latency: Simulated round-trip time per command in seconds
+        :param base_url: Value exposed as driver.base_url (used by page objects' navigate())
+        """
+        self.base_url = base_url
+        super().__init__(command_executor=FakeCommandExecutor(pages, start_page, latency), options=ArgOptions())
+
+    @property
+    def command_count(self):
+        """Number of commands received by the fake executor, i.e. WebDriver round trips"""
+        return self.command_executor.command_count
+
+    def load_page(self, page):
+        """Load a canned page without issuing a WebDriver command."""
+        self.command_executor.load(page)
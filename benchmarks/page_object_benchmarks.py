@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for page objects against an in-memory fake WebDriver.
+
+Measures time and WebDriver round trips per page object call without a
+browser or the bank site, so regressions in page objects can be caught on
+any machine:
+
+    python benchmarks/page_object_benchmarks.py
+    python benchmarks/page_object_benchmarks.py --output bench.json
+    python benchmarks/page_object_benchmarks.py --baseline bench.json
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from benchmarks.canned_pages import default_pages
+from benchmarks.fake_webdriver import FakeWebDriver
+from page_objects.dashboard_page import DashboardPage
+from page_objects.login_page import LoginPage
+from page_objects.profile_page import ProfilePage
+from page_objects.registration_page import RegistrationPage
+from page_objects.transaction_page import TransactionPage
+
+
+def _read_all_transactions(page):
+    # Mirrors 'each transaction should display date, description, and amount'
+    for transaction in page.get_transactions():
+        transaction.has_date()
+        transaction.has_description()
+        transaction.has_amount()
+        transaction.get_amount()
+
+
+# name -> (start page, page object class, call)
+BENCHMARKS = {
+    "LoginPage.login": (
+        "login", LoginPage, lambda page: page.login("standard_user@example.com", "SecureP@ss123!")
+    ),
+    "DashboardPage.get_checking_balance": (
+        "dashboard", DashboardPage, lambda page: page.get_checking_balance()
+    ),
+    "TransactionPage.get_transactions": (
+        "transactions", TransactionPage, lambda page: page.get_transactions()
+    ),
+    "TransactionPage.read_all_transactions": (
+        "transactions", TransactionPage, _read_all_transactions
+    ),
+    "ProfilePage.get_personal_information": (
+        "profile", ProfilePage, lambda page: page.get_personal_information()
+    ),
+    "RegistrationPage.enter_personal_information": (
+        "register", RegistrationPage,
+        lambda page: page.enter_personal_information("Jane", "Doe", "jane@example.com", "5551234567", "01/01/1990", "1234")
+    ),
+}
+
+
+def run_benchmark(driver, name, iterations, wait_timeout):
+    """
+    Run one benchmark
+
+    :param driver: FakeWebDriver instance
+    :param name: Benchmark name
+    :param iterations: Number of timed calls
+    :param wait_timeout: Timeout for explicit waits (elements missing from the canned page fail after this)
+    :return: Dictionary with timing and round-trip statistics
+    """
+    start_page, page_class, call = BENCHMARKS[name]
+    timings = []
+    round_trips = []
+
+    for _ in range(iterations):
+        driver.load_page(start_page)
+        page = page_class(driver)
+        # Page objects wait up to 10-15s for optional elements; fail fast instead
+        page.wait = WebDriverWait(driver, wait_timeout, poll_frequency=0.001)
+
+        commands_before = driver.command_count
+        start = time.perf_counter()
+        call(page)
+        timings.append(time.perf_counter() - start)
+        round_trips.append(driver.command_count - commands_before)
+
+    return {
+        "name": name,
+        "iterations": iterations,
+        "mean_us": round(statistics.mean(timings) * 1e6, 1),
+        "median_us": round(statistics.median(timings) * 1e6, 1),
+        "round_trips_per_call": round(statistics.mean(round_trips), 1),
+    }
+
+
+def compare_with_baseline(results, baseline_path, max_slowdown):
+    """
+    Compare results with a saved baseline
+
+    :param results: List of benchmark results
+    :param baseline_path: Path to a JSON file written with --output
+    :param max_slowdown: Allowed relative increase of median time (0.5 = 50%)
+    :return: List of regression messages
+    """
+    with open(baseline_path, 'r') as f:
+        baseline = {result["name"]: result for result in json.load(f)["results"]}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["name"])
+        if not previous:
+            continue
+        if result["round_trips_per_call"] > previous["round_trips_per_call"]:
+            regressions.append(
+                f"{result['name']}: round trips per call went from "
+                f"{previous['round_trips_per_call']} to {result['round_trips_per_call']}"
+            )
+        if result["median_us"] > previous["median_us"] * (1 + max_slowdown):
+            regressions.append(
+                f"{result['name']}: median time went from {previous['median_us']}us to {result['median_us']}us"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark page objects against an in-memory fake WebDriver')
+    parser.add_argument('--iterations', type=int, default=50, help='Timed calls per benchmark (default: 50)')
+    parser.add_argument('--transactions', type=int, default=50,
+                        help='Rows on the canned transaction history page (default: 50)')
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help='Simulated WebDriver round-trip latency in milliseconds (default: 0)')
+    parser.add_argument('--wait-timeout', type=float, default=0.0,
+                        help='Explicit wait timeout in seconds for missing elements (default: 0)')
+    parser.add_argument('--filter', help='Only run benchmarks whose name contains this text')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--baseline', help='Fail if results regress against this JSON file')
+    parser.add_argument('--max-slowdown', type=float, default=0.5,
+                        help='Allowed relative increase of median time against the baseline (default: 0.5)')
+
+    args = parser.parse_args()
+
+    driver = FakeWebDriver(default_pages(args.transactions), latency=args.latency_ms / 1000)
+
+    results = []
+    print(f"{'benchmark':<45} {'median_us':>10} {'mean_us':>10} {'round trips':>12}")
+    for name in BENCHMARKS:
+        if args.filter and args.filter not in name:
+            continue
+        result = run_benchmark(driver, name, args.iterations, args.wait_timeout)
+        results.append(result)
+        print(f"{name:<45} {result['median_us']:>10} {result['mean_us']:>10} {result['round_trips_per_call']:>12}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.max_slowdown)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == '__main__':
+    main()
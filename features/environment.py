@@ -1,3 +1,5 @@
+import allure
+from allure_commons.types import AttachmentType
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from webdriver_manager.chrome import ChromeDriverManager
@@ -6,6 +8,17 @@ import os
 import json
 import logging
 from datetime import datetime
+from utils.step_profiler import StepProfiler
+from utils.driver_instrumentation import CommandProfiler, instrument_context_driver
+from utils.data_store import TestDataStore
+from utils.user_pool import UserPool
+from utils.mobile_driver_manager import MobileSessionManager, close_driver
+from utils.device_registry import DeviceRegistry
+from utils.artifact_store import get_artifact_store, close_artifact_store
+from utils.network_profiles import NetworkConditions, NetworkPerfRecorder
+
+# Allure attachment type per artifact store image format (formats without one attach by extension)
+IMAGE_ATTACHMENT_TYPES = {'jpeg': AttachmentType.JPG, 'png': AttachmentType.PNG}
 
 # Setup logging
 def setup_logging():
@@ -31,6 +44,28 @@ def load_config():
     with open(config_path, 'r') as f:
         return json.load(f)
 
+def capture_failure_artifacts(context, step):
+    """Store a screenshot and page source of every open driver and attach them to the Allure report."""
+    store = get_artifact_store()
+    scenario = context.scenario.name if getattr(context, 'scenario', None) else None
+    drivers = [(source, getattr(context, name, None)) for source, name in (('mobile', 'mobile_driver'), ('web', 'browser'))]
+    for source, driver in drivers:
+        if driver is None:
+            continue
+        try:
+            screenshot = store.add_screenshot(driver, scenario, step.name, source)
+            page_source = store.add_text('page_source', driver.page_source, scenario, step.name, source,
+                                         'xml' if source == 'mobile' else 'html')
+        except Exception as e:
+            context.logger.warning(f"Could not capture {source} failure artifacts: {e}")
+            continue
+        # The page source is fetched while the screenshot encodes; only the screenshot is attached
+        if screenshot.wait():
+            allure.attach.file(screenshot.path, name=f"{source} screenshot",
+                               attachment_type=IMAGE_ATTACHMENT_TYPES.get(store.image_format),
+                               extension=os.path.splitext(screenshot.path)[1][1:])
+        context.logger.info(f"Saved {source} failure artifacts: {screenshot.path}, {page_source.path}")
+
 def before_all(context):
     context.logger = setup_logging()
     context.logger.info("Starting test execution")
@@ -47,12 +82,82 @@ def before_all(context):
     if not context.config.userdata.get('base_url'):
         context.config.userdata['base_url'] = context.config_data.get('base_url', 'https://banking-app-test.example.com')
 
+    # Indexed store of generated test data (built from test_data/ when it is newer than the store)
+    context.test_data_store = None
+    try:
+        context.test_data_store = TestDataStore.open(context.config.userdata.get('test_data_path'))
+        if context.test_data_store:
+            context.logger.info(f"Test data store: {context.test_data_store.db_path}")
+    except Exception as e:
+        context.logger.warning(f"Test data store unavailable: {e}")
+
+    # Exclusive test users per scenario (enable with -D use_user_pool=true, provision with utils/user_pool.py)
+    context.user_pool = None
+    if context.config.userdata.getbool('use_user_pool', False):
+        context.user_pool = UserPool(api_base_url=context.config.userdata.get('api_base_url'))
+        context.logger.info(f"User pool enabled, {context.user_pool.available()} users available")
+
+    # Exclusive mobile device for this behave process (enable with -D use_device_registry=true)
+    context.device_registry = None
+    context.device_lease = None
+    if context.config.userdata.getbool('use_device_registry', False):
+        context.device_registry = DeviceRegistry.from_config(
+            context.config.userdata.get('mobile_devices_file'),
+            quarantine_seconds=float(context.config.userdata.get('device_quarantine_seconds', 600))
+        )
+        context.device_lease = context.device_registry.lease(
+            timeout=float(context.config.userdata.get('device_lease_timeout', 300)),
+            platform=context.config.userdata.get('mobile_platform')
+        )
+        context.mobile_device = context.device_lease.data
+        context.logger.info(f"Leased mobile device: {context.device_lease.resource_id}")
+
+    # Opt-in (-D reuse_mobile_session=true): one Appium session per device, with the app reset between scenarios
+    context.mobile_sessions = None
+    if context.config.userdata.getbool('reuse_mobile_session', False):
+        context.mobile_sessions = MobileSessionManager(
+            clear_data=context.config.userdata.getbool('mobile_clear_app_data', True)
+        )
+
+    # Network profile for mobile performance runs (enable with -D network_profile=3g|lte|lossy|full)
+    context.network_conditions = None
+    context.network_recorder = None
+    network_profile = context.config.userdata.get('network_profile')
+    if network_profile:
+        context.network_conditions = NetworkConditions(
+            network_profile,
+            mode=context.config.userdata.get('network_throttle_mode', 'emulator'),
+            proxy_upstream=context.config.userdata.get('network_proxy_upstream'),
+            proxy_port=int(context.config.userdata.get('network_proxy_port', 8899))
+        )
+        context.network_recorder = NetworkPerfRecorder(context.network_conditions.profile_name)
+        context.logger.info(f"Network profile '{network_profile}', time-to-content trace: "
+                            f"{context.network_recorder.trace_path}")
+
+    # Step-level profiling (enable with -D profile_steps=true)
+    context.step_profiler = None
+    if context.config.userdata.getbool('profile_steps', False):
+        context.step_profiler = StepProfiler()
+        context.step_profiler.start()
+        context.logger.info(f"Step profiling enabled, trace: {context.step_profiler.trace_path}")
+    
+    # WebDriver command profiling per page object method (enable with -D profile_commands=true)
+    context.command_profiler = None
+    if context.config.userdata.getbool('profile_commands', False):
+        context.command_profiler = CommandProfiler()
+        context.logger.info(f"WebDriver command profiling enabled, profile: {context.command_profiler.profile_path}")
+
 def before_feature(context, feature):
     context.logger.info(f"Starting feature: {feature.name}")
 
 def before_scenario(context, scenario):
     context.logger.info(f"Starting scenario: {scenario.name}")
     
+    context.user_lease = None
+    if context.user_pool:
+        context.user_lease = context.user_pool.lease(timeout=float(context.config.userdata.get('user_pool_timeout', 60)))
+        context.logger.info(f"Leased test user: {context.user_lease.resource_id}")
+    
     # Get browser type from config
     browser_type = context.config.userdata.get('browser', 'chrome')
     context.logger.info(f"Using browser: {browser_type}")
@@ -76,9 +181,32 @@ def before_scenario(context, scenario):
     # Set window size and timeouts
     context.browser.maximize_window()
     context.browser.implicitly_wait(10)
+    # Page objects navigate relative to driver.base_url when it is set
+    context.browser.base_url = context.config.userdata.get('base_url')
+    
+    instrument_context_driver(context, context.browser)
+
+def before_step(context, step):
+    if context.step_profiler:
+        context.step_profiler.before_step(step)
+    if context.network_recorder and 'mobile' in context.scenario.effective_tags:
+        context.network_recorder.before_step(step)
+
+def after_step(context, step):
+    if context.step_profiler:
+        context.step_profiler.after_step(context, step)
+    if context.network_recorder:
+        context.network_recorder.after_step(context, step)
+    if step.status == 'failed' and context.config.userdata.getbool('screenshot_on_failure', True):
+        capture_failure_artifacts(context, step)
 
 def after_scenario(context, scenario):
     context.logger.info(f"Finished scenario: {scenario.name}")
+    if context.user_lease:
+        context.user_pool.release(context.user_lease)
+        context.user_lease = None
+    if hasattr(context, 'mobile_driver') and not context.mobile_sessions:
+        close_driver(context.mobile_driver)
     if hasattr(context, 'browser'):
         context.logger.info("Closing browser")
         context.browser.quit()
@@ -87,4 +215,22 @@ def after_feature(context, feature):
     context.logger.info(f"Finished feature: {feature.name}")
 
 def after_all(context):
+    if context.network_recorder:
+        context.network_recorder.finish(
+            baseline_path=context.config.userdata.get('network_baseline'),
+            tolerance=float(context.config.userdata.get('network_regression_tolerance', 1.25))
+        )
+    if context.network_conditions:
+        context.network_conditions.close()
+    if context.mobile_sessions:
+        context.mobile_sessions.close_all()
+    if context.device_lease:
+        context.device_registry.release(context.device_lease)
+    if context.test_data_store:
+        context.test_data_store.close()
+    if context.command_profiler:
+        context.command_profiler.finish()
+    if context.step_profiler:
+        context.step_profiler.finish(top_n=int(context.config.userdata.get('profile_top_n', 20)))
+    close_artifact_store()
     context.logger.info("Test execution completed")
@@ -4,6 +4,7 @@ import time
 from page_objects.login_page import LoginPage
 from page_objects.dashboard_page import DashboardPage
 from utils.security_utils import SecurityUtils
+from utils.user_pool import leased_credentials
 
 
 @given('the banking application is accessible')
@@ -22,6 +23,7 @@ def step_impl(context):
 
 @when('I enter valid username "{username}" and password "{password}"')
 def step_impl(context, username, password):
+    username, password = leased_credentials(context, username, password)
     context.login_page.enter_username(username)
     context.login_page.enter_password(password)
 
@@ -61,6 +63,7 @@ def step_impl(context):
 
 @when('I attempt to login with username "{username}" and incorrect password "{password}" {attempts:d} times')
 def step_impl(context, username, password, attempts):
+    username, _ = leased_credentials(context, username)
     for i in range(attempts):
         context.login_page.enter_username(username)
         context.login_page.enter_password(password)
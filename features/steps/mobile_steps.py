@@ -2,8 +2,49 @@ from behave import given, when, then
 from hamcrest import assert_that, equal_to, is_not, empty, contains_string, greater_than_or_equal_to
 from decimal import Decimal
 import datetime
-import time
-from utils.mobile_driver_manager import get_android_driver, get_ios_driver
+from mobile_page_objects.locator_registry import get_page
+from utils.artifact_store import get_artifact_store
+from utils.balance_reconciliation import BalanceReconciler
+from utils.mobile_driver_manager import get_android_driver, get_ios_driver, get_app_id, wait_for_app_ready, DeepLinkNavigator
+
+def open_screen(context, screen, tap, **params):
+    """
+    Reach a screen by deep link when -D mobile_deep_links=true, otherwise through the UI
+    
+    :param context: Behave context
+    :param screen: Screen name from DEEP_LINK_ROUTES
+    :param tap: Callable performing the UI navigation
+    :param params: Values for the route's placeholders
+    """
+    if context.config.userdata.getbool('mobile_deep_links', False):
+        if getattr(context, 'deep_links', None) is None or context.deep_links.driver is not context.mobile_driver:
+            context.deep_links = DeepLinkNavigator.from_context(context)
+        context.deep_links.navigate(screen, **params)
+    else:
+        tap()
+
+def reconcile_balances(context, accounts_page, expected=None):
+    """
+    Read every balance on the accounts screen in one snapshot and compare it with the API
+    (with -D mobile_balance_api_check=true) and the expected balances
+    
+    :param context: Behave context
+    :param accounts_page: MobileAccountsPage showing the balances
+    :param expected: Optional dictionary of account type to expected balance
+    :return: BalanceReport, also kept as context.balance_report
+    """
+    accounts_api = None
+    if context.config.userdata.getbool('mobile_balance_api_check', False):
+        from api_clients.accounts_api import AccountsAPI
+        accounts_api = AccountsAPI(base_url=context.config.userdata.get('api_base_url'))
+        response = accounts_api.authenticate(context.mobile_username, context.mobile_password)
+        assert response.status_code == 200, f"API authentication failed: {response.status_code}"
+    
+    report = BalanceReconciler(accounts_api).reconcile(accounts_page.get_all_balances(), expected)
+    artifact = get_artifact_store().add_text('balance_report', report.format(), context.scenario.name, source='mobile')
+    context.logger.info(f"Balance reconciliation report: {artifact.path}")
+    context.balance_report = report
+    return report
 
 @given('I have installed the MyBank mobile app')
 def step_impl(context):
@@ -28,17 +69,23 @@ def step_impl(context):
 @when('I open the mobile banking app')
 def step_impl(context):
     # Initialize the appropriate mobile driver based on config
-    if context.driver_type.lower() == 'android':
+    if context.mobile_sessions:
+        context.mobile_driver = context.mobile_sessions.get_driver(context, context.driver_type)
+    elif context.driver_type.lower() == 'android':
         context.mobile_driver = get_android_driver(context)
     else:
         context.mobile_driver = get_ios_driver(context)
     
+    # Throttle the device's network for performance runs (-D network_profile=...)
+    if context.network_conditions:
+        context.network_conditions.apply(context.mobile_driver)
+    
     # Wait for app to initialize
-    time.sleep(3)
+    wait_for_app_ready(context.mobile_driver, get_app_id(context, context.driver_type))
     
     # Initialize page objects
     from mobile_page_objects.login_page import MobileLoginPage
-    context.mobile_login_page = MobileLoginPage(context.mobile_driver)
+    context.mobile_login_page = get_page(MobileLoginPage, context.mobile_driver)
     
     assert context.mobile_login_page.is_login_page_displayed(), "Mobile login page not displayed"
     context.logger.info("Mobile banking app opened successfully")
@@ -58,7 +105,7 @@ def step_impl(context):
 @then('I should be logged into the mobile app successfully')
 def step_impl(context):
     from mobile_page_objects.dashboard_page import MobileDashboardPage
-    context.mobile_dashboard = MobileDashboardPage(context.mobile_driver)
+    context.mobile_dashboard = get_page(MobileDashboardPage, context.mobile_driver)
     
     # Verify login success
     assert context.mobile_dashboard.is_dashboard_displayed(), "Mobile dashboard not displayed after login"
@@ -104,10 +151,10 @@ def step_impl(context):
 
 @when('I navigate to the accounts screen')
 def step_impl(context):
-    context.mobile_dashboard.tap_accounts_tab()
+    open_screen(context, 'accounts', context.mobile_dashboard.tap_accounts_tab)
     
     from mobile_page_objects.accounts_page import MobileAccountsPage
-    context.mobile_accounts_page = MobileAccountsPage(context.mobile_driver)
+    context.mobile_accounts_page = get_page(MobileAccountsPage, context.mobile_driver)
     
     assert context.mobile_accounts_page.is_accounts_page_displayed(), "Accounts page not displayed"
     context.logger.info("Navigated to accounts screen")
@@ -132,8 +179,6 @@ def step_impl(context):
 
 @then('the balances should be accurate and up-to-date')
 def step_impl(context):
-    # We'd need to compare against expected values from a backend API or database
-    # For this example, we'll just verify that the update timestamp is recent
     last_updated = context.mobile_accounts_page.get_last_updated_timestamp()
     current_time = datetime.datetime.now()
     time_difference = current_time - last_updated
@@ -141,13 +186,18 @@ def step_impl(context):
     # Balances should have been updated within the last hour
     assert time_difference.total_seconds() < 3600, "Account balances may not be up-to-date"
     context.logger.info(f"Balances were last updated at {last_updated}")
+    
+    # Every balance on screen must match the backend
+    report = reconcile_balances(context, context.mobile_accounts_page)
+    assert report.ok, f"App balances do not match the API:\n{report.format()}"
 
 @when('I select my checking account')
 def step_impl(context):
-    context.mobile_accounts_page.select_checking_account()
+    open_screen(context, 'account_details', context.mobile_accounts_page.select_checking_account,
+                account_type='checking')
     
     from mobile_page_objects.account_details_page import MobileAccountDetailsPage
-    context.account_details_page = MobileAccountDetailsPage(context.mobile_driver)
+    context.account_details_page = get_page(MobileAccountDetailsPage, context.mobile_driver)
     
     assert context.account_details_page.is_account_details_displayed(), "Account details page not displayed"
     context.logger.info("Selected checking account")
@@ -202,7 +252,7 @@ def step_impl(context, balance):
 
 @when('I navigate to the transfer screen')
 def step_impl(context):
-    context.mobile_dashboard.tap_transfer_tab()
+    open_screen(context, 'transfer', context.mobile_dashboard.tap_transfer_tab)
     
     from mobile_page_objects.transfer_page import MobileTransferPage
     context.mobile_transfer_page = MobileTransferPage(context.mobile_driver)
@@ -246,24 +296,29 @@ def step_impl(context, balance):
     
     # Navigate back to accounts page to verify balance
     context.mobile_transfer_page.tap_done_button()
-    context.mobile_dashboard.tap_accounts_tab()
+    open_screen(context, 'accounts', context.mobile_dashboard.tap_accounts_tab)
     
     from mobile_page_objects.accounts_page import MobileAccountsPage
-    accounts_page = MobileAccountsPage(context.mobile_driver)
+    accounts_page = get_page(MobileAccountsPage, context.mobile_driver)
     
-    actual_balance = accounts_page.get_checking_account_balance()
-    assert_that(actual_balance, equal_to(expected_balance))
-    context.logger.info(f"Verified checking account balance is now ${actual_balance}")
+    # One pass over every balance; the following savings step reuses the report
+    report = reconcile_balances(context, accounts_page, {'checking': expected_balance})
+    assert_that(report.balance('checking'), equal_to(expected_balance))
+    assert report.ok, f"Balances do not reconcile:\n{report.format()}"
+    context.logger.info(f"Verified checking account balance is now ${report.balance('checking')}")
 
 @then('my savings account balance should be ${balance:f}')
 def step_impl(context, balance):
     expected_balance = Decimal(str(balance))
     
-    # Assuming we're on the accounts page from the previous step
-    from mobile_page_objects.accounts_page import MobileAccountsPage
-    accounts_page = MobileAccountsPage(context.mobile_driver)
+    # The accounts screen was reconciled by the previous step; otherwise read it now
+    report = getattr(context, 'balance_report', None)
+    if report is None:
+        from mobile_page_objects.accounts_page import MobileAccountsPage
+        accounts_page = get_page(MobileAccountsPage, context.mobile_driver)
+        report = reconcile_balances(context, accounts_page)
     
-    actual_balance = accounts_page.get_savings_account_balance()
+    actual_balance = report.balance('savings')
     assert_that(actual_balance, equal_to(expected_balance))
     context.logger.info(f"Verified savings account balance is now ${actual_balance}")
 
@@ -275,7 +330,7 @@ def step_impl(context, payee_name):
 
 @when('I navigate to the bill payment screen')
 def step_impl(context):
-    context.mobile_dashboard.tap_bill_pay_tab()
+    open_screen(context, 'bill_pay', context.mobile_dashboard.tap_bill_pay_tab)
     
     from mobile_page_objects.bill_pay_page import MobileBillPayPage
     context.mobile_bill_pay_page = MobileBillPayPage(context.mobile_driver)
@@ -327,11 +382,11 @@ def step_impl(context, amount):
     context.mobile_dashboard.tap_accounts_tab()
     
     from mobile_page_objects.accounts_page import MobileAccountsPage
-    accounts_page = MobileAccountsPage(context.mobile_driver)
+    accounts_page = get_page(MobileAccountsPage, context.mobile_driver)
     accounts_page.select_checking_account()
     
     from mobile_page_objects.account_details_page import MobileAccountDetailsPage
-    details_page = MobileAccountDetailsPage(context.mobile_driver)
+    details_page = get_page(MobileAccountDetailsPage, context.mobile_driver)
     
     # Check pending transactions
     pending_transactions = details_page.get_pending_transactions()
@@ -6,6 +6,92 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import logging
 import re
 from decimal import Decimal
+from typing import NamedTuple
+
+from mobile_page_objects.locator_registry import get_page, is_android_session, resolve_locators
+from utils.mobile_driver_manager import ScrollEngine, get_window_size, list_signature, wait_for_list_stable
+from utils.page_source import PageSnapshot
+from utils.transaction_categorizer import get_categorizer
+
+# Transaction row fields and their locators inside a transaction item
+TRANSACTION_FIELDS_ANDROID = {
+    "date": (MobileBy.ID, "com.mybank.banking:id/transactionDate"),
+    "merchant": (MobileBy.ID, "com.mybank.banking:id/transactionMerchant"),
+    "amount": (MobileBy.ID, "com.mybank.banking:id/transactionAmount"),
+    "description": (MobileBy.ID, "com.mybank.banking:id/transactionDescription"),
+    "category": (MobileBy.ID, "com.mybank.banking:id/transactionCategory"),
+}
+TRANSACTION_FIELDS_IOS = {
+    "date": (MobileBy.ACCESSIBILITY_ID, "transactionDate"),
+    "merchant": (MobileBy.ACCESSIBILITY_ID, "transactionMerchant"),
+    "amount": (MobileBy.ACCESSIBILITY_ID, "transactionAmount"),
+    "description": (MobileBy.ACCESSIBILITY_ID, "transactionDescription"),
+    "category": (MobileBy.ACCESSIBILITY_ID, "transactionCategory"),
+}
+
+def parse_amount(amount_text):
+    """Parse a displayed amount such as "$123.45" or "-$50.00" into a Decimal (0 if there is none)."""
+    numeric_value = re.search(r'[-+]?\$?([\d,]+\.\d+)', amount_text or "")
+    if numeric_value:
+        cleaned_value = numeric_value.group(1).replace(',', '')
+        # Check if it's a negative amount
+        if '-' in amount_text:
+            return Decimal('-' + cleaned_value)
+        return Decimal(cleaned_value)
+    return Decimal('0')
+
+class TransactionRow(NamedTuple):
+    """
+    Immutable transaction read from a page source snapshot.
+    
+    Offers the same has_*/get_* methods as Transaction without any Appium round trips;
+    a field missing from the row is None.
+    """
+    date: str = None
+    merchant: str = None
+    amount_text: str = None
+    description: str = None
+    category: str = None
+    
+    @classmethod
+    def from_snapshot(cls, snapshot, item, fields):
+        """Read a transaction item node using the field locators for the platform."""
+        values = {}
+        for name, locator in fields.items():
+            node = snapshot.find(locator, item)
+            values["amount_text" if name == "amount" else name] = snapshot.text(node) if node is not None else None
+        return cls(**values)
+    
+    def has_date(self):
+        return self.date is not None
+    
+    def has_merchant(self):
+        return self.merchant is not None
+    
+    def has_amount(self):
+        return self.amount_text is not None
+    
+    def get_date(self):
+        return self.date or ""
+    
+    def get_merchant(self):
+        return self.merchant or ""
+    
+    def get_amount(self):
+        return parse_amount(self.amount_text)
+    
+    def get_description(self):
+        return self.description or ""
+    
+    def get_category(self):
+        return self.category or ""
+    
+    def has_expected_category(self):
+        """Check if the displayed category matches the categorization rules for the description."""
+        return get_categorizer().matches(self.get_description(), self.get_category())
+    
+    def __str__(self):
+        return f"{self.get_date()} | {self.get_merchant()} | ${self.get_amount()}"
 
 class Transaction:
     """Class representing a transaction in the account details."""
@@ -16,18 +102,12 @@ class Transaction:
         self.is_android = is_android
         
         # Extract transaction details based on platform
-        if is_android:
-            self._date_locator = (MobileBy.ID, "com.mybank.banking:id/transactionDate")
-            self._merchant_locator = (MobileBy.ID, "com.mybank.banking:id/transactionMerchant")
-            self._amount_locator = (MobileBy.ID, "com.mybank.banking:id/transactionAmount")
-            self._description_locator = (MobileBy.ID, "com.mybank.banking:id/transactionDescription")
-            self._category_locator = (MobileBy.ID, "com.mybank.banking:id/transactionCategory")
-        else:
-            self._date_locator = (MobileBy.ACCESSIBILITY_ID, "transactionDate")
-            self._merchant_locator = (MobileBy.ACCESSIBILITY_ID, "transactionMerchant")
-            self._amount_locator = (MobileBy.ACCESSIBILITY_ID, "transactionAmount")
-            self._description_locator = (MobileBy.ACCESSIBILITY_ID, "transactionDescription")
-            self._category_locator = (MobileBy.ACCESSIBILITY_ID, "transactionCategory")
+        fields = TRANSACTION_FIELDS_ANDROID if is_android else TRANSACTION_FIELDS_IOS
+        self._date_locator = fields["date"]
+        self._merchant_locator = fields["merchant"]
+        self._amount_locator = fields["amount"]
+        self._description_locator = fields["description"]
+        self._category_locator = fields["category"]
     
     def has_date(self):
         """Check if the transaction has a date."""
@@ -70,18 +150,7 @@ class Transaction:
         """Get the transaction amount as a Decimal."""
         try:
             amount_element = self.element.find_element(*self._amount_locator)
-            amount_text = amount_element.text
-            
-            # Parse amount, removing currency symbol and commas
-            # Example: "$123.45" -> 123.45, "-$50.00" -> -50.00
-            numeric_value = re.search(r'[-+]?\$?([\d,]+\.\d+)', amount_text)
-            if numeric_value:
-                cleaned_value = numeric_value.group(1).replace(',', '')
-                # Check if it's a negative amount
-                if '-' in amount_text:
-                    return Decimal('-' + cleaned_value)
-                return Decimal(cleaned_value)
-            return Decimal('0')
+            return parse_amount(amount_element.text)
         except NoSuchElementException:
             return Decimal('0')
     
@@ -101,6 +170,10 @@ class Transaction:
         except NoSuchElementException:
             return ""
     
+    def has_expected_category(self):
+        """Check if the displayed category matches the categorization rules for the description."""
+        return get_categorizer().matches(self.get_description(), self.get_category())
+    
     def __str__(self):
         """String representation of the transaction."""
         return f"{self.get_date()} | {self.get_merchant()} | ${self.get_amount()}"
@@ -109,8 +182,9 @@ class Transaction:
 class MobileAccountDetailsPage:
     """Page object for the mobile account details page."""
     
-    # Common Locators (for both Android and iOS)
-    ACCOUNT_DETAILS_TITLE = (MobileBy.XPATH, "//android.widget.TextView[contains(@text, 'Account Details')]|//XCUIElementTypeStaticText[contains(@name, 'Account Details')]")
+    # Page title (UiSelector / iOS predicate instead of an XPath scan of the whole hierarchy)
+    ACCOUNT_DETAILS_TITLE_ANDROID = (MobileBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.widget.TextView").textContains("Account Details")')
+    ACCOUNT_DETAILS_TITLE_IOS = (MobileBy.IOS_PREDICATE, "type == 'XCUIElementTypeStaticText' AND name CONTAINS 'Account Details'")
     
     # Android-specific Locators
     ACCOUNT_NAME_ANDROID = (MobileBy.ID, "com.mybank.banking:id/accountName")
@@ -167,20 +241,22 @@ class MobileAccountDetailsPage:
         self.logger = logging.getLogger('mobile_account_details_page')
         
         # Determine platform
-        self.is_android = 'platformName' in driver.capabilities and driver.capabilities['platformName'].lower() == 'android'
-        self.logger.info(f"Initialized mobile account details page (Platform: {'Android' if self.is_android else 'iOS'})")
+        self.is_android = is_android_session(driver)
+        # Platform locators resolved once per platform: self.locators.X is X_ANDROID or X_IOS
+        self.locators = resolve_locators(type(self), self.is_android)
+        self.logger.debug(f"Initialized mobile account details page (Platform: {'Android' if self.is_android else 'iOS'})")
     
     def is_account_details_displayed(self):
         """Check if the account details page is displayed."""
         try:
-            self.wait.until(EC.visibility_of_element_located(self.ACCOUNT_DETAILS_TITLE))
+            self.wait.until(EC.visibility_of_element_located(self.locators.ACCOUNT_DETAILS_TITLE))
             return True
         except TimeoutException:
             return False
     
     def get_account_name(self):
         """Get the account name."""
-        locator = self.ACCOUNT_NAME_ANDROID if self.is_android else self.ACCOUNT_NAME_IOS
+        locator = self.locators.ACCOUNT_NAME
         try:
             name_element = self.wait.until(EC.visibility_of_element_located(locator))
             return name_element.text
@@ -189,7 +265,7 @@ class MobileAccountDetailsPage:
     
     def get_account_number(self):
         """Get the account number (might be masked)."""
-        locator = self.ACCOUNT_NUMBER_ANDROID if self.is_android else self.ACCOUNT_NUMBER_IOS
+        locator = self.locators.ACCOUNT_NUMBER
         try:
             number_element = self.wait.until(EC.visibility_of_element_located(locator))
             return number_element.text
@@ -198,7 +274,7 @@ class MobileAccountDetailsPage:
     
     def get_balance(self):
         """Get the account balance as a Decimal."""
-        locator = self.BALANCE_ANDROID if self.is_android else self.BALANCE_IOS
+        locator = self.locators.BALANCE
         try:
             balance_element = self.wait.until(EC.visibility_of_element_located(locator))
             balance_text = balance_element.text
@@ -214,7 +290,7 @@ class MobileAccountDetailsPage:
     
     def get_available_balance(self):
         """Get the available balance as a Decimal."""
-        locator = self.AVAILABLE_BALANCE_ANDROID if self.is_android else self.AVAILABLE_BALANCE_IOS
+        locator = self.locators.AVAILABLE_BALANCE
         try:
             balance_element = self.wait.until(EC.visibility_of_element_located(locator))
             balance_text = balance_element.text
@@ -228,17 +304,33 @@ class MobileAccountDetailsPage:
         except TimeoutException:
             return Decimal('0')
     
-    def get_transactions(self):
-        """Get all transactions displayed on the page."""
+    def _snapshot_rows(self, item_locator):
+        """Read every item matching the locator from one page source snapshot."""
+        snapshot = PageSnapshot.capture(self.driver, self.is_android)
+        fields = TRANSACTION_FIELDS_ANDROID if self.is_android else TRANSACTION_FIELDS_IOS
+        return [TransactionRow.from_snapshot(snapshot, item, fields) for item in snapshot.find_all(item_locator)]
+    
+    def get_transactions(self, snapshot=True):
+        """
+        Get all transactions displayed on the page.
+        
+        :param snapshot: Return TransactionRow records parsed from one page source fetch;
+                         False returns live Transaction wrappers (one round trip per field read)
+        """
         transactions = []
         
         # Wait for transactions list to be visible
-        transactions_list_locator = self.TRANSACTIONS_LIST_ANDROID if self.is_android else self.TRANSACTIONS_LIST_IOS
-        transaction_item_locator = self.TRANSACTION_ITEMS_ANDROID if self.is_android else self.TRANSACTION_ITEMS_IOS
+        transactions_list_locator = self.locators.TRANSACTIONS_LIST
+        transaction_item_locator = self.locators.TRANSACTION_ITEMS
         
         try:
             self.wait.until(EC.visibility_of_element_located(transactions_list_locator))
             
+            if snapshot:
+                transactions = self._snapshot_rows(transaction_item_locator)
+                self.logger.info(f"Found {len(transactions)} transactions")
+                return transactions
+            
             # Find all transaction items
             transaction_elements = self.driver.find_elements(*transaction_item_locator)
             
@@ -253,17 +345,43 @@ class MobileAccountDetailsPage:
             self.logger.warning("Transactions list not found or empty")
             return []
     
-    def get_pending_transactions(self):
-        """Get pending transactions."""
+    def get_all_transactions(self, max_scrolls=50):
+        """
+        Get every transaction in the list, scrolling from the current position to the end.
+        
+        :param max_scrolls: Maximum number of scroll gestures
+        :return: List of TransactionRow records
+        """
+        self.wait.until(EC.visibility_of_element_located(self.locators.TRANSACTIONS_LIST))
+        fields = TRANSACTION_FIELDS_ANDROID if self.is_android else TRANSACTION_FIELDS_IOS
+        transactions = ScrollEngine(self.driver).collect(
+            self.locators.TRANSACTION_ITEMS,
+            lambda snapshot, item: TransactionRow.from_snapshot(snapshot, item, fields),
+            max_scrolls=max_scrolls
+        )
+        self.logger.info(f"Found {len(transactions)} transactions in the full list")
+        return transactions
+    
+    def get_pending_transactions(self, snapshot=True):
+        """
+        Get pending transactions.
+        
+        :param snapshot: Return TransactionRow records parsed from one page source fetch
+        """
         pending_transactions = []
         
         # Wait for pending transactions section to be visible
-        pending_section_locator = self.PENDING_TRANSACTIONS_SECTION_ANDROID if self.is_android else self.PENDING_TRANSACTIONS_SECTION_IOS
-        pending_item_locator = self.PENDING_TRANSACTION_ITEMS_ANDROID if self.is_android else self.PENDING_TRANSACTION_ITEMS_IOS
+        pending_section_locator = self.locators.PENDING_TRANSACTIONS_SECTION
+        pending_item_locator = self.locators.PENDING_TRANSACTION_ITEMS
         
         try:
             self.wait.until(EC.visibility_of_element_located(pending_section_locator))
             
+            if snapshot:
+                pending_transactions = self._snapshot_rows(pending_item_locator)
+                self.logger.info(f"Found {len(pending_transactions)} pending transactions")
+                return pending_transactions
+            
             # Find all pending transaction items
             pending_elements = self.driver.find_elements(*pending_item_locator)
             
@@ -281,8 +399,8 @@ class MobileAccountDetailsPage:
     def search_transactions(self, search_text):
         """Search for transactions by text."""
         # Click search button
-        search_button_locator = self.SEARCH_BUTTON_ANDROID if self.is_android else self.SEARCH_BUTTON_IOS
-        search_input_locator = self.SEARCH_INPUT_ANDROID if self.is_android else self.SEARCH_INPUT_IOS
+        search_button_locator = self.locators.SEARCH_BUTTON
+        search_input_locator = self.locators.SEARCH_INPUT
         
         search_button = self.wait.until(EC.element_to_be_clickable(search_button_locator))
         search_button.click()
@@ -292,12 +410,15 @@ class MobileAccountDetailsPage:
         search_input.clear()
         search_input.send_keys(search_text)
         
+        items_locator = self.locators.TRANSACTION_ITEMS
+        results_before = list_signature(self.driver, items_locator)
+        
         # Submit search (might be handled differently on different platforms)
         if self.is_android:
             # On Android, might need to press Enter/Search key
             from appium.webdriver.common.touch_action import TouchAction
             actions = TouchAction(self.driver)
-            actions.tap(x=self.driver.get_window_size()['width'] - 10, y=search_input.location['y'] + 10).perform()
+            actions.tap(x=get_window_size(self.driver)['width'] - 10, y=search_input.location['y'] + 10).perform()
         else:
             # On iOS, tap the search button on keyboard
             search_button = self.driver.find_element(MobileBy.ACCESSIBILITY_ID, "Search")
@@ -305,13 +426,12 @@ class MobileAccountDetailsPage:
         
         self.logger.info(f"Searched for transactions with text: {search_text}")
         
-        # Wait for search results
-        import time
-        time.sleep(2)  # Give time for search results to update
+        # Wait for search results to replace the list and stop changing
+        wait_for_list_stable(self.driver, items_locator, previous=results_before)
     
     def clear_search(self):
         """Clear the search and return to full transaction list."""
-        clear_button_locator = self.SEARCH_CLEAR_ANDROID if self.is_android else self.SEARCH_CLEAR_IOS
+        clear_button_locator = self.locators.SEARCH_CLEAR
         
         try:
             clear_button = self.wait.until(EC.element_to_be_clickable(clear_button_locator))
@@ -323,12 +443,12 @@ class MobileAccountDetailsPage:
     def filter_transactions_by_date(self, start_date=None, end_date=None):
         """Filter transactions by date range."""
         # Click filter button
-        filter_button_locator = self.FILTER_BUTTON_ANDROID if self.is_android else self.FILTER_BUTTON_IOS
+        filter_button_locator = self.locators.FILTER_BUTTON
         filter_button = self.wait.until(EC.element_to_be_clickable(filter_button_locator))
         filter_button.click()
         
         # Select date range filter
-        date_filter_locator = self.DATE_RANGE_FILTER_ANDROID if self.is_android else self.DATE_RANGE_FILTER_IOS
+        date_filter_locator = self.locators.DATE_RANGE_FILTER
         date_filter = self.wait.until(EC.element_to_be_clickable(date_filter_locator))
         date_filter.click()
         
@@ -342,12 +462,12 @@ class MobileAccountDetailsPage:
     def filter_transactions_by_category(self, category):
         """Filter transactions by category."""
         # Click filter button
-        filter_button_locator = self.FILTER_BUTTON_ANDROID if self.is_android else self.FILTER_BUTTON_IOS
+        filter_button_locator = self.locators.FILTER_BUTTON
         filter_button = self.wait.until(EC.element_to_be_clickable(filter_button_locator))
         filter_button.click()
         
         # Select category filter
-        category_filter_locator = self.CATEGORY_FILTER_ANDROID if self.is_android else self.CATEGORY_FILTER_IOS
+        category_filter_locator = self.locators.CATEGORY_FILTER
         category_filter = self.wait.until(EC.element_to_be_clickable(category_filter_locator))
         category_filter.click()
         
@@ -358,13 +478,13 @@ class MobileAccountDetailsPage:
     
     def go_back_to_accounts(self):
         """Navigate back to the accounts list."""
-        back_button_locator = self.BACK_BUTTON_ANDROID if self.is_android else self.BACK_BUTTON_IOS
+        back_button_locator = self.locators.BACK_BUTTON
         back_button = self.wait.until(EC.element_to_be_clickable(back_button_locator))
         back_button.click()
         
         # Wait for accounts page to load
         from mobile_page_objects.accounts_page import MobileAccountsPage
-        accounts_page = MobileAccountsPage(self.driver)
+        accounts_page = get_page(MobileAccountsPage, self.driver)
         
         # Verify we're on the accounts page
         assert accounts_page.is_accounts_page_displayed(), "Failed to navigate back to accounts page"
@@ -8,16 +8,27 @@ from decimal import Decimal
 import datetime
 import re
 
+from mobile_page_objects.locator_registry import is_android_session, resolve_locators
+from utils.page_source import PageSnapshot
+
+# Account type (as the accounts API names it) -> balance locator field
+BALANCE_FIELDS = {
+    "checking": "CHECKING_BALANCE",
+    "savings": "SAVINGS_BALANCE",
+    "credit_card": "CREDIT_CARD_BALANCE",
+}
+
 class MobileAccountsPage:
     """Page object for the mobile accounts page."""
     
-    # Common Locators (for both Android and iOS)
-    ACCOUNTS_TITLE = (MobileBy.XPATH, "//android.widget.TextView[@text='Accounts']|//XCUIElementTypeStaticText[@name='Accounts']")
+    # Page title (UiSelector / iOS predicate instead of an XPath scan of the whole hierarchy)
+    ACCOUNTS_TITLE_ANDROID = (MobileBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.widget.TextView").text("Accounts")')
+    ACCOUNTS_TITLE_IOS = (MobileBy.IOS_PREDICATE, "type == 'XCUIElementTypeStaticText' AND name == 'Accounts'")
     
     # Android-specific Locators
-    CHECKING_ACCOUNT_ANDROID = (MobileBy.XPATH, "//android.widget.TextView[contains(@text, 'Checking')]")
-    SAVINGS_ACCOUNT_ANDROID = (MobileBy.XPATH, "//android.widget.TextView[contains(@text, 'Savings')]")
-    CREDIT_CARD_ANDROID = (MobileBy.XPATH, "//android.widget.TextView[contains(@text, 'Credit Card')]")
+    CHECKING_ACCOUNT_ANDROID = (MobileBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.widget.TextView").textContains("Checking")')
+    SAVINGS_ACCOUNT_ANDROID = (MobileBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.widget.TextView").textContains("Savings")')
+    CREDIT_CARD_ANDROID = (MobileBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.widget.TextView").textContains("Credit Card")')
     
     CHECKING_BALANCE_ANDROID = (MobileBy.ID, "com.mybank.banking:id/checkingBalance")
     SAVINGS_BALANCE_ANDROID = (MobileBy.ID, "com.mybank.banking:id/savingsBalance")
@@ -47,13 +58,15 @@ class MobileAccountsPage:
         self.logger = logging.getLogger('mobile_accounts_page')
         
         # Determine platform
-        self.is_android = 'platformName' in driver.capabilities and driver.capabilities['platformName'].lower() == 'android'
-        self.logger.info(f"Initialized mobile accounts page (Platform: {'Android' if self.is_android else 'iOS'})")
+        self.is_android = is_android_session(driver)
+        # Platform locators resolved once per platform: self.locators.X is X_ANDROID or X_IOS
+        self.locators = resolve_locators(type(self), self.is_android)
+        self.logger.debug(f"Initialized mobile accounts page (Platform: {'Android' if self.is_android else 'iOS'})")
     
     def is_accounts_page_displayed(self):
         """Check if the accounts page is displayed."""
         try:
-            self.wait.until(EC.visibility_of_element_located(self.ACCOUNTS_TITLE))
+            self.wait.until(EC.visibility_of_element_located(self.locators.ACCOUNTS_TITLE))
             return True
         except TimeoutException:
             return False
@@ -83,7 +96,7 @@ class MobileAccountsPage:
     def get_checking_account_balance(self):
         """Get the checking account balance."""
         try:
-            locator = self.CHECKING_BALANCE_ANDROID if self.is_android else self.CHECKING_BALANCE_IOS
+            locator = self.locators.CHECKING_BALANCE
             balance_element = self.wait.until(EC.visibility_of_element_located(locator))
             balance_text = balance_element.text
             
@@ -97,7 +110,7 @@ class MobileAccountsPage:
     def get_savings_account_balance(self):
         """Get the savings account balance."""
         try:
-            locator = self.SAVINGS_BALANCE_ANDROID if self.is_android else self.SAVINGS_BALANCE_IOS
+            locator = self.locators.SAVINGS_BALANCE
             balance_element = self.wait.until(EC.visibility_of_element_located(locator))
             balance_text = balance_element.text
             
@@ -111,7 +124,7 @@ class MobileAccountsPage:
     def get_credit_card_balance(self):
         """Get the credit card balance."""
         try:
-            locator = self.CREDIT_CARD_BALANCE_ANDROID if self.is_android else self.CREDIT_CARD_BALANCE_IOS
+            locator = self.locators.CREDIT_CARD_BALANCE
             balance_element = self.wait.until(EC.visibility_of_element_located(locator))
             balance_text = balance_element.text
             
@@ -122,10 +135,28 @@ class MobileAccountsPage:
             self.logger.warning(f"Could not get credit card balance: {e}")
             return None
     
+    def get_all_balances(self):
+        """
+        Get every account balance from one page source snapshot
+        
+        :return: Dictionary of account type (BALANCE_FIELDS keys) to Decimal, None for balances not shown
+        """
+        try:
+            self.wait.until(EC.visibility_of_element_located(self.locators.CHECKING_BALANCE))
+        except TimeoutException:
+            self.logger.warning("Account balances not displayed")
+        snapshot = PageSnapshot.capture(self.driver, self.is_android)
+        balances = {}
+        for account_type, field in BALANCE_FIELDS.items():
+            node = snapshot.find(getattr(self.locators, field))
+            balances[account_type] = self._parse_balance(snapshot.text(node)) if node is not None else None
+        self.logger.info(f"Account balances: {balances}")
+        return balances
+    
     def get_last_updated_timestamp(self):
         """Get the timestamp when account information was last updated."""
         try:
-            locator = self.LAST_UPDATED_ANDROID if self.is_android else self.LAST_UPDATED_IOS
+            locator = self.locators.LAST_UPDATED
             timestamp_element = self.wait.until(EC.visibility_of_element_located(locator))
             timestamp_text = timestamp_element.text
             
@@ -138,7 +169,7 @@ class MobileAccountsPage:
     
     def refresh_accounts(self):
         """Tap the refresh button to update account information."""
-        locator = self.REFRESH_BUTTON_ANDROID if self.is_android else self.REFRESH_BUTTON_IOS
+        locator = self.locators.REFRESH_BUTTON
         refresh_button = self.wait.until(EC.element_to_be_clickable(locator))
         refresh_button.click()
         self.logger.info("Tapped refresh button")
@@ -162,28 +193,28 @@ class MobileAccountsPage:
     
     def select_checking_account(self):
         """Select/tap the checking account to view details."""
-        locator = self.CHECKING_ACCOUNT_ANDROID if self.is_android else self.CHECKING_ACCOUNT_IOS
+        locator = self.locators.CHECKING_ACCOUNT
         checking_account = self.wait.until(EC.element_to_be_clickable(locator))
         checking_account.click()
         self.logger.info("Selected checking account")
     
     def select_savings_account(self):
         """Select/tap the savings account to view details."""
-        locator = self.SAVINGS_ACCOUNT_ANDROID if self.is_android else self.SAVINGS_ACCOUNT_IOS
+        locator = self.locators.SAVINGS_ACCOUNT
         savings_account = self.wait.until(EC.element_to_be_clickable(locator))
         savings_account.click()
         self.logger.info("Selected savings account")
     
     def select_credit_card(self):
         """Select/tap the credit card to view details."""
-        locator = self.CREDIT_CARD_ANDROID if self.is_android else self.CREDIT_CARD_IOS
+        locator = self.locators.CREDIT_CARD
         credit_card = self.wait.until(EC.element_to_be_clickable(locator))
         credit_card.click()
         self.logger.info("Selected credit card")
     
     def tap_add_account(self):
         """Tap the add account button."""
-        locator = self.ADD_ACCOUNT_BUTTON_ANDROID if self.is_android else self.ADD_ACCOUNT_BUTTON_IOS
+        locator = self.locators.ADD_ACCOUNT_BUTTON
         add_account = self.wait.until(EC.element_to_be_clickable(locator))
         add_account.click()
         self.logger.info("Tapped add account button")
@@ -5,11 +5,14 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import logging
 
+from mobile_page_objects.locator_registry import get_page, is_android_session, resolve_locators
+
 class MobileDashboardPage:
     """Page object for the mobile dashboard/home page."""
     
-    # Common Locators (for both Android and iOS)
-    DASHBOARD_TITLE = (MobileBy.XPATH, "//android.widget.TextView[@text='Dashboard']|//XCUIElementTypeStaticText[@name='Dashboard']")
+    # Page title (UiSelector / iOS predicate instead of an XPath scan of the whole hierarchy)
+    DASHBOARD_TITLE_ANDROID = (MobileBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.widget.TextView").text("Dashboard")')
+    DASHBOARD_TITLE_IOS = (MobileBy.IOS_PREDICATE, "type == 'XCUIElementTypeStaticText' AND name == 'Dashboard'")
     
     # Android-specific Locators
     ACCOUNTS_SECTION_ANDROID = (MobileBy.ID, "com.mybank.banking:id/accountsSection")
@@ -44,13 +47,15 @@ class MobileDashboardPage:
         self.logger = logging.getLogger('mobile_dashboard_page')
         
         # Determine platform
-        self.is_android = 'platformName' in driver.capabilities and driver.capabilities['platformName'].lower() == 'android'
-        self.logger.info(f"Initialized mobile dashboard page (Platform: {'Android' if self.is_android else 'iOS'})")
+        self.is_android = is_android_session(driver)
+        # Platform locators resolved once per platform: self.locators.X is X_ANDROID or X_IOS
+        self.locators = resolve_locators(type(self), self.is_android)
+        self.logger.debug(f"Initialized mobile dashboard page (Platform: {'Android' if self.is_android else 'iOS'})")
     
     def is_dashboard_displayed(self):
         """Check if the dashboard page is displayed."""
         try:
-            self.wait.until(EC.visibility_of_element_located(self.DASHBOARD_TITLE))
+            self.wait.until(EC.visibility_of_element_located(self.locators.DASHBOARD_TITLE))
             return True
         except TimeoutException:
             return False
@@ -58,7 +63,7 @@ class MobileDashboardPage:
     def is_accounts_section_displayed(self):
         """Check if the accounts section is displayed on the dashboard."""
         try:
-            locator = self.ACCOUNTS_SECTION_ANDROID if self.is_android else self.ACCOUNTS_SECTION_IOS
+            locator = self.locators.ACCOUNTS_SECTION
             self.wait.until(EC.visibility_of_element_located(locator))
             return True
         except TimeoutException:
@@ -67,7 +72,7 @@ class MobileDashboardPage:
     def get_account_count(self):
         """Get the number of accounts displayed on the dashboard."""
         try:
-            locator = self.ACCOUNT_ITEMS_ANDROID if self.is_android else self.ACCOUNT_ITEMS_IOS
+            locator = self.locators.ACCOUNT_ITEMS
             accounts = self.driver.find_elements(*locator)
             return len(accounts)
         except NoSuchElementException:
@@ -75,7 +80,7 @@ class MobileDashboardPage:
     
     def get_total_balance(self):
         """Get the total balance displayed on the dashboard."""
-        locator = self.TOTAL_BALANCE_ANDROID if self.is_android else self.TOTAL_BALANCE_IOS
+        locator = self.locators.TOTAL_BALANCE
         balance_element = self.wait.until(EC.visibility_of_element_located(locator))
         balance_text = balance_element.text
         
@@ -92,48 +97,48 @@ class MobileDashboardPage:
     
     def get_username_displayed(self):
         """Get the username displayed on the dashboard."""
-        locator = self.USERNAME_DISPLAY_ANDROID if self.is_android else self.USERNAME_DISPLAY_IOS
+        locator = self.locators.USERNAME_DISPLAY
         username_element = self.wait.until(EC.visibility_of_element_located(locator))
         return username_element.text
     
     def tap_accounts_tab(self):
         """Tap the Accounts tab in the bottom navigation."""
-        locator = self.ACCOUNTS_TAB_ANDROID if self.is_android else self.ACCOUNTS_TAB_IOS
+        locator = self.locators.ACCOUNTS_TAB
         accounts_tab = self.wait.until(EC.element_to_be_clickable(locator))
         accounts_tab.click()
         self.logger.info("Tapped Accounts tab")
     
     def tap_transfer_tab(self):
         """Tap the Transfer tab in the bottom navigation."""
-        locator = self.TRANSFER_TAB_ANDROID if self.is_android else self.TRANSFER_TAB_IOS
+        locator = self.locators.TRANSFER_TAB
         transfer_tab = self.wait.until(EC.element_to_be_clickable(locator))
         transfer_tab.click()
         self.logger.info("Tapped Transfer tab")
     
     def tap_bill_pay_tab(self):
         """Tap the Bill Pay tab in the bottom navigation."""
-        locator = self.BILL_PAY_TAB_ANDROID if self.is_android else self.BILL_PAY_TAB_IOS
+        locator = self.locators.BILL_PAY_TAB
         bill_pay_tab = self.wait.until(EC.element_to_be_clickable(locator))
         bill_pay_tab.click()
         self.logger.info("Tapped Bill Pay tab")
     
     def tap_deposit_tab(self):
         """Tap the Deposit tab in the bottom navigation."""
-        locator = self.DEPOSIT_TAB_ANDROID if self.is_android else self.DEPOSIT_TAB_IOS
+        locator = self.locators.DEPOSIT_TAB
         deposit_tab = self.wait.until(EC.element_to_be_clickable(locator))
         deposit_tab.click()
         self.logger.info("Tapped Deposit tab")
     
     def tap_more_tab(self):
         """Tap the More tab in the bottom navigation."""
-        locator = self.MORE_TAB_ANDROID if self.is_android else self.MORE_TAB_IOS
+        locator = self.locators.MORE_TAB
         more_tab = self.wait.until(EC.element_to_be_clickable(locator))
         more_tab.click()
         self.logger.info("Tapped More tab")
     
     def tap_notifications_icon(self):
         """Tap the notifications icon."""
-        locator = self.NOTIFICATIONS_ICON_ANDROID if self.is_android else self.NOTIFICATIONS_ICON_IOS
+        locator = self.locators.NOTIFICATIONS_ICON
         notifications = self.wait.until(EC.element_to_be_clickable(locator))
         notifications.click()
         self.logger.info("Tapped Notifications icon")
@@ -142,7 +147,7 @@ class MobileDashboardPage:
         """Logout from the app."""
         # On some banking apps, logout might be in a menu or settings
         # This is a simple implementation assuming direct access
-        locator = self.LOGOUT_BUTTON_ANDROID if self.is_android else self.LOGOUT_BUTTON_IOS
+        locator = self.locators.LOGOUT_BUTTON
         
         try:
             logout_button = self.wait.until(EC.element_to_be_clickable(locator))
@@ -162,7 +167,7 @@ class MobileDashboardPage:
                 self.logger.info("No logout confirmation dialog found")
             
             from mobile_page_objects.login_page import MobileLoginPage
-            return MobileLoginPage(self.driver)
+            return get_page(MobileLoginPage, self.driver)
         except TimeoutException:
             self.logger.warning("Could not find direct logout button, trying More tab")
             self.tap_more_tab()
@@ -189,4 +194,4 @@ class MobileDashboardPage:
                 self.logger.info("No logout confirmation dialog found")
             
             from mobile_page_objects.login_page import MobileLoginPage
-            return MobileLoginPage(self.driver)
+            return get_page(MobileLoginPage, self.driver)
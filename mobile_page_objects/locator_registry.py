@@ -0,0 +1,68 @@
+from collections import namedtuple
+from functools import lru_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+PLATFORM_SUFFIXES = ("_ANDROID", "_IOS")
+
+# Session ID -> is_android, and session ID -> {page class: page instance}
+_session_platforms = {}
+_session_pages = {}
+
+
+def is_android_session(driver):
+    """Return True if the driver's session is an Android session, reading the capabilities once per session."""
+    session_id = getattr(driver, 'session_id', None)
+    if session_id not in _session_platforms:
+        capabilities = driver.capabilities
+        _session_platforms[session_id] = capabilities.get('platformName', '').lower() == 'android'
+    return _session_platforms[session_id]
+
+
+@lru_cache(maxsize=None)
+def resolve_locators(page_class, is_android):
+    """
+    Resolve a page object's locators for one platform into a frozen table.
+
+    X_ANDROID / X_IOS class attributes become field X (the one for the platform);
+    locators without a platform suffix are shared by both platforms.
+
+    :param page_class: Page object class with (By, value) tuple class attributes
+    :param is_android: Platform to resolve for
+    :return: Namedtuple of locators, e.g. table.CHECKING_BALANCE
+    """
+    suffix = "_ANDROID" if is_android else "_IOS"
+    locators = {}
+    for name in dir(page_class):
+        value = getattr(page_class, name)
+        if not name.isupper() or not (isinstance(value, tuple) and len(value) == 2):
+            continue
+        if name.endswith(suffix):
+            locators[name[:-len(suffix)]] = value
+        elif not name.endswith(PLATFORM_SUFFIXES):
+            locators.setdefault(name, value)
+    table = namedtuple(f"{page_class.__name__}Locators", sorted(locators))
+    return table(**locators)
+
+
+def get_page(page_class, driver):
+    """
+    Get the page object for a driver session, constructing it on first use
+
+    :param page_class: Mobile page object class
+    :param driver: Appium driver
+    :return: Page object instance shared for the session
+    """
+    pages = _session_pages.setdefault(getattr(driver, 'session_id', None), {})
+    page = pages.get(page_class)
+    if page is None or page.driver is not driver:
+        page = pages[page_class] = page_class(driver)
+    return page
+
+
+def forget_session(driver):
+    """Drop the cached platform and page objects of a session that has ended."""
+    session_id = getattr(driver, 'session_id', None)
+    _session_platforms.pop(session_id, None)
+    _session_pages.pop(session_id, None)
@@ -5,11 +5,14 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 import logging
 
+from mobile_page_objects.locator_registry import is_android_session, resolve_locators
+
 class MobileLoginPage:
     """Page object for the mobile login page."""
     
-    # Common Locators (for both Android and iOS)
-    LOGIN_TITLE = (MobileBy.XPATH, "//android.widget.TextView[@text='Welcome to MyBank']|//XCUIElementTypeStaticText[@name='Welcome to MyBank']")
+    # Page title (UiSelector / iOS predicate instead of an XPath scan of the whole hierarchy)
+    LOGIN_TITLE_ANDROID = (MobileBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.widget.TextView").text("Welcome to MyBank")')
+    LOGIN_TITLE_IOS = (MobileBy.IOS_PREDICATE, "type == 'XCUIElementTypeStaticText' AND name == 'Welcome to MyBank'")
     
     # Android-specific Locators
     USERNAME_INPUT_ANDROID = (MobileBy.ID, "com.mybank.banking:id/usernameInput")
@@ -38,20 +41,22 @@ class MobileLoginPage:
         self.logger = logging.getLogger('mobile_login_page')
         
         # Determine platform
-        self.is_android = 'platformName' in driver.capabilities and driver.capabilities['platformName'].lower() == 'android'
-        self.logger.info(f"Initialized mobile login page (Platform: {'Android' if self.is_android else 'iOS'})")
+        self.is_android = is_android_session(driver)
+        # Platform locators resolved once per platform: self.locators.X is X_ANDROID or X_IOS
+        self.locators = resolve_locators(type(self), self.is_android)
+        self.logger.debug(f"Initialized mobile login page (Platform: {'Android' if self.is_android else 'iOS'})")
     
     def is_login_page_displayed(self):
         """Check if the login page is displayed."""
         try:
-            self.wait.until(EC.visibility_of_element_located(self.LOGIN_TITLE))
+            self.wait.until(EC.visibility_of_element_located(self.locators.LOGIN_TITLE))
             return True
         except TimeoutException:
             return False
     
     def enter_username(self, username):
         """Enter username in the username field."""
-        locator = self.USERNAME_INPUT_ANDROID if self.is_android else self.USERNAME_INPUT_IOS
+        locator = self.locators.USERNAME_INPUT
         username_field = self.wait.until(EC.element_to_be_clickable(locator))
         username_field.clear()
         username_field.send_keys(username)
@@ -59,7 +64,7 @@ class MobileLoginPage:
     
     def enter_password(self, password):
         """Enter password in the password field."""
-        locator = self.PASSWORD_INPUT_ANDROID if self.is_android else self.PASSWORD_INPUT_IOS
+        locator = self.locators.PASSWORD_INPUT
         password_field = self.wait.until(EC.element_to_be_clickable(locator))
         password_field.clear()
         password_field.send_keys(password)
@@ -67,35 +72,35 @@ class MobileLoginPage:
     
     def tap_login_button(self):
         """Tap the login button."""
-        locator = self.LOGIN_BUTTON_ANDROID if self.is_android else self.LOGIN_BUTTON_IOS
+        locator = self.locators.LOGIN_BUTTON
         login_button = self.wait.until(EC.element_to_be_clickable(locator))
         login_button.click()
         self.logger.info("Tapped login button")
     
     def tap_biometric_login_button(self):
         """Tap the biometric login button."""
-        locator = self.BIOMETRIC_LOGIN_BUTTON_ANDROID if self.is_android else self.BIOMETRIC_LOGIN_BUTTON_IOS
+        locator = self.locators.BIOMETRIC_LOGIN_BUTTON
         biometric_button = self.wait.until(EC.element_to_be_clickable(locator))
         biometric_button.click()
         self.logger.info("Tapped biometric login button")
     
     def tap_forgot_password_link(self):
         """Tap the 'Forgot Password' link."""
-        locator = self.FORGOT_PASSWORD_LINK_ANDROID if self.is_android else self.FORGOT_PASSWORD_LINK_IOS
+        locator = self.locators.FORGOT_PASSWORD_LINK
         forgot_password = self.wait.until(EC.element_to_be_clickable(locator))
         forgot_password.click()
         self.logger.info("Tapped 'Forgot Password' link")
     
     def tap_forgot_username_link(self):
         """Tap the 'Forgot Username' link."""
-        locator = self.FORGOT_USERNAME_LINK_ANDROID if self.is_android else self.FORGOT_USERNAME_LINK_IOS
+        locator = self.locators.FORGOT_USERNAME_LINK
         forgot_username = self.wait.until(EC.element_to_be_clickable(locator))
         forgot_username.click()
         self.logger.info("Tapped 'Forgot Username' link")
     
     def tap_register_link(self):
         """Tap the 'Register' link."""
-        locator = self.REGISTER_LINK_ANDROID if self.is_android else self.REGISTER_LINK_IOS
+        locator = self.locators.REGISTER_LINK
         register = self.wait.until(EC.element_to_be_clickable(locator))
         register.click()
         self.logger.info("Tapped 'Register' link")
@@ -103,7 +108,7 @@ class MobileLoginPage:
     def get_error_message(self):
         """Get the error message displayed on failed login."""
         try:
-            locator = self.ERROR_MESSAGE_ANDROID if self.is_android else self.ERROR_MESSAGE_IOS
+            locator = self.locators.ERROR_MESSAGE
             error_element = self.wait.until(EC.visibility_of_element_located(locator))
             error_text = error_element.text
             self.logger.info(f"Error message displayed: {error_text}")
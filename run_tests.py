@@ -7,6 +7,7 @@ import os
 import sys
 import argparse
 import subprocess
+import glob
 import json
 import shutil
 from datetime import datetime
@@ -16,7 +17,7 @@ def setup_directories():
     directories = [
         'reports',
         'reports/allure-results',
-        'reports/screenshots',
+        'reports/artifacts',
         'reports/junit',
         'logs'
     ]
@@ -25,26 +26,57 @@ def setup_directories():
         os.makedirs(directory, exist_ok=True)
         print(f"Ensured directory exists: {directory}")
 
-def generate_test_data():
+def generate_test_data(bulk_transactions=None, data_format='json', seed=None, workers=None, force=False):
     """Generate test data if needed"""
     try:
         # Import the generator module and generate data
         sys.path.append(os.path.abspath(os.path.dirname(__file__)))
         from utils.data_generator import DataGenerator
         generator = DataGenerator()
-        generator.generate_test_data_set()
+        if seed is not None:
+            # Reproducible data set, generated across worker processes; unchanged entity files are reused
+            from utils.data_cache import generate_cached_test_data_set
+            _, regenerated = generate_cached_test_data_set(
+                seed, num_transactions=bulk_transactions or 50, workers=workers, bulk=bool(bulk_transactions),
+                output_format=data_format, force=force
+            )
+            if not regenerated:
+                print("Test data is up to date")
+        elif bulk_transactions:
+            generator.generate_test_data_set(num_transactions=bulk_transactions, bulk=True, output_format=data_format)
+        else:
+            generator.generate_test_data_set(output_format=data_format)
         print("Test data generated successfully")
     except Exception as e:
         print(f"Error generating test data: {e}")
         sys.exit(1)
 
-def run_behave(args):
+def start_local_server():
+    """Start the local stand-in bank server seeded from DataGenerator output"""
+    sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+    from utils.local_bank_server import LocalBankServer
+    server = LocalBankServer().start()
+    print(f"Local bank server running at {server.base_url} (API: {server.api_base_url})")
+    return server
+
+def run_behave(args, local_server=None, network_profile=None):
     """Run behave with the specified arguments"""
     behave_cmd = ['behave']
     
-    # Add tags if specified
+    # Throttle the mobile device's network and record time-to-content per step
+    if network_profile:
+        behave_cmd.extend(['-D', f'network_profile={network_profile}'])
+    
+    # Point the web app and API at the local stand-in server
+    if local_server:
+        behave_cmd.extend(['-D', f'base_url={local_server.base_url}'])
+        behave_cmd.extend(['-D', f'api_base_url={local_server.api_base_url}'])
+    
+    # Add tags if specified (network profile runs default to the mobile scenarios)
     if args.tags:
         behave_cmd.extend(['--tags', args.tags])
+    elif network_profile:
+        behave_cmd.extend(['--tags', '@mobile'])
     
     # Add specific feature if specified
     if args.feature:
@@ -56,10 +88,29 @@ def run_behave(args):
     elif args.report == 'junit':
         behave_cmd.extend(['-f', 'junit', '-o', 'reports/junit'])
     
+    # Lease an exclusive test user to each scenario
+    if args.user_pool:
+        behave_cmd.extend(['-D', 'use_user_pool=true'])
+    
+    # Enable step-level profiling
+    if args.profile_steps:
+        behave_cmd.extend(['-D', 'profile_steps=true'])
+    
+    # Enable WebDriver command profiling per page object method
+    if args.profile_commands:
+        behave_cmd.extend(['-D', 'profile_commands=true'])
+    
+    # Lease a device from the mobile device registry to each behave process
+    if args.device_registry:
+        behave_cmd.extend(['-D', 'use_device_registry=true'])
+    
     # Add additional behave arguments
     if args.behave_args:
         behave_cmd.extend(args.behave_args.split())
     
+    if args.parallel > 1 and not args.feature:
+        return run_parallel(behave_cmd, args.parallel)
+    
     # Print command being run
     print(f"Running: {' '.join(behave_cmd)}")
     
@@ -67,6 +118,29 @@ def run_behave(args):
     process = subprocess.run(behave_cmd)
     return process.returncode
 
+def run_parallel(behave_cmd, workers):
+    """Run the feature files across parallel behave processes, each writing its output to reports/parallel"""
+    features = sorted(glob.glob(os.path.join('features', '*.feature')))
+    partitions = [features[k::workers] for k in range(workers) if features[k::workers]]
+    log_dir = os.path.join('reports', 'parallel')
+    os.makedirs(log_dir, exist_ok=True)
+    
+    processes = []
+    for k, partition in enumerate(partitions):
+        cmd = behave_cmd + partition
+        log_path = os.path.join(log_dir, f'worker-{k}.log')
+        print(f"Worker {k}: {' '.join(cmd)} > {log_path}")
+        log_file = open(log_path, 'w')
+        processes.append((k, subprocess.Popen(cmd, stdout=log_file, stderr=subprocess.STDOUT), log_file, log_path))
+    
+    returncode = 0
+    for k, process, log_file, log_path in processes:
+        process.wait()
+        log_file.close()
+        print(f"Worker {k} finished with exit code {process.returncode} (log: {log_path})")
+        returncode = returncode or process.returncode
+    return returncode
+
 def generate_report(args):
     """Generate the report after running tests"""
     if args.report == 'allure':
@@ -98,12 +172,41 @@ def main():
     parser.add_argument('--report', choices=['allure', 'junit', 'none'], default='allure', 
                         help='Report type to generate (default: allure)')
     parser.add_argument('--generate-data', action='store_true', help='Generate test data before running tests')
+    parser.add_argument('--bulk-transactions', type=int, metavar='N',
+                        help='With --generate-data, generate N transactions per account in bulk mode')
+    parser.add_argument('--data-format', choices=['json', 'jsonl', 'parquet'], default='json',
+                        help='Test data file format; jsonl and parquet are streamed to disk (default: json)')
+    parser.add_argument('--data-seed', type=int,
+                        help='Generate a reproducible data set from this seed (same files for any --data-workers)')
+    parser.add_argument('--data-workers', type=int,
+                        help='Worker processes for seeded data generation (default: CPU count)')
+    parser.add_argument('--force-data', action='store_true',
+                        help='With --data-seed, regenerate every file even if the data cache is up to date')
     parser.add_argument('--no-open', action='store_true', help='Do not open report automatically')
     parser.add_argument('--behave-args', help='Additional arguments to pass to behave')
+    parser.add_argument('--profile-steps', action='store_true',
+                        help='Record per-step timings and write a report to reports/profiles')
+    parser.add_argument('--profile-commands', action='store_true',
+                        help='Count WebDriver round trips per page object method and write a profile to reports/profiles')
+    parser.add_argument('--api-record', metavar='CASSETTE',
+                        help='Record API requests and responses to this cassette file (.jsonl.gz)')
+    parser.add_argument('--api-replay', metavar='CASSETTE',
+                        help='Serve API requests from this cassette file instead of the network')
+    parser.add_argument('--provision-data', action='store_true',
+                        help='Create the generated users, accounts and payees through the admin API before running')
+    parser.add_argument('--user-pool', type=int, metavar='N',
+                        help='Provision N test users through the admin API and lease one to each scenario')
+    parser.add_argument('--parallel', type=int, default=1, metavar='N',
+                        help='Run the feature files across N behave processes (default: 1)')
+    parser.add_argument('--device-registry', action='store_true',
+                        help='Lease each behave process its own mobile device from config mobile.devices')
+    parser.add_argument('--network-profile', metavar='PROFILES',
+                        help='Run the @mobile scenarios once per network profile (e.g. "3g,lte,lossy") and '
+                             'record time-to-content per step to reports/profiles')
     parser.add_argument('--browser', choices=['chrome', 'firefox'], default='chrome',
                         help='Browser to use for tests (default: chrome)')
-    parser.add_argument('--env', choices=['test', 'dev', 'staging', 'prod'], default='test',
-                        help='Environment to run tests against (default: test)')
+    parser.add_argument('--env', choices=['test', 'dev', 'staging', 'prod', 'local'], default='test',
+                        help='Environment to run tests against; "local" starts a stand-in bank server (default: test)')
     
     args = parser.parse_args()
     
@@ -111,15 +214,69 @@ def main():
     os.environ['TEST_BROWSER'] = args.browser
     os.environ['TEST_ENV'] = args.env
     
+    # API record/replay (read by APIClient)
+    if args.api_record and args.api_replay:
+        parser.error('--api-record and --api-replay cannot be used together')
+    if args.api_record or args.api_replay:
+        os.environ['API_CASSETTE_MODE'] = 'record' if args.api_record else 'replay'
+        os.environ['API_CASSETTE'] = args.api_record or args.api_replay
+        if args.api_record:
+            from api_clients.cassette import start_recording
+            start_recording(args.api_record)
+    
     # Setup directories
     setup_directories()
     
     # Generate test data if requested
     if args.generate_data:
-        generate_test_data()
+        generate_test_data(args.bulk_transactions, args.data_format, args.data_seed, args.data_workers,
+                           args.force_data)
+    
+    # Start the local stand-in server for hermetic runs
+    local_server = None
+    if args.env == 'local':
+        local_server = start_local_server()
+        os.environ['API_BASE_URL'] = local_server.api_base_url
+    
+    # Push generated data into the backend (resumes from the checkpoint of an earlier run)
+    if args.provision_data:
+        from utils.data_provisioner import DataProvisioner
+        provisioner = DataProvisioner(api_base_url=local_server.api_base_url if local_server else None)
+        summary = provisioner.run()
+        if any(counts["failed"] for counts in summary.values()):
+            print("Error provisioning test data; rerun to resume")
+            sys.exit(1)
+    
+    # Provision users for the leasing pool
+    if args.user_pool:
+        from utils.user_pool import UserPool
+        pool = UserPool(api_base_url=local_server.api_base_url if local_server else None)
+        missing = args.user_pool - pool.available()
+        if missing > 0:
+            pool.provision(missing)
+        print(f"User pool: {pool.available()} users available")
     
     # Run the tests
-    returncode = run_behave(args)
+    try:
+        if args.network_profile:
+            returncode = 0
+            for network_profile in args.network_profile.split(','):
+                print(f"Network profile: {network_profile}")
+                returncode = max(returncode, run_behave(args, local_server, network_profile.strip()))
+        else:
+            returncode = run_behave(args, local_server)
+    finally:
+        if local_server:
+            local_server.stop()
+            # The in-memory backend and its users are gone; so is the pool keyed by its URL
+            if args.user_pool:
+                pool.reset()
+    
+    # Combine the cassette parts recorded by this process and the behave processes
+    if args.api_record:
+        from api_clients.cassette import close_cassettes, merge_recording
+        close_cassettes()
+        print(f"Merged {merge_recording(args.api_record)} cassette parts into {args.api_record}")
     
     # Generate report if not disabled
     if args.report != 'none':
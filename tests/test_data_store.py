@@ -0,0 +1,61 @@
+import os
+import sys
+import json
+from decimal import Decimal
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import data_store
+
+
+def _write(directory, name, records):
+    with open(os.path.join(directory, f"{name}.json"), 'w') as f:
+        json.dump(records, f)
+
+
+def _store(tmp_path):
+    # Opening balance 80.00, closing balance (stored on the account) 100.00
+    _write(tmp_path, "accounts", [
+        {"account_id": "CHECKING-1", "user_id": "user1", "account_type": "checking", "balance": "100.00"},
+        {"account_id": "SAVINGS-1", "user_id": "user1", "account_type": "savings", "balance": "250.00"},
+    ])
+    _write(tmp_path, "transactions", [
+        {"transaction_id": "TX-1", "account_id": "CHECKING-1", "date": "2026-01-05", "amount": "50.00",
+         "is_debit": False, "description": "Deposit", "category": "Income", "balance_after": "130.00",
+         "status": "cleared"},
+        {"transaction_id": "TX-2", "account_id": "CHECKING-1", "date": "2026-01-10", "amount": "30.00",
+         "is_debit": True, "description": "ATM Withdrawal", "category": "Cash", "balance_after": "100.00",
+         "status": "cleared"},
+    ])
+    _write(tmp_path, "balance_snapshots", [
+        {"account_id": "CHECKING-1", "date": f"2026-01-{day:02d}", "balance": "130.00" if day < 10 else "100.00"}
+        for day in range(5, 11)
+    ])
+    return data_store.TestDataStore(data_store.build_store(str(tmp_path), str(tmp_path / "test_data.db")))
+
+
+def test_balance_before_first_transaction_is_opening_balance(tmp_path):
+    store = _store(tmp_path)
+    try:
+        assert store.get_balance_at("CHECKING-1", "2026-01-01") == Decimal("80.00")
+        assert store.get_opening_balance("CHECKING-1") == Decimal("80.00")
+    finally:
+        store.close()
+
+
+def test_balance_from_snapshots(tmp_path):
+    store = _store(tmp_path)
+    try:
+        assert store.get_balance_at("CHECKING-1", "2026-01-07") == Decimal("130.00")
+        assert store.get_balance_at("CHECKING-1", "2026-02-01") == Decimal("100.00")
+    finally:
+        store.close()
+
+
+def test_account_without_transactions_keeps_its_balance(tmp_path):
+    store = _store(tmp_path)
+    try:
+        assert store.get_balance_at("SAVINGS-1", "2026-01-01") == Decimal("250.00")
+        assert store.get_balance_at("UNKNOWN", "2026-01-01") is None
+    finally:
+        store.close()
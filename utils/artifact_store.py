@@ -0,0 +1,236 @@
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+import threading
+from io import BytesIO
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARTIFACTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'reports', 'artifacts')
+
+# Pillow format name and file extension per image format
+IMAGE_FORMATS = {
+    "jpeg": ("JPEG", "jpg"),
+    "webp": ("WEBP", "webp"),
+    "png": ("PNG", "png"),
+}
+
+
+def sanitize_filename(name):
+    """
+    Sanitize a string to be used as a filename
+
+    :param name: Name to sanitize
+    :return: Sanitized name, at most 50 characters
+    """
+    name = name.replace(' ', '_')
+    for char in '<>:"/\\|?*':
+        name = name.replace(char, '')
+    return name[:50]
+
+
+class Artifact:
+    """
+    One stored artifact. The path is known as soon as the artifact is added; the file
+    exists once the background encoding has finished (see wait()). A duplicate of
+    earlier content shares that artifact's path and refers to it as original.
+    """
+
+    def __init__(self, kind, path, sha1, original=None):
+        self.kind = kind
+        self.path = path
+        self.sha1 = sha1
+        self.original = original
+        self._future = None
+
+    def wait(self):
+        """
+        Block until the artifact file is written
+
+        :return: Artifact path, or None if encoding failed
+        """
+        if self.original is not None:
+            return self.original.wait()
+        if self._future is not None and self._future.result() is None:
+            return None
+        return self.path
+
+
+class ArtifactStore:
+    """
+    Run-wide store for screenshots, page sources and logs from web and mobile drivers.
+
+    Artifacts land in one directory per run (reports/artifacts/<timestamp>-<pid>, so
+    parallel behave processes do not collide). Capturing stays on the calling thread,
+    since it needs the driver; compressing and writing happen on a small thread pool.
+    Identical content is stored once (by SHA-1) and later copies point at the first
+    file. Every artifact gets a line in index.jsonl with its scenario, step and size.
+    """
+
+    def __init__(self, run_dir=None, workers=2, image_format="jpeg", quality=75):
+        """
+        Initialize the store
+
+        :param run_dir: Directory for this run's artifacts (a new one under reports/artifacts if None)
+        :param workers: Background encoding threads
+        :param image_format: 'jpeg', 'webp' or 'png' (lossless)
+        :param quality: Lossy image quality (1-95)
+        """
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}-{os.getpid()}"
+        self.run_dir = run_dir or os.path.join(DEFAULT_ARTIFACTS_DIR, run_id)
+        self.index_path = os.path.join(self.run_dir, 'index.jsonl')
+        self.image_format = image_format
+        self.quality = quality
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='artifacts')
+        self._lock = threading.Lock()
+        self._seen = {}
+        self._sequence = 0
+        os.makedirs(self.run_dir, exist_ok=True)
+
+    def _reserve(self, kind, scenario, step, extension, digest):
+        """Assign a new artifact, or return the artifact holding identical content and True"""
+        with self._lock:
+            original = self._seen.get(digest)
+            if original is not None:
+                return original, True
+            self._sequence += 1
+            name = sanitize_filename(scenario or "run")
+            if step:
+                name = f"{name}_{sanitize_filename(step)}"
+            path = os.path.join(self.run_dir, f"{self._sequence:04d}_{kind}_{name}.{extension}")
+            artifact = self._seen[digest] = Artifact(kind, path, digest)
+            return artifact, False
+
+    def _index(self, entry):
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            with open(self.index_path, 'a') as f:
+                f.write(line)
+
+    def _add(self, kind, data, scenario, step, source, extension, encode, payload=None, digest_prefix=b""):
+        sha1 = hashlib.sha1(digest_prefix)
+        sha1.update(data)
+        digest = sha1.hexdigest()
+        artifact, duplicate = self._reserve(kind, scenario, step, extension, digest)
+        entry = {"kind": kind, "scenario": scenario, "step": step, "source": source, "sha1": digest,
+                 "path": os.path.relpath(artifact.path, self.run_dir), "captured_at": time.time()}
+
+        if duplicate:
+            entry["duplicate"] = True
+            self._index(entry)
+            return Artifact(kind, artifact.path, digest, original=artifact)
+
+        def write():
+            try:
+                encoded = encode(data if payload is None else payload)
+                with open(artifact.path, 'wb') as f:
+                    f.write(encoded)
+            except Exception as e:
+                logger.error(f"Failed to write {kind} artifact {artifact.path}: {e}")
+                return None
+            entry["bytes"] = len(encoded)
+            entry["raw_bytes"] = len(data)
+            self._index(entry)
+            return artifact.path
+
+        artifact._future = self._executor.submit(write)
+        return artifact
+
+    def _encode_image(self, image):
+        if isinstance(image, bytes):
+            image = Image.open(BytesIO(image))
+        pil_format, _ = IMAGE_FORMATS[self.image_format]
+        if pil_format == "JPEG" and image.mode != "RGB":
+            image = image.convert("RGB")
+        output = BytesIO()
+        if pil_format == "PNG":
+            image.save(output, format=pil_format, optimize=True)
+        else:
+            image.save(output, format=pil_format, quality=self.quality)
+        return output.getvalue()
+
+    def add_image(self, image, scenario, step=None, source="web", kind="screenshot"):
+        """
+        Store an image, compressed in the background
+
+        :param image: PNG bytes (e.g. driver.get_screenshot_as_png()) or a PIL Image
+        :param scenario: Scenario name
+        :param step: Optional step name
+        :param source: 'web' or 'mobile'
+        :param kind: Artifact kind recorded in the index
+        :return: Artifact
+        """
+        _, extension = IMAGE_FORMATS[self.image_format]
+        if isinstance(image, bytes):
+            return self._add(kind, image, scenario, step, source, extension, self._encode_image)
+        # Raw pixel bytes alone do not identify an image: the same bytes can be a different mode or shape
+        shape = f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode()
+        return self._add(kind, image.tobytes(), scenario, step, source, extension, self._encode_image, payload=image,
+                         digest_prefix=shape)
+
+    def add_screenshot(self, driver, scenario, step=None, source="web"):
+        """
+        Capture and store a screenshot from a Selenium or Appium driver
+
+        :param driver: WebDriver instance
+        :param scenario: Scenario name
+        :param step: Optional step name
+        :param source: 'web' or 'mobile'
+        :return: Artifact
+        """
+        return self.add_image(driver.get_screenshot_as_png(), scenario, step, source)
+
+    def add_text(self, kind, text, scenario, step=None, source="web", extension="txt"):
+        """
+        Store text such as a page source or log, gzip-compressed in the background
+
+        :param kind: Artifact kind, e.g. 'page_source' or 'log'
+        :param text: Text content
+        :param scenario: Scenario name
+        :param step: Optional step name
+        :param source: 'web' or 'mobile'
+        :param extension: File extension before '.gz'
+        :return: Artifact
+        """
+        return self._add(kind, text.encode('utf-8'), scenario, step, source, f"{extension}.gz",
+                         lambda data: gzip.compress(data, compresslevel=6))
+
+    def close(self):
+        """Wait for pending artifacts to be written."""
+        self._executor.shutdown(wait=True)
+        logger.info(f"Artifacts written to {self.run_dir}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store():
+    """
+    Get the artifact store shared by this process, creating it on first use
+
+    :return: ArtifactStore
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArtifactStore(image_format=os.environ.get('ARTIFACT_IMAGE_FORMAT', 'jpeg'))
+        return _store
+
+
+def close_artifact_store():
+    """Flush and drop the shared store; the next get_artifact_store() starts a new run directory."""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
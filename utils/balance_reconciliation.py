@@ -0,0 +1,179 @@
+import logging
+from decimal import Decimal, InvalidOperation
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+def _to_decimal(value):
+    if value is None:
+        return None
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return None
+
+
+class BalanceReport:
+    """
+    Account-by-account comparison of balances shown in the app, reported by the API and
+    (optionally) expected by the scenario.
+    """
+
+    def __init__(self, rows, tolerance=Decimal("0.00"), api_checked=True):
+        """
+        Initialize the report
+
+        :param rows: List of dictionaries with account_type, account_id, app, api and expected balances
+        :param tolerance: Largest difference still treated as a match
+        :param api_checked: False if the API was not queried, so missing API balances are not issues
+        """
+        self.rows = rows
+        self.tolerance = tolerance
+        self.api_checked = api_checked
+        for row in rows:
+            row["warnings"] = []
+            row["issues"] = self._issues(row)
+            for warning in row["warnings"]:
+                logger.warning(f"{row['account_type']}: {warning}")
+
+    def _issues(self, row):
+        issues = []
+        if row["app"] is None:
+            issues.append("not shown in app")
+        if self.api_checked and row["api"] is None:
+            # An app-only account (e.g. a mocked app build) has nothing to compare against
+            if row["account_id"] is None:
+                row["warnings"].append("no matching account in API")
+            else:
+                issues.append("no balance from API")
+        for source in ("api", "expected"):
+            other = row[source]
+            if other is None or row["app"] is None:
+                continue
+            if abs(row["app"] - other) > self.tolerance:
+                issues.append(f"app differs from {source} by {row['app'] - other}")
+        return issues
+
+    @property
+    def mismatches(self):
+        """Rows with at least one issue"""
+        return [row for row in self.rows if row["issues"]]
+
+    @property
+    def ok(self):
+        """True if every compared balance matches"""
+        return not self.mismatches
+
+    def balance(self, account_type, source="app"):
+        """
+        Get one balance from the report
+
+        :param account_type: Account type, e.g. 'checking'
+        :param source: 'app', 'api' or 'expected'
+        :return: Decimal, or None
+        """
+        for row in self.rows:
+            if row["account_type"] == account_type:
+                return row[source]
+        return None
+
+    def format(self):
+        """
+        Format the report as a text table
+
+        :return: Report string
+        """
+        lines = [f"{'Account':<12} {'ID':<20} {'App':>12} {'API':>12} {'Expected':>12}  Result"]
+        for row in self.rows:
+            values = [f"{row[source]:,.2f}" if row[source] is not None else "-" for source in ("app", "api", "expected")]
+            result = "; ".join(row["issues"]) or "; ".join(f"warning: {w}" for w in row["warnings"]) or "ok"
+            lines.append(f"{row['account_type']:<12} {row['account_id'] or '-':<20} "
+                         f"{values[0]:>12} {values[1]:>12} {values[2]:>12}  {result}")
+        return "\n".join(lines)
+
+
+class BalanceReconciler:
+    """
+    Compares app balances with the accounts API in one pass.
+
+    The account list is fetched once to map account types to IDs, then every balance is
+    requested concurrently, so the API side costs about one round trip more than the
+    slowest balance request instead of one per account in sequence.
+    """
+
+    def __init__(self, accounts_api, workers=4, tolerance=Decimal("0.00")):
+        """
+        Initialize the reconciler
+
+        :param accounts_api: Authenticated AccountsAPI client (None to compare with expected balances only)
+        :param workers: Concurrent balance requests
+        :param tolerance: Largest difference still treated as a match
+        """
+        self.api = accounts_api
+        self.workers = workers
+        self.tolerance = tolerance
+
+    def account_ids(self, account_types):
+        """
+        Map account types to the user's account IDs
+
+        :param account_types: Account types to look up
+        :return: Dictionary of account type to ID (first account of each type; None if the user has none)
+        """
+        response = self.api.get_accounts()
+        if response.status_code != 200:
+            raise RuntimeError(f"Could not list accounts: {response.status_code} - {response.text}")
+        ids = {}
+        for account in response.json().get("accounts", []):
+            ids.setdefault(account.get("account_type"), account.get("account_id"))
+        return {account_type: ids.get(account_type) for account_type in account_types}
+
+    def _fetch_balance(self, account_id):
+        response = self.api.get_account_balance(account_id)
+        if response.status_code != 200:
+            logger.warning(f"Could not get balance of {account_id}: {response.status_code}")
+            return None
+        return _to_decimal(response.json().get("balance"))
+
+    def api_balances(self, account_ids):
+        """
+        Fetch balances concurrently
+
+        :param account_ids: Dictionary of account type to account ID (None IDs are skipped)
+        :return: Dictionary of account type to Decimal balance, or None
+        """
+        known = {account_type: account_id for account_type, account_id in account_ids.items() if account_id}
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(known)))) as executor:
+            balances = dict(zip(known, executor.map(self._fetch_balance, known.values())))
+        return {account_type: balances.get(account_type) for account_type in account_ids}
+
+    def reconcile(self, app_balances, expected=None):
+        """
+        Compare app balances with the API and expected values
+
+        :param app_balances: Dictionary of account type to balance shown in the app (None if not shown)
+        :param expected: Optional dictionary of account type to the balance the scenario expects
+        :return: BalanceReport
+        """
+        expected = expected or {}
+        if self.api is not None:
+            account_ids = self.account_ids(list(app_balances))
+            api_balances = self.api_balances(account_ids)
+        else:
+            account_ids = api_balances = dict.fromkeys(app_balances)
+        rows = []
+        for account_type, app_balance in app_balances.items():
+            # Account types neither shown in the app, held by the user nor expected are not compared
+            if app_balance is None and account_ids[account_type] is None and account_type not in expected:
+                continue
+            rows.append({
+                "account_type": account_type,
+                "account_id": account_ids[account_type],
+                "app": app_balance,
+                "api": api_balances[account_type],
+                "expected": _to_decimal(expected.get(account_type)),
+            })
+        report = BalanceReport(rows, self.tolerance, api_checked=self.api is not None)
+        logger.info(f"Balance reconciliation:\n{report.format()}")
+        return report
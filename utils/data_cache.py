@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for generated test data.
+
+Every entity file is keyed by a hash of the generator parameters it depends on, the
+run seed and the generator source code. The keys are stored in test_data/manifest.json;
+on the next run only entity files whose key changed (or whose file is missing) are
+regenerated:
+
+    python utils/data_cache.py --seed 42 --payees 10    # rewrites payees only
+"""
+
+import os
+import sys
+import json
+import hashlib
+import logging
+import argparse
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.parallel_data_generator import generate_sharded_test_data_set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'test_data')
+MANIFEST_NAME = "manifest.json"
+
+# Source files whose changes invalidate every cached entity
+CODE_FILES = (
+    "data_generator.py",
+    "parallel_data_generator.py",
+    "data_writers.py",
+    "faker_pool.py",
+    "ledger.py",
+    "transaction_categorizer.py",
+)
+
+# Generator parameters each entity file depends on (seed, reference date, format and code version apply to all)
+ENTITY_PARAMS = {
+    "users": ("num_users",),
+    "accounts": ("num_users", "num_accounts_per_user"),
+    "transactions": ("num_users", "num_accounts_per_user", "num_transactions", "bulk", "chunk_size", "ledger"),
+    "balance_snapshots": ("num_users", "num_accounts_per_user", "num_transactions", "bulk", "chunk_size"),
+    "payees": ("num_payees",),
+}
+
+
+def code_version():
+    """
+    Hash the data generation source code
+
+    :return: Hex digest
+    """
+    digest = hashlib.sha256()
+    for name in CODE_FILES:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), name), 'rb') as f:
+            digest.update(name.encode() + b"\0" + f.read())
+    return digest.hexdigest()
+
+
+def file_digest(path):
+    """
+    Hash a file's content
+
+    :param path: File path
+    :return: SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DataCache:
+    """
+    Manifest of the generated entity files in a test data directory and the keys they were generated from.
+    """
+
+    def __init__(self, output_dir=None):
+        """
+        Initialize the cache
+
+        :param output_dir: Test data directory (test_data if None)
+        """
+        self.output_dir = output_dir or DEFAULT_DATA_DIR
+        self.manifest_path = os.path.join(self.output_dir, MANIFEST_NAME)
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f).get("entities", {})
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """Write the manifest atomically"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        temp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({"entities": self.entries}, f, indent=4, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
+
+    @staticmethod
+    def entity_keys(params, version=None):
+        """
+        Compute the cache key of every entity for a set of generator parameters
+
+        :param params: Dictionary of generator parameters including seed, reference_date and output_format
+        :param version: Code version (code_version() if None)
+        :return: Dictionary of entity name to (key, parameters the key covers)
+        """
+        version = version or code_version()
+        common = {name: params[name] for name in ("seed", "reference_date", "output_format")}
+        entities = ENTITY_PARAMS if params.get("ledger", True) else {
+            name: names for name, names in ENTITY_PARAMS.items() if name != "balance_snapshots"
+        }
+        keys = {}
+        for name, names in entities.items():
+            covered = dict(common, **{param: params[param] for param in names})
+            payload = json.dumps({"entity": name, "params": covered, "code": version}, sort_keys=True, default=str)
+            keys[name] = (hashlib.sha256(payload.encode()).hexdigest(), covered)
+        return keys
+
+    def is_current(self, name, key):
+        """
+        Check whether an entity file was generated with the given key and is still on disk unchanged
+
+        :param name: Entity name
+        :param key: Cache key from entity_keys
+        :return: True if the file can be reused
+        """
+        entry = self.entries.get(name)
+        if not entry or entry.get("key") != key:
+            return False
+        path = os.path.join(self.output_dir, entry["file"])
+        if not os.path.isfile(path) or os.path.getsize(path) != entry.get("size"):
+            return False
+        return file_digest(path) == entry.get("sha256")
+
+    def record(self, name, key, params, path):
+        """
+        Record a freshly generated entity file
+
+        :param name: Entity name
+        :param key: Cache key from entity_keys
+        :param params: Parameters the key covers
+        :param path: Generated file
+        """
+        self.entries[name] = {
+            "key": key,
+            "params": params,
+            "file": os.path.relpath(path, self.output_dir),
+            "size": os.path.getsize(path),
+            "sha256": file_digest(path),
+        }
+
+    def path(self, name):
+        """Path of a cached entity file, or None"""
+        entry = self.entries.get(name)
+        return os.path.join(self.output_dir, entry["file"]) if entry else None
+
+
+def generate_cached_test_data_set(seed, num_users=3, num_accounts_per_user=2, num_transactions=50, num_payees=5,
+                                  workers=None, bulk=False, output_format="jsonl", chunk_size=100000,
+                                  reference_date=None, output_dir=None, ledger=True, force=False):
+    """
+    Generate a reproducible test data set, reusing entity files whose cache key is unchanged
+
+    Takes the same parameters as generate_sharded_test_data_set. The worker count is not part of
+    any key because sharded output does not depend on it. Relative dates count back from
+    reference_date (today at midnight if None), so an unpinned data set is regenerated once a day.
+
+    :param force: Regenerate every entity file regardless of the manifest
+    :return: Tuple (dictionary of entity name to output path, list of regenerated entity names)
+    """
+    reference_date = reference_date or datetime.combine(datetime.now().date(), datetime.min.time())
+    params = {
+        "seed": seed, "num_users": num_users, "num_accounts_per_user": num_accounts_per_user,
+        "num_transactions": num_transactions, "num_payees": num_payees, "bulk": bool(bulk),
+        "output_format": output_format, "chunk_size": chunk_size, "reference_date": reference_date.isoformat(),
+        "ledger": ledger,
+    }
+    cache = DataCache(output_dir)
+    keys = cache.entity_keys(params)
+    stale = [name for name, (key, _) in keys.items() if force or not cache.is_current(name, key)]
+
+    paths = {name: cache.path(name) for name in keys if name not in stale}
+    if stale:
+        logger.info(f"Regenerating {', '.join(stale)} in {cache.output_dir}")
+        paths.update(generate_sharded_test_data_set(
+            seed, num_users, num_accounts_per_user, num_transactions, num_payees, workers, bulk, output_format,
+            chunk_size, reference_date, cache.output_dir, ledger, entities=set(stale)
+        ))
+        for name in stale:
+            key, covered = keys[name]
+            cache.record(name, key, covered, paths[name])
+    for name in set(cache.entries) - set(keys):
+        # e.g. balance snapshots left over from a ledger run no longer match the transactions
+        stale_path = cache.path(name)
+        if os.path.isfile(stale_path):
+            os.remove(stale_path)
+        del cache.entries[name]
+    cache.save()
+
+    if not stale:
+        logger.info(f"Test data in {cache.output_dir} is up to date")
+    return paths, stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate reproducible test data, reusing unchanged entity files')
+    parser.add_argument('--seed', type=int, required=True, help='Run seed')
+    parser.add_argument('--users', type=int, default=3, help='Number of users (default: 3)')
+    parser.add_argument('--accounts', type=int, default=2, help='Accounts per user (default: 2)')
+    parser.add_argument('--transactions', type=int, default=50, help='Transactions per account (default: 50)')
+    parser.add_argument('--payees', type=int, default=5, help='Number of payees (default: 5)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--bulk', action='store_true', help='Generate transactions in bulk mode')
+    parser.add_argument('--format', choices=['jsonl', 'parquet', 'json'], default='jsonl',
+                        help='Output format (default: jsonl)')
+    parser.add_argument('--reference-date', help='Date relative dates count back from, YYYY-MM-DD (default: today)')
+    parser.add_argument('--output-dir', help='Output directory (default: test_data)')
+    parser.add_argument('--force', action='store_true', help='Regenerate every file')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    _, stale = generate_cached_test_data_set(
+        args.seed, args.users, args.accounts, args.transactions, args.payees, args.workers, args.bulk, args.format,
+        reference_date=datetime.strptime(args.reference_date, "%Y-%m-%d") if args.reference_date else None,
+        output_dir=args.output_dir, force=args.force
+    )
+    print(f"Regenerated: {', '.join(stale) or 'nothing'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,22 +2,66 @@ from faker import Faker
 import random
 import json
 import os
+import sys
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.data_writers import open_writer
+from utils.faker_pool import get_faker_pool
+from utils.transaction_categorizer import get_categorizer
+from utils.ledger import apply_running_balance, daily_snapshots, format_cents, to_cents
+
 class DataGenerator:
     """
     Utility class for generating test data for bank automation tests
     """
     
-    def __init__(self):
+    TRANSACTION_TYPES = {
+        True: ["ATM Withdrawal", "Debit Card Purchase", "Bill Payment", "Transfer Out", "Check"],
+        False: ["Deposit", "Direct Deposit", "Interest Payment", "Transfer In", "Refund"]
+    }
+    MERCHANTS = ["Amazon", "Walmart", "Target", "Starbucks", "Netflix", "Uber", "Gas Station", "Restaurant", "Grocery Store"]
+    
+    def __init__(self, seed=None, reference_date=None):
+        """
+        Initialize the generator
+        
+        :param seed: Seed for reproducible output (random if None)
+        :param reference_date: Date that relative dates count back from (now if None)
+        """
         self.faker = Faker()
+        # Names, addresses and companies come from pre-sampled Faker values drawn with self.random
+        self.pool = get_faker_pool()
+        self.random = random.Random()
+        self.reference_date = reference_date
+        if seed is not None:
+            self.reseed(seed)
         self.test_data_path = os.path.join(
             os.path.dirname(os.path.dirname(__file__)),
             'test_data'
         )
         os.makedirs(self.test_data_path, exist_ok=True)
     
+    def reseed(self, seed):
+        """
+        Reseed the random generator and Faker instance
+        
+        :param seed: Integer seed
+        """
+        self.random.seed(seed)
+        self.faker.seed_instance(seed)
+    
+    def _now(self):
+        return self.reference_date or datetime.now()
+    
+    def _fake(self, field):
+        return self.pool.draw(field, self.random)
+    
     def generate_user(self, with_2fa=False):
         """
         Generate a test user with banking profile
@@ -25,30 +69,30 @@ class DataGenerator:
         :param with_2fa: Whether the user has 2FA enabled
         :return: Dictionary with user data
         """
-        first_name = self.faker.first_name()
-        last_name = self.faker.last_name()
+        first_name = self._fake("first_name")
+        last_name = self._fake("last_name")
         
         user = {
-            "username": f"{first_name.lower()}{last_name.lower()}{random.randint(1, 999)}",
-            "password": self.faker.password(length=12, special_chars=True, digits=True, upper_case=True, lower_case=True),
-            "email": self.faker.email(),
+            "username": f"{first_name.lower()}{last_name.lower()}{self.random.randint(1, 999)}",
+            "password": self._fake("password"),
+            "email": self._fake("email"),
             "first_name": first_name,
             "last_name": last_name,
             "address": {
-                "street": self.faker.street_address(),
-                "city": self.faker.city(),
-                "state": self.faker.state(),
-                "zipcode": self.faker.zipcode(),
+                "street": self._fake("street_address"),
+                "city": self._fake("city"),
+                "state": self._fake("state"),
+                "zipcode": self._fake("zipcode"),
                 "country": "United States"
             },
-            "phone": self.faker.phone_number(),
-            "date_of_birth": self.faker.date_of_birth(minimum_age=18, maximum_age=80).strftime("%Y-%m-%d"),
-            "ssn_last_4": f"{random.randint(1000, 9999)}",
+            "phone": self._fake("phone_number"),
+            "date_of_birth": (self._now() - timedelta(days=self.random.randint(18 * 365 + 5, 80 * 365))).strftime("%Y-%m-%d"),
+            "ssn_last_4": f"{self.random.randint(1000, 9999)}",
             "has_2fa": with_2fa
         }
         
         if with_2fa:
-            user["totp_secret"] = "BASE32SECRET" + ''.join(random.choice('234567ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(10))
+            user["totp_secret"] = "BASE32SECRET" + ''.join(self.random.choice('234567ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(10))
         
         return user
     
@@ -62,20 +106,20 @@ class DataGenerator:
         """
         if starting_balance is None:
             if account_type.lower() == "checking":
-                starting_balance = Decimal(str(round(random.uniform(500, 10000), 2)))
+                starting_balance = Decimal(str(round(self.random.uniform(500, 10000), 2)))
             elif account_type.lower() == "savings":
-                starting_balance = Decimal(str(round(random.uniform(1000, 50000), 2)))
+                starting_balance = Decimal(str(round(self.random.uniform(1000, 50000), 2)))
             else:
-                starting_balance = Decimal(str(round(random.uniform(100, 5000), 2)))
+                starting_balance = Decimal(str(round(self.random.uniform(100, 5000), 2)))
         
         return {
             "account_id": f"{account_type.upper()}-{self.faker.random_number(digits=10)}",
             "account_type": account_type,
             "balance": starting_balance,
             "currency": "USD",
-            "open_date": (datetime.now() - timedelta(days=random.randint(30, 730))).strftime("%Y-%m-%d"),
+            "open_date": (self._now() - timedelta(days=self.random.randint(30, 730))).strftime("%Y-%m-%d"),
             "status": "active",
-            "interest_rate": Decimal(str(round(random.uniform(0.01, 2.5), 2))) if account_type.lower() == "savings" else None
+            "interest_rate": Decimal(str(round(self.random.uniform(0.01, 2.5), 2))) if account_type.lower() == "savings" else None
         }
     
     def generate_transaction(self, account_id, is_debit=None, amount=None, days_ago=None):
@@ -89,25 +133,19 @@ class DataGenerator:
         :return: Dictionary with transaction data
         """
         if is_debit is None:
-            is_debit = random.choice([True, False])
+            is_debit = self.random.choice([True, False])
         
         if amount is None:
-            amount = Decimal(str(round(random.uniform(1, 1000), 2)))
+            amount = Decimal(str(round(self.random.uniform(1, 1000), 2)))
         
         if days_ago is None:
-            days_ago = random.randint(0, 90)
+            days_ago = self.random.randint(0, 90)
         
-        transaction_date = datetime.now() - timedelta(days=days_ago)
+        transaction_date = self._now() - timedelta(days=days_ago)
         
-        transaction_types = {
-            True: ["ATM Withdrawal", "Debit Card Purchase", "Bill Payment", "Transfer Out", "Check"],
-            False: ["Deposit", "Direct Deposit", "Interest Payment", "Transfer In", "Refund"]
-        }
-        
-        description = random.choice(transaction_types[is_debit])
+        description = self.random.choice(self.TRANSACTION_TYPES[is_debit])
         if description == "Debit Card Purchase":
-            merchants = ["Amazon", "Walmart", "Target", "Starbucks", "Netflix", "Uber", "Gas Station", "Restaurant", "Grocery Store"]
-            description += f" - {random.choice(merchants)}"
+            description += f" - {self.random.choice(self.MERCHANTS)}"
         
         return {
             "transaction_id": f"TX-{self.faker.random_number(digits=12)}",
@@ -117,10 +155,65 @@ class DataGenerator:
             "is_debit": is_debit,
             "description": description,
             "category": self._get_transaction_category(description),
-            "balance_after": None,  # Would be calculated based on previous transactions
+            "balance_after": None,
             "status": "cleared"
         }
     
+    def generate_transactions_bulk(self, account_ids, num_transactions, seed=None, reference_date=None):
+        """
+        Generate transactions for many accounts at once as a DataFrame
+        
+        Same distribution as generate_transaction, but every column is drawn as a NumPy array.
+        Amounts are exact integer cents; descriptions and categories are categoricals.
+        
+        :param account_ids: List of account IDs
+        :param num_transactions: Number of transactions per account
+        :param seed: Seed for the NumPy random generator (drawn from self.random if None)
+        :param reference_date: Date that "days ago" counts back from (the generator's reference date if None)
+        :return: DataFrame with one row per transaction
+        """
+        rng = np.random.default_rng(seed if seed is not None else self.random.getrandbits(64))
+        num_rows = len(account_ids) * num_transactions
+        reference_date = np.datetime64((reference_date or self._now()).strftime("%Y-%m-%d"), 'D')
+        
+        # Every possible description: debit types (card purchases per merchant), then credit types
+        debit_descriptions = [
+            f"Debit Card Purchase - {merchant}" for merchant in self.MERCHANTS
+        ] + [description for description in self.TRANSACTION_TYPES[True] if description != "Debit Card Purchase"]
+        descriptions = debit_descriptions + self.TRANSACTION_TYPES[False]
+        categories = get_categorizer().categorize_many(descriptions)
+        
+        category_names = sorted(set(categories))
+        category_codes = np.array([category_names.index(category) for category in categories])
+        
+        is_debit = rng.integers(0, 2, num_rows).astype(bool)
+        # Pick the type uniformly as generate_transaction does, then the merchant for card purchases
+        type_index = rng.integers(0, 5, num_rows)
+        merchant_index = rng.integers(0, len(self.MERCHANTS), num_rows)
+        card_purchase = self.TRANSACTION_TYPES[True].index("Debit Card Purchase")
+        debit_type_codes = np.array([
+            descriptions.index(description) if description in descriptions else card_purchase
+            for description in self.TRANSACTION_TYPES[True]
+        ])
+        description_codes = np.where(
+            is_debit,
+            np.where(type_index == card_purchase, merchant_index, debit_type_codes[type_index]),
+            len(debit_descriptions) + type_index
+        )
+        
+        transaction_numbers = rng.choice(10 ** 12, size=num_rows, replace=False)
+        
+        return pd.DataFrame({
+            "transaction_id": pd.Series(transaction_numbers).astype(str).str.zfill(12).radd("TX-"),
+            "account_id": np.repeat(np.asarray(account_ids, dtype=object), num_transactions),
+            "date": reference_date - rng.integers(0, 91, num_rows).astype('timedelta64[D]'),
+            "amount_cents": rng.integers(100, 100001, num_rows, dtype=np.int64),
+            "is_debit": is_debit,
+            "description": pd.Categorical.from_codes(description_codes, descriptions),
+            "category": pd.Categorical.from_codes(category_codes[description_codes], category_names),
+            "status": "cleared",
+        })
+    
     def _get_transaction_category(self, description):
         """
         Determine transaction category based on description
@@ -128,32 +221,7 @@ class DataGenerator:
         :param description: Transaction description
         :return: Category string
         """
-        description = description.lower()
-        
-        if "withdrawal" in description:
-            return "Cash"
-        elif "deposit" in description:
-            return "Income"
-        elif "interest" in description:
-            return "Interest"
-        elif "transfer" in description:
-            return "Transfer"
-        elif "bill payment" in description:
-            return "Bill Payment"
-        elif any(merchant in description.lower() for merchant in ["restaurant", "starbucks"]):
-            return "Dining"
-        elif any(merchant in description.lower() for merchant in ["amazon", "walmart", "target"]):
-            return "Shopping"
-        elif "netflix" in description:
-            return "Entertainment"
-        elif "uber" in description:
-            return "Transportation"
-        elif "gas" in description:
-            return "Auto & Transport"
-        elif "grocery" in description:
-            return "Groceries"
-        else:
-            return "Miscellaneous"
+        return get_categorizer().categorize(description)
     
     def generate_payee(self):
         """
@@ -161,7 +229,7 @@ class DataGenerator:
         
         :return: Dictionary with payee data
         """
-        company_name = self.faker.company()
+        company_name = self._fake("company")
         
         return {
             "payee_id": f"PAYEE-{self.faker.random_number(digits=8)}",
@@ -170,18 +238,68 @@ class DataGenerator:
             "account_number": self.faker.random_number(digits=10),
             "routing_number": self.faker.random_number(digits=9),
             "address": {
-                "street": self.faker.street_address(),
-                "city": self.faker.city(),
-                "state": self.faker.state(),
-                "zipcode": self.faker.zipcode()
+                "street": self._fake("street_address"),
+                "city": self._fake("city"),
+                "state": self._fake("state"),
+                "zipcode": self._fake("zipcode")
             },
-            "phone": self.faker.phone_number(),
-            "category": random.choice(["Utilities", "Housing", "Insurance", "Subscriptions", "Other"]),
-            "last_payment_date": (datetime.now() - timedelta(days=random.randint(1, 30))).strftime("%Y-%m-%d"),
-            "last_payment_amount": Decimal(str(round(random.uniform(10, 500), 2)))
+            "phone": self._fake("phone_number"),
+            "category": self.random.choice(["Utilities", "Housing", "Insurance", "Subscriptions", "Other"]),
+            "last_payment_date": (self._now() - timedelta(days=self.random.randint(1, 30))).strftime("%Y-%m-%d"),
+            "last_payment_amount": Decimal(str(round(self.random.uniform(10, 500), 2)))
         }
     
-    def generate_test_data_set(self, num_users=3, num_accounts_per_user=2, num_transactions=50, num_payees=5):
+    def transactions_to_frame(self, transactions):
+        """
+        Convert bulk transactions to the record layout of generate_transaction
+        
+        :param transactions: DataFrame from generate_transactions_bulk (optionally with balance_after_cents)
+        :return: DataFrame with string dates and exact decimal amount strings
+        """
+        return pd.DataFrame({
+            "transaction_id": transactions["transaction_id"],
+            "account_id": transactions["account_id"],
+            "date": transactions["date"].dt.strftime("%Y-%m-%d"),
+            "amount": format_cents(transactions["amount_cents"]),
+            "is_debit": transactions["is_debit"],
+            "description": transactions["description"].astype(str),
+            "category": transactions["category"].astype(str),
+            "balance_after": format_cents(transactions["balance_after_cents"])
+            if "balance_after_cents" in transactions else None,
+            "status": transactions["status"],
+        })
+    
+    def apply_ledger(self, account, transactions):
+        """
+        Ledger stage: sort an account's transactions by date and compute balance_after from the account balance
+        
+        The account's balance is its current (closing) balance, so the opening balance is backed out of the
+        net transaction amount and the last balance_after always equals account["balance"].
+        
+        :param account: Account dictionary
+        :param transactions: DataFrame from generate_transactions_bulk, or a list of generate_transaction dictionaries
+        :return: Tuple (transactions DataFrame in record layout, daily balance snapshots DataFrame)
+        """
+        if not isinstance(transactions, pd.DataFrame):
+            transactions = pd.DataFrame(transactions)
+            transactions["amount_cents"] = to_cents(transactions.pop("amount"))
+            transactions["date"] = pd.to_datetime(transactions["date"])
+        
+        signed = np.where(transactions["is_debit"].to_numpy(), -transactions["amount_cents"].to_numpy(),
+                          transactions["amount_cents"].to_numpy())
+        opening_cents = int(Decimal(str(account["balance"])) * 100) - int(signed.sum())
+        opening_balances = {account["account_id"]: Decimal(opening_cents).scaleb(-2)}
+        ledger = apply_running_balance(transactions, opening_balances)
+        snapshots = daily_snapshots(ledger, opening_balances, end_date=self._now().date())
+        
+        return self.transactions_to_frame(ledger), pd.DataFrame({
+            "account_id": snapshots["account_id"],
+            "date": snapshots["date"].dt.strftime("%Y-%m-%d"),
+            "balance": format_cents(snapshots["balance_cents"]),
+        })
+    
+    def generate_test_data_set(self, num_users=3, num_accounts_per_user=2, num_transactions=50, num_payees=5, bulk=False,
+                               output_format="json", chunk_size=100000, ledger=True):
         """
         Generate a complete test data set and save to JSON files
         
@@ -189,41 +307,117 @@ class DataGenerator:
         :param num_accounts_per_user: Number of accounts per user
         :param num_transactions: Number of transactions to generate per account
         :param num_payees: Number of payees to generate
+        :param bulk: Generate transactions with generate_transactions_bulk (for large histories)
+        :param output_format: 'json' (indented JSON lists), or 'jsonl'/'parquet' to stream records to disk
+        :param chunk_size: Transactions per bulk chunk / Parquet row group when streaming
+        :param ledger: Compute balance_after and write daily balance snapshots (see apply_ledger)
         """
-        users = []
-        accounts = []
-        transactions = []
-        payees = []
+        if output_format != "json":
+            return self._stream_test_data_set(
+                num_users, num_accounts_per_user, num_transactions, num_payees, bulk, output_format, chunk_size, ledger
+            )
+        
+        records = {name: [] for name in ("users", "accounts", "transactions", "balance_snapshots")}
         
-        # Generate users
+        # Generate users with their accounts and transactions
         for i in range(num_users):
-            with_2fa = i == 1  # Make one user have 2FA
-            user = self.generate_user(with_2fa=with_2fa)
-            users.append(user)
-            
-            # Generate accounts for each user
-            for j in range(num_accounts_per_user):
-                account_type = "checking" if j == 0 else "savings"
-                account = self.generate_account(account_type=account_type)
-                account["user_id"] = user["username"]
-                accounts.append(account)
-                
-                # Generate transactions for each account
-                for _ in range(num_transactions):
-                    transaction = self.generate_transaction(account["account_id"])
-                    transactions.append(transaction)
+            for name, record in self.generate_user_records(
+                i, num_accounts_per_user, num_transactions, bulk, chunk_size, ledger=ledger
+            ):
+                records[name].append(record)
         
         # Generate payees
-        for _ in range(num_payees):
-            payee = self.generate_payee()
-            payees.append(payee)
+        payees = [self.generate_payee() for _ in range(num_payees)]
         
         # Save to JSON files
-        self._save_json(users, "users.json")
-        self._save_json(accounts, "accounts.json")
-        self._save_json(transactions, "transactions.json")
+        self._save_json(records["users"], "users.json")
+        self._save_json(records["accounts"], "accounts.json")
+        transactions = records["transactions"]
+        if transactions and isinstance(transactions[0], pd.DataFrame):
+            self._save_frame_json(pd.concat(transactions, ignore_index=True), "transactions.json")
+        else:
+            self._save_json(transactions, "transactions.json")
+        if records["balance_snapshots"]:
+            self._save_frame_json(pd.concat(records["balance_snapshots"], ignore_index=True), "balance_snapshots.json")
         self._save_json(payees, "payees.json")
     
+    def generate_user_records(self, index, num_accounts_per_user, num_transactions, bulk=False, chunk_size=100000,
+                              user_seed=None, account_seeds=None, ledger=False):
+        """
+        Generate one user with their accounts and transactions, yielding records as they are produced
+        
+        :param index: Index of the user in the data set (the second user gets 2FA)
+        :param num_accounts_per_user: Number of accounts for the user
+        :param num_transactions: Number of transactions per account
+        :param bulk: Generate transactions with generate_transactions_bulk
+        :param chunk_size: Transactions per bulk chunk
+        :param user_seed: Seed applied before generating the user and accounts (None keeps the current state)
+        :param account_seeds: Seeds applied before generating each account's transactions
+        :param ledger: Run each account's transactions through apply_ledger (holds one account's history in memory)
+        :return: Iterator of (entity name, record dict or DataFrame) tuples
+        """
+        if user_seed is not None:
+            self.reseed(user_seed)
+        user = self.generate_user(with_2fa=index == 1)
+        accounts = []
+        for j in range(num_accounts_per_user):
+            account = self.generate_account(account_type="checking" if j == 0 else "savings")
+            account["user_id"] = user["username"]
+            accounts.append(account)
+        
+        yield "users", user
+        for j, account in enumerate(accounts):
+            yield "accounts", account
+            if account_seeds is not None:
+                self.reseed(account_seeds[j])
+            if ledger and num_transactions:
+                if bulk:
+                    history = self.generate_transactions_bulk([account["account_id"]], num_transactions)
+                else:
+                    history = [self.generate_transaction(account["account_id"]) for _ in range(num_transactions)]
+                transactions, snapshots = self.apply_ledger(account, history)
+                for start in range(0, len(transactions), chunk_size):
+                    yield "transactions", transactions.iloc[start:start + chunk_size]
+                yield "balance_snapshots", snapshots
+            elif bulk:
+                for start in range(0, num_transactions, chunk_size):
+                    chunk = self.generate_transactions_bulk(
+                        [account["account_id"]], min(chunk_size, num_transactions - start)
+                    )
+                    yield "transactions", self.transactions_to_frame(chunk)
+            else:
+                for _ in range(num_transactions):
+                    yield "transactions", self.generate_transaction(account["account_id"])
+    
+    def _stream_test_data_set(self, num_users, num_accounts_per_user, num_transactions, num_payees, bulk,
+                              output_format, chunk_size, ledger):
+        """
+        Generate a test data set, writing each record as soon as it is generated
+        
+        Without the ledger stage memory stays bounded by chunk_size regardless of num_transactions;
+        with it, by one account's history.
+        """
+        names = ("users", "accounts", "transactions", "payees") + (("balance_snapshots",) if ledger else ())
+        writers = {name: open_writer(self.test_data_path, name, output_format, chunk_size) for name in names}
+        try:
+            for i in range(num_users):
+                for name, record in self.generate_user_records(
+                    i, num_accounts_per_user, num_transactions, bulk, chunk_size, ledger=ledger
+                ):
+                    if isinstance(record, pd.DataFrame):
+                        writers[name].write_frame(record)
+                    else:
+                        writers[name].write(record)
+            
+            for _ in range(num_payees):
+                writers["payees"].write(self.generate_payee())
+        finally:
+            for writer in writers.values():
+                writer.close()
+        
+        for writer in writers.values():
+            print(f"Saved {writer.count} records to {writer.path}")
+    
     def _save_json(self, data, filename):
         """
         Save data to a JSON file
@@ -243,6 +437,18 @@ class DataGenerator:
             json.dump(data, f, indent=4, default=decimal_default)
             
         print(f"Saved {len(data)} records to {file_path}")
+    
+    def _save_frame_json(self, frame, filename):
+        """
+        Save a DataFrame to a JSON file as a list of records
+        
+        :param frame: DataFrame to save
+        :param filename: Filename to save to
+        """
+        file_path = os.path.join(self.test_data_path, filename)
+        frame.to_json(file_path, orient="records", indent=4)
+        
+        print(f"Saved {len(frame)} records to {file_path}")
 
 
 if __name__ == "__main__":
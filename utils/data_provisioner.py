@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Load generated test data into the bank backend through the admin API.
+
+Users, accounts and payees are created in that order with concurrent requests. Records
+are sent in batches; after each batch the IDs that were created (or already existed) are
+appended to a checkpoint file, so an interrupted run resumes where it stopped:
+
+    python utils/data_provisioner.py --workers 32                 # provision test_data into the configured API
+    python utils/data_provisioner.py --api-base-url http://127.0.0.1:8080/v1 --reset
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import requests
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api_clients.accounts_api import AccountsAPI
+from api_clients.user_management_api import UserManagementAPI
+from utils.data_writers import find_data_file, read_records
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'test_data')
+
+# Provisioning order, with the field identifying each record
+STAGES = (
+    ("users", "username"),
+    ("accounts", "account_id"),
+    ("payees", "payee_id"),
+)
+
+# Responses worth retrying: rate limiting and server-side failures
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def _load_config():
+    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.json')
+    with open(config_path, 'r') as f:
+        return json.load(f)
+
+
+class DataProvisioner:
+    """
+    Pushes generated users, accounts and payees into the API with batched concurrent requests.
+    """
+
+    def __init__(self, test_data_path=None, api_base_url=None, workers=16, batch_size=200, checkpoint_path=None,
+                 retries=3):
+        """
+        Initialize the provisioner
+
+        :param test_data_path: Directory with generated data files (test_data if None)
+        :param api_base_url: API base URL (APIClient default if None)
+        :param workers: Concurrent requests
+        :param batch_size: Records per batch; the checkpoint is written after every batch
+        :param checkpoint_path: Checkpoint file (one per API base URL and data set in the data directory if None)
+        :param retries: Attempts per record for connection errors and retryable status codes
+        """
+        self.config = _load_config()
+        self.test_data_path = test_data_path or DEFAULT_DATA_DIR
+        self.api_base_url = api_base_url or os.environ.get('API_BASE_URL') or self.config.get('api_base_url')
+        self.workers = workers
+        self.batch_size = batch_size
+        self.retries = retries
+        url_hash = hashlib.sha1(self.api_base_url.encode()).hexdigest()[:10]
+        self.checkpoint_path = checkpoint_path or os.path.join(
+            self.test_data_path, f".provisioned-{url_hash}-{self.data_fingerprint()}.jsonl"
+        )
+        self._token = None
+        self._local = threading.local()
+
+    def _authenticate(self):
+        admin = self.config.get('users', {}).get('admin_user', {})
+        api = UserManagementAPI(base_url=self.api_base_url)
+        response = api.authenticate(admin.get('username'), admin.get('password'))
+        if response.status_code != 200:
+            raise RuntimeError(f"Admin authentication failed: {response.status_code} - {response.text}")
+        self._token = api.token
+
+    def data_fingerprint(self):
+        """
+        Identify the generated data set, so a regenerated data set is provisioned again
+
+        :return: Hex digest of the data files' names, sizes and modification times
+        """
+        digest = hashlib.sha1()
+        for entity, _ in STAGES:
+            path = find_data_file(self.test_data_path, entity)
+            if path:
+                stat = os.stat(path)
+                digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        return digest.hexdigest()[:10]
+
+    def _clients(self):
+        """Get this thread's API clients, sharing one keep-alive session"""
+        if not hasattr(self._local, "clients"):
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            users = UserManagementAPI(base_url=self.api_base_url, token=self._token)
+            accounts = AccountsAPI(base_url=self.api_base_url, token=self._token)
+            users.session = accounts.session = session
+            self._local.clients = {"users": users.create_user, "accounts": accounts.create_account,
+                                   "payees": accounts.create_payee}
+        return self._local.clients
+
+    def load_checkpoint(self):
+        """
+        Read the IDs provisioned by earlier runs
+
+        :return: Dictionary of entity name to set of IDs
+        """
+        done = {name: set() for name, _ in STAGES}
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line of an interrupted run
+                    done.setdefault(entry["entity"], set()).add(entry["id"])
+        return done
+
+    def reset(self):
+        """Forget earlier runs so every record is sent again"""
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def _checkpoint_is_current(self, done):
+        """
+        Check that the backend still has a user recorded in the checkpoint
+
+        A backend that was reset (e.g. a restarted local server on the same port) keeps its URL,
+        so the checkpoint alone cannot tell that its records are gone.
+
+        :param done: Checkpoint from load_checkpoint
+        :return: False if a checkpointed user is missing from the backend
+        """
+        if not done.get("users"):
+            return True
+        username = min(done["users"])
+        response = UserManagementAPI(base_url=self.api_base_url, token=self._token).get_user_status(username)
+        if response.status_code == 404:
+            logger.warning(f"Provisioned user {username} no longer exists; ignoring checkpoint {self.checkpoint_path}")
+            return False
+        return True
+
+    def _create(self, entity, record):
+        """
+        Create one record, retrying transient failures
+
+        :return: 'created', 'exists' or 'failed'
+        """
+        create = self._clients()[entity]
+        for attempt in range(self.retries):
+            try:
+                response = create(record)
+            except requests.RequestException as e:
+                error = str(e)
+            else:
+                if response.status_code in (200, 201):
+                    return "created"
+                if response.status_code == 409:
+                    return "exists"
+                error = f"{response.status_code} - {response.text[:200]}"
+                if response.status_code not in RETRY_STATUS:
+                    break
+            time.sleep(0.5 * 2 ** attempt)
+        logger.error(f"Could not provision {entity} record: {error}")
+        return "failed"
+
+    def run(self):
+        """
+        Provision every stage, skipping records recorded in the checkpoint
+
+        :return: Dictionary of entity name to counts of created, existing, skipped and failed records
+        """
+        self._authenticate()
+        done = self.load_checkpoint()
+        if not self._checkpoint_is_current(done):
+            self.reset()
+            done = self.load_checkpoint()
+        summary = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor, \
+                open(self.checkpoint_path, 'a') as checkpoint:
+            for entity, id_field in STAGES:
+                path = find_data_file(self.test_data_path, entity)
+                if path is None:
+                    logger.warning(f"No {entity} data file in {self.test_data_path}")
+                    continue
+                counts = summary[entity] = {"created": 0, "exists": 0, "skipped": 0, "failed": 0}
+                started = time.monotonic()
+                records = iter(read_records(path))
+                while True:
+                    batch = list(islice(records, self.batch_size))
+                    if not batch:
+                        break
+                    pending = [record for record in batch if str(record[id_field]) not in done[entity]]
+                    counts["skipped"] += len(batch) - len(pending)
+                    results = executor.map(lambda record: self._create(entity, record), pending)
+                    for record, result in zip(pending, results):
+                        counts[result] += 1
+                        if result != "failed":
+                            checkpoint.write(json.dumps({"entity": entity, "id": str(record[id_field])}) + "\n")
+                    checkpoint.flush()
+                    os.fsync(checkpoint.fileno())
+                elapsed = time.monotonic() - started
+                logger.info(f"{entity}: {counts} in {elapsed:.1f}s")
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Provision generated test data through the admin API')
+    parser.add_argument('--test-data', help='Directory with generated data files (default: test_data)')
+    parser.add_argument('--api-base-url', help='API base URL (default: from config)')
+    parser.add_argument('--workers', type=int, default=16, help='Concurrent requests (default: 16)')
+    parser.add_argument('--batch-size', type=int, default=200, help='Records per checkpointed batch (default: 200)')
+    parser.add_argument('--reset', action='store_true', help='Ignore the checkpoint and send every record again')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    provisioner = DataProvisioner(args.test_data, args.api_base_url, args.workers, args.batch_size)
+    if args.reset:
+        provisioner.reset()
+    summary = provisioner.run()
+    failed = sum(counts["failed"] for counts in summary.values())
+    print(f"Provisioned {summary} ({failed} failed; rerun to retry them)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Indexed SQLite store built from DataGenerator output.
+
+Step definitions look up users, accounts, transactions and balances with indexed
+queries against a read-only, memory-mapped database instead of parsing the
+generated test_data files:
+
+    python utils/data_store.py            # build test_data/test_data.db
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import logging
+import argparse
+from decimal import Decimal
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.data_writers import find_data_file, read_records
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEST_DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'test_data')
+DB_FILENAME = "test_data.db"
+
+# Bytes of the database file mapped into memory by each connection
+MMAP_SIZE = 256 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE users (
+    username TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE accounts (
+    account_id TEXT PRIMARY KEY,
+    user_id TEXT,
+    account_type TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX accounts_by_user ON accounts (user_id);
+CREATE TABLE transactions (
+    transaction_id TEXT,
+    account_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    is_debit INTEGER NOT NULL,
+    description TEXT,
+    category TEXT,
+    balance_after TEXT,
+    status TEXT
+);
+CREATE INDEX transactions_by_account_date ON transactions (account_id, date);
+CREATE TABLE payees (
+    payee_id TEXT PRIMARY KEY,
+    name TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE balance_snapshots (
+    account_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    balance TEXT NOT NULL,
+    PRIMARY KEY (account_id, date)
+) WITHOUT ROWID;
+"""
+
+TRANSACTION_COLUMNS = (
+    "transaction_id", "account_id", "date", "amount", "is_debit", "description", "category", "balance_after", "status"
+)
+
+
+def _json_default(obj):
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError
+
+
+def _batches(records, size=10000):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def build_store(test_data_path=None, db_path=None):
+    """
+    Build the SQLite store from the generated test data files (any output format)
+
+    :param test_data_path: Directory with the generator output (test_data if None)
+    :param db_path: Database path (test_data/test_data.db if None)
+    :return: Database path
+    """
+    test_data_path = test_data_path or DEFAULT_TEST_DATA_PATH
+    db_path = db_path or os.path.join(test_data_path, DB_FILENAME)
+
+    # Build into a temporary file and swap it in, so readers never see a partial store
+    temp_path = f"{db_path}.{os.getpid()}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    connection = sqlite3.connect(temp_path)
+    try:
+        connection.executescript("PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF;" + SCHEMA)
+
+        def load(name):
+            path = find_data_file(test_data_path, name)
+            return read_records(path) if path else iter(())
+
+        for batch in _batches(load("users")):
+            connection.executemany("INSERT OR REPLACE INTO users VALUES (?, ?)", [
+                (user["username"], json.dumps(user, default=_json_default)) for user in batch
+            ])
+        for batch in _batches(load("accounts")):
+            connection.executemany("INSERT OR REPLACE INTO accounts VALUES (?, ?, ?, ?)", [
+                (account["account_id"], account.get("user_id"), account.get("account_type"),
+                 json.dumps(account, default=_json_default)) for account in batch
+            ])
+        for batch in _batches(load("transactions")):
+            connection.executemany(f"INSERT INTO transactions VALUES ({', '.join('?' * len(TRANSACTION_COLUMNS))})", [
+                tuple(
+                    str(transaction.get(column)) if column in ("amount", "balance_after")
+                    and transaction.get(column) is not None else transaction.get(column)
+                    for column in TRANSACTION_COLUMNS
+                ) for transaction in batch
+            ])
+        for batch in _batches(load("payees")):
+            connection.executemany("INSERT OR REPLACE INTO payees VALUES (?, ?, ?)", [
+                (payee["payee_id"], payee.get("name"), json.dumps(payee, default=_json_default)) for payee in batch
+            ])
+        for batch in _batches(load("balance_snapshots")):
+            connection.executemany("INSERT OR REPLACE INTO balance_snapshots VALUES (?, ?, ?)", [
+                (snapshot["account_id"], snapshot["date"], str(snapshot["balance"])) for snapshot in batch
+            ])
+        connection.commit()
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+
+    os.replace(temp_path, db_path)
+    logger.info(f"Built test data store {db_path}")
+    return db_path
+
+
+class TestDataStore:
+    """
+    Read-only access to the test data store.
+
+    Connections are opened read-only with the database memory-mapped, so every
+    behave process shares the OS page cache instead of loading its own copy.
+    """
+
+    def __init__(self, db_path):
+        """
+        Open the store
+
+        :param db_path: Path to a database written by build_store
+        """
+        self.db_path = db_path
+        self.connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        self.connection.execute("PRAGMA query_only=ON")
+
+    @classmethod
+    def open(cls, test_data_path=None, db_path=None):
+        """
+        Open the store, building or rebuilding it when the generated files are newer
+
+        :param test_data_path: Directory with the generator output (test_data if None)
+        :param db_path: Database path (test_data/test_data.db if None)
+        :return: TestDataStore, or None when there is no generated test data
+        """
+        test_data_path = test_data_path or DEFAULT_TEST_DATA_PATH
+        db_path = db_path or os.path.join(test_data_path, DB_FILENAME)
+
+        sources = [find_data_file(test_data_path, name) for name in ("users", "accounts", "transactions", "payees",
+                                                                    "balance_snapshots")]
+        sources = [path for path in sources if path]
+        if not sources and not os.path.exists(db_path):
+            return None
+
+        if sources and (not os.path.exists(db_path)
+                        or max(os.path.getmtime(path) for path in sources) > os.path.getmtime(db_path)):
+            build_store(test_data_path, db_path)
+        return cls(db_path)
+
+    def close(self):
+        self.connection.close()
+
+    @staticmethod
+    def _record(row):
+        return json.loads(row["data"]) if row else None
+
+    @staticmethod
+    def _transaction(row):
+        transaction = dict(row)
+        transaction["amount"] = Decimal(transaction["amount"])
+        transaction["is_debit"] = bool(transaction["is_debit"])
+        if transaction["balance_after"] is not None:
+            transaction["balance_after"] = Decimal(transaction["balance_after"])
+        return transaction
+
+    def get_user(self, username):
+        """
+        Get a user by username
+
+        :param username: Username
+        :return: User dictionary, or None
+        """
+        row = self.connection.execute("SELECT data FROM users WHERE username = ?", (username,)).fetchone()
+        return self._record(row)
+
+    def get_account(self, account_id):
+        """
+        Get an account by ID
+
+        :param account_id: Account ID
+        :return: Account dictionary, or None
+        """
+        row = self.connection.execute("SELECT data FROM accounts WHERE account_id = ?", (account_id,)).fetchone()
+        return self._record(row)
+
+    def get_user_accounts(self, username, account_type=None):
+        """
+        Get a user's accounts
+
+        :param username: Username
+        :param account_type: Only return accounts of this type (checking, savings, ...)
+        :return: List of account dictionaries
+        """
+        query = "SELECT data FROM accounts WHERE user_id = ?"
+        params = [username]
+        if account_type:
+            query += " AND account_type = ?"
+            params.append(account_type)
+        return [self._record(row) for row in self.connection.execute(query + " ORDER BY account_id", params)]
+
+    def get_transactions(self, account_id, start_date=None, end_date=None, limit=None):
+        """
+        Get an account's transactions, oldest first
+
+        :param account_id: Account ID
+        :param start_date: First date to include (YYYY-MM-DD)
+        :param end_date: Last date to include (YYYY-MM-DD)
+        :param limit: Maximum number of transactions
+        :return: List of transaction dictionaries
+        """
+        query = "SELECT * FROM transactions WHERE account_id = ? AND date >= ? AND date <= ? ORDER BY date, rowid"
+        params = [account_id, start_date or "0000-00-00", end_date or "9999-99-99"]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [self._transaction(row) for row in self.connection.execute(query, params)]
+
+    def count_transactions(self, account_id, start_date=None, end_date=None):
+        """
+        Count an account's transactions in a date range
+
+        :return: Number of transactions
+        """
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM transactions WHERE account_id = ? AND date >= ? AND date <= ?",
+            (account_id, start_date or "0000-00-00", end_date or "9999-99-99")
+        ).fetchone()[0]
+
+    def get_balance_at(self, account_id, on_date):
+        """
+        Get an account's end-of-day balance from the daily snapshots
+
+        :param account_id: Account ID
+        :param on_date: Date (YYYY-MM-DD)
+        :return: Decimal balance, or the account's opening balance before the first snapshot (None if unknown)
+        """
+        row = self.connection.execute(
+            "SELECT balance FROM balance_snapshots WHERE account_id = ? AND date <= ? ORDER BY date DESC LIMIT 1",
+            (account_id, on_date)
+        ).fetchone()
+        if row:
+            return Decimal(row["balance"])
+        return self.get_opening_balance(account_id)
+
+    def get_opening_balance(self, account_id):
+        """
+        Get an account's balance before its first transaction
+
+        The account record holds the closing balance, so the opening balance is backed out
+        of the first ledger entry. Without ledger data it is the account balance.
+
+        :param account_id: Account ID
+        :return: Decimal balance, or None for an unknown account
+        """
+        row = self.connection.execute(
+            "SELECT amount, is_debit, balance_after FROM transactions WHERE account_id = ? ORDER BY date, rowid LIMIT 1",
+            (account_id,)
+        ).fetchone()
+        if row and row["balance_after"] is not None:
+            amount = Decimal(row["amount"])
+            return Decimal(row["balance_after"]) + (amount if row["is_debit"] else -amount)
+        account = self.get_account(account_id)
+        return Decimal(str(account["balance"])) if account else None
+
+    def get_payees(self):
+        """
+        Get all payees
+
+        :return: List of payee dictionaries
+        """
+        return [self._record(row) for row in self.connection.execute("SELECT data FROM payees ORDER BY name")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the indexed test data store from generated test data')
+    parser.add_argument('--test-data', help='Directory with the generator output (default: test_data)')
+    parser.add_argument('--db', help='Database path (default: <test data>/test_data.db)')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    print(f"Test data store written to {build_store(args.test_data, args.db)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+import io
+import os
+import gzip
+import json
+from decimal import Decimal
+
+import pandas as pd
+
+# File extension for each output format
+EXTENSIONS = {
+    "json": ".json",
+    "jsonl": ".jsonl.gz",
+    "parquet": ".parquet",
+}
+
+
+def _json_default(obj):
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JsonlWriter:
+    """
+    Streaming writer for JSON lines, gzip-compressed when the path ends with .gz.
+
+    Records are written as they arrive, so memory does not grow with the number of records.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the writer
+
+        :param path: Output file path
+        """
+        self.path = path
+        self.count = 0
+        if path.endswith('.gz'):
+            # Fixed header timestamp so identical records give byte-identical files
+            self._file = io.TextIOWrapper(
+                gzip.GzipFile(path, 'wb', compresslevel=3, mtime=0), encoding='utf-8', newline='\n'
+            )
+        else:
+            self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, record):
+        """
+        Write one record
+
+        :param record: Dictionary to write
+        """
+        self._file.write(json.dumps(record, separators=(',', ':'), default=_json_default))
+        self._file.write("\n")
+        self.count += 1
+
+    def write_line(self, line):
+        """
+        Write one already serialized record
+
+        :param line: JSON text of the record, with or without the trailing newline
+        """
+        self._file.write(line if line.endswith("\n") else line + "\n")
+        self.count += 1
+
+    def write_frame(self, frame):
+        """
+        Write every row of a DataFrame as a record
+
+        :param frame: DataFrame to write
+        """
+        if len(frame):
+            self._file.write(frame.to_json(orient="records", lines=True, date_format="iso"))
+        self.count += len(frame)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def parquet_schema(name):
+    """
+    Get the Parquet schema of an entity written by the data generator
+
+    Declared up front because inferring it from each chunk breaks on optional fields
+    (totp_secret) and all-None columns (interest_rate, balance_after). Amounts are
+    exact decimal strings, as in the JSON formats.
+
+    :param name: Entity name (users, accounts, transactions, payees, balance_snapshots)
+    :return: pyarrow Schema, or None for an unknown entity (inferred from the first chunk)
+    """
+    import pyarrow as pa
+
+    address = [("street", pa.string()), ("city", pa.string()), ("state", pa.string()), ("zipcode", pa.string())]
+    fields = {
+        "users": [
+            ("username", pa.string()), ("password", pa.string()), ("email", pa.string()),
+            ("first_name", pa.string()), ("last_name", pa.string()),
+            ("address", pa.struct(address + [("country", pa.string())])),
+            ("phone", pa.string()), ("date_of_birth", pa.string()), ("ssn_last_4", pa.string()),
+            ("has_2fa", pa.bool_()), ("totp_secret", pa.string()),
+        ],
+        "accounts": [
+            ("account_id", pa.string()), ("account_type", pa.string()), ("balance", pa.string()),
+            ("currency", pa.string()), ("open_date", pa.string()), ("status", pa.string()),
+            ("interest_rate", pa.string()), ("user_id", pa.string()),
+        ],
+        "transactions": [
+            ("transaction_id", pa.string()), ("account_id", pa.string()), ("date", pa.string()),
+            ("amount", pa.string()), ("is_debit", pa.bool_()), ("description", pa.string()),
+            ("category", pa.string()), ("balance_after", pa.string()), ("status", pa.string()),
+        ],
+        "payees": [
+            ("payee_id", pa.string()), ("name", pa.string()), ("nickname", pa.string()),
+            ("account_number", pa.int64()), ("routing_number", pa.int64()), ("address", pa.struct(address)),
+            ("phone", pa.string()), ("category", pa.string()), ("last_payment_date", pa.string()),
+            ("last_payment_amount", pa.string()),
+        ],
+        "balance_snapshots": [
+            ("account_id", pa.string()), ("date", pa.string()), ("balance", pa.string()),
+        ],
+    }
+    return pa.schema(fields[name]) if name in fields else None
+
+
+class ParquetWriter:
+    """
+    Chunked columnar writer: records are buffered and written as one Parquet row group per chunk.
+
+    Requires pyarrow.
+    """
+
+    def __init__(self, path, chunk_size=100000, schema=None):
+        """
+        Initialize the writer
+
+        :param path: Output file path
+        :param chunk_size: Number of records per row group
+        :param schema: pyarrow Schema for every row group (inferred from the first chunk if None)
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow); use the jsonl format instead")
+
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.path = path
+        self.chunk_size = chunk_size
+        self.schema = schema
+        self.count = 0
+        self._buffer = []
+        self._writer = None
+
+    def write(self, record):
+        """
+        Write one record
+
+        :param record: Dictionary to write (Decimal values are stored as strings)
+        """
+        self._buffer.append({
+            key: str(value) if isinstance(value, Decimal) else value for key, value in record.items()
+        })
+        if len(self._buffer) >= self.chunk_size:
+            self._flush()
+
+    def write_frame(self, frame):
+        """
+        Write a DataFrame as one or more row groups
+
+        :param frame: DataFrame to write
+        """
+        self._flush()
+        self._write_table(self._pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False))
+
+    def _flush(self):
+        if self._buffer:
+            self._write_table(self._pa.Table.from_pylist(self._buffer, schema=self.schema))
+            self._buffer = []
+
+    def _write_table(self, table):
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, table.schema, compression='zstd')
+        else:
+            table = table.cast(self._writer.schema)
+        self._writer.write_table(table, row_group_size=self.chunk_size)
+        self.count += table.num_rows
+
+    def close(self):
+        self._flush()
+        if self._writer:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def open_writer(directory, name, output_format, chunk_size=100000):
+    """
+    Open a streaming writer for an entity file
+
+    :param directory: Output directory
+    :param name: Entity name (users, accounts, transactions, payees)
+    :param output_format: 'jsonl' or 'parquet'
+    :param chunk_size: Records per row group for parquet
+    :return: JsonlWriter or ParquetWriter
+    """
+    path = os.path.join(directory, name + EXTENSIONS[output_format])
+    if output_format == "jsonl":
+        return JsonlWriter(path)
+    if output_format == "parquet":
+        return ParquetWriter(path, chunk_size, parquet_schema(name))
+    raise ValueError(f"Unsupported streaming format: {output_format}")
+
+
+def find_data_file(directory, name):
+    """
+    Find the most recently written file for an entity in whichever format it was written
+
+    :param directory: Test data directory
+    :param name: Entity name (users, accounts, transactions, payees)
+    :return: File path, or None if no file exists
+    """
+    paths = [os.path.join(directory, name + extension) for extension in (".jsonl.gz", ".jsonl", ".parquet", ".json")]
+    existing = [path for path in paths if os.path.exists(path)]
+    return max(existing, key=os.path.getmtime) if existing else None
+
+
+def read_records(path):
+    """
+    Iterate over the records of a JSON, JSON lines or Parquet data file
+
+    :param path: File path
+    :return: Iterator of dictionaries
+    """
+    if path.endswith('.parquet'):
+        import pyarrow.parquet
+        for batch in pyarrow.parquet.ParquetFile(path).iter_batches():
+            yield from batch.to_pylist()
+    elif path.endswith('.json'):
+        with open(path, 'r') as f:
+            yield from json.load(f)
+    else:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def read_frame(path):
+    """
+    Load a data file into a DataFrame
+
+    :param path: File path
+    :return: DataFrame
+    """
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    if path.endswith('.json'):
+        return pd.read_json(path, orient="records", dtype=False)
+    return pd.read_json(path, lines=True, dtype=False, compression='infer')
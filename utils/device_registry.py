@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Registry of Appium devices leased exclusively to parallel behave workers.
+
+Devices are listed under "mobile" -> "devices" in config/config.json (or in a JSON file
+passed with -D mobile_devices_file=...):
+
+    {"id": "emulator-5554", "platform": "android", "appium_server_url": "http://localhost:4723",
+     "udid": "emulator-5554", "device_name": "Pixel 6"}
+
+    python utils/device_registry.py --status      # health-check every device and show the pool
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import shutil
+import hashlib
+import argparse
+from urllib.parse import unquote
+
+import requests
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.lease_broker import LeaseBroker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'test_data', 'device_pool')
+
+
+def _load_config():
+    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.json')
+    with open(config_path, 'r') as f:
+        return json.load(f)
+
+
+def check_device_health(device, timeout=5):
+    """
+    Check that a device's Appium server is up and ready for new sessions
+
+    :param device: Device dictionary with appium_server_url
+    :param timeout: Request timeout in seconds
+    :return: Tuple (healthy, reason)
+    """
+    url = f"{device['appium_server_url'].rstrip('/')}/status"
+    try:
+        response = requests.get(url, timeout=timeout)
+    except requests.RequestException as e:
+        return False, f"GET {url} failed: {e}"
+    if response.status_code != 200:
+        return False, f"GET {url} returned {response.status_code}"
+    try:
+        value = response.json().get("value") or {}
+    except ValueError:
+        return False, f"GET {url} did not return JSON"
+    # Appium 2 reports readiness; Appium 1 only returns build information
+    if value.get("ready") is False:
+        return False, value.get("message", "Appium server not ready")
+    return True, "ok"
+
+
+class DeviceRegistry:
+    """
+    Leases configured devices through a LeaseBroker, health-checking each device before
+    handing it out and quarantining devices that fail for quarantine_seconds.
+
+    The pool is created once per device list (its directory is keyed by a hash of the list)
+    and never re-synchronized with the configuration afterwards, so a device in transit
+    between the available and leased directories is never added twice. Quarantined devices
+    are moved out of the pool with a rename that keeps their data, and moved back with
+    another rename once their quarantine (the file's modification time) has expired.
+    """
+
+    def __init__(self, devices, pool_dir=None, quarantine_seconds=600):
+        """
+        Initialize the registry, creating the pool if it does not exist yet
+
+        :param devices: List of device dictionaries (id, platform, appium_server_url, udid, device_name)
+        :param pool_dir: Directory holding the pool (test_data/device_pool/<hash of the device list> if None)
+        :param quarantine_seconds: Seconds a failing device is kept out of the pool
+        """
+        self.devices = {device["id"]: device for device in devices}
+        if pool_dir is None:
+            devices_hash = hashlib.sha1(json.dumps(devices, sort_keys=True).encode()).hexdigest()[:10]
+            pool_dir = os.path.join(DEFAULT_POOL_DIR, devices_hash)
+        self._create_pool(pool_dir)
+        self.broker = LeaseBroker(pool_dir)
+        self.quarantine_dir = os.path.join(self.broker.pool_dir, "quarantine")
+        self.quarantine_seconds = quarantine_seconds
+        os.makedirs(self.quarantine_dir, exist_ok=True)
+
+    def _create_pool(self, pool_dir):
+        """Build the pool in a private directory and rename it into place; the first worker to rename wins"""
+        if os.path.isdir(pool_dir):
+            return
+        temp_dir = f"{pool_dir}.{os.getpid()}.tmp"
+        broker = LeaseBroker(temp_dir)
+        for device_id, device in self.devices.items():
+            broker.add(device_id, device)
+        os.makedirs(os.path.join(temp_dir, "quarantine"), exist_ok=True)
+        try:
+            os.rename(temp_dir, pool_dir)
+            logger.info(f"Created device pool {pool_dir} with {len(self.devices)} devices")
+        except OSError:
+            # Another worker created the pool first
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @classmethod
+    def from_config(cls, devices_file=None, **kwargs):
+        """
+        Create a registry from config.json or a devices file
+
+        :param devices_file: JSON file with a list of devices (config.json mobile.devices if None)
+        :return: DeviceRegistry
+        """
+        if devices_file:
+            with open(devices_file, 'r') as f:
+                devices = json.load(f)
+        else:
+            devices = _load_config().get('mobile', {}).get('devices', [])
+        return cls(devices, **kwargs)
+
+    def _quarantine_path(self, device_id):
+        return os.path.join(self.quarantine_dir, LeaseBroker._filename(device_id))
+
+    def sync(self):
+        """
+        Return devices whose quarantine has expired to the pool
+
+        Several workers may do this at once; the rename succeeds for exactly one of them.
+        """
+        now = time.time()
+        for name in os.listdir(self.quarantine_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.quarantine_dir, name)
+            try:
+                if os.stat(path).st_mtime > now:
+                    continue
+                os.rename(path, os.path.join(self.broker.available_dir, name))
+            except FileNotFoundError:
+                continue  # Another worker released it already
+            logger.info(f"Device {unquote(name[:-len('.json')])} released from quarantine")
+
+    def quarantined(self):
+        """
+        Devices currently out of the pool
+
+        :return: Dictionary of device ID to quarantine entry (device, until)
+        """
+        entries = {}
+        for name in os.listdir(self.quarantine_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.quarantine_dir, name)
+            try:
+                until = os.stat(path).st_mtime
+                with open(path, 'r') as f:
+                    device = json.load(f)
+            except FileNotFoundError:
+                continue  # Released by another worker meanwhile
+            entries[unquote(name[:-len(".json")])] = {"device": device, "until": until}
+        return entries
+
+    def quarantine(self, lease, reason):
+        """
+        Take a leased device out of the pool
+
+        :param lease: Lease from lease()
+        :param reason: Why the device is quarantined
+        """
+        until = time.time() + self.quarantine_seconds
+        # The file's modification time records the end of the quarantine; the rename moves it atomically
+        os.utime(lease.path, (until, until))
+        os.rename(lease.path, self._quarantine_path(lease.resource_id))
+        logger.warning(f"Quarantined device {lease.resource_id} for {self.quarantine_seconds}s: {reason}")
+
+    def lease(self, timeout=300, platform=None):
+        """
+        Lease a healthy device exclusively
+
+        :param timeout: Seconds to wait for a device
+        :param platform: Only lease devices of this platform ('android' or 'ios'), any if None
+        :return: Lease whose data is the device dictionary
+        :raises TimeoutError: If no healthy device becomes available in time
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            self.broker.reclaim_stale()
+            self.sync()
+            # Wait in short slices so quarantines that expire meanwhile are picked up
+            try:
+                lease = self.broker.acquire(min(5, max(0, deadline - time.monotonic())))
+            except TimeoutError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"No device available after {timeout}s")
+                continue
+            if platform and lease.data.get("platform", "").lower() != platform.lower():
+                self.broker.release(lease)
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"No {platform} device available after {timeout}s")
+                time.sleep(0.5)
+                continue
+            healthy, reason = check_device_health(lease.data)
+            if healthy:
+                logger.info(f"Leased device {lease.resource_id} ({lease.data.get('appium_server_url')})")
+                return lease
+            self.quarantine(lease, reason)
+
+    def release(self, lease, healthy=True, reason=None):
+        """
+        Return a device to the pool, or quarantine it
+
+        :param lease: Lease from lease()
+        :param healthy: False to quarantine the device (e.g. its session kept crashing)
+        :param reason: Quarantine reason
+        """
+        if healthy:
+            healthy, reason = check_device_health(lease.data)
+        if healthy:
+            self.broker.release(lease)
+            logger.info(f"Returned device {lease.resource_id}")
+        else:
+            self.quarantine(lease, reason or "Reported unhealthy")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect the mobile device pool')
+    parser.add_argument('--status', action='store_true', help='Health-check every configured device')
+    parser.add_argument('--devices-file', help='JSON file with the device list (default: config.json)')
+    parser.add_argument('--pool-dir', help='Pool directory (default: test_data/device_pool/<hash of the device list>)')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    registry = DeviceRegistry.from_config(args.devices_file, pool_dir=args.pool_dir)
+    if args.status:
+        for device_id, device in registry.devices.items():
+            healthy, reason = check_device_health(device)
+            print(f"{device_id}: {'healthy' if healthy else 'unhealthy'} ({reason})")
+    print(f"{registry.broker.available()} of {len(registry.devices)} devices available, "
+          f"{len(registry.quarantined())} quarantined")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+import csv
+import functools
+import importlib
+import inspect
+import itertools
+import logging
+import os
+import pkgutil
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Modules whose methods commands are attributed to
+PAGE_OBJECT_PACKAGES = ('page_objects.', 'mobile_page_objects.')
+
+
+class CommandListener:
+    """
+    Base class for listeners notified about every WebDriver command.
+
+    Element commands (click, text, send_keys, ...) go through the parent
+    driver's execute(), so they are reported as well.
+    """
+
+    def before_command(self, command, params):
+        pass
+
+    def after_command(self, command, params, elapsed, error=None):
+        pass
+
+
+def instrument_driver(driver, *listeners):
+    """
+    Wrap driver.execute so every command is reported to the given listeners
+
+    Calling it again on an instrumented driver only adds the new listeners.
+    Drivers that are never instrumented have no overhead at all.
+
+    :param driver: Selenium or Appium WebDriver instance
+    :param listeners: CommandListener instances
+    :return: The same driver
+    """
+    registered = getattr(driver, '_command_listeners', None)
+    if registered is not None:
+        registered.extend(listener for listener in listeners if listener not in registered)
+        return driver
+
+    registered = list(listeners)
+    original_execute = driver.execute
+
+    def execute(driver_command, params=None):
+        for listener in registered:
+            listener.before_command(driver_command, params)
+
+        start = time.perf_counter()
+        try:
+            response = original_execute(driver_command, params)
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            for listener in registered:
+                listener.after_command(driver_command, params, elapsed, e)
+            raise
+
+        elapsed = time.perf_counter() - start
+        for listener in registered:
+            listener.after_command(driver_command, params, elapsed)
+        return response
+
+    driver.execute = execute
+    driver._command_listeners = registered
+    return driver
+
+
+def instrument_context_driver(context, driver):
+    """
+    Attach the profilers enabled for this run (if any) to a newly created driver
+
+    :param context: Behave context
+    :param driver: Selenium or Appium WebDriver instance
+    :return: The same driver
+    """
+    listeners = [
+        listener for listener in (getattr(context, 'step_profiler', None), getattr(context, 'command_profiler', None))
+        if listener is not None
+    ]
+    if listeners:
+        instrument_driver(driver, *listeners)
+    return driver
+
+
+# Page object invocations running on each thread, outermost first, as (method name, invocation ID)
+_invocations = threading.local()
+_invocation_ids = itertools.count(1)
+
+
+def _active_invocations():
+    stack = getattr(_invocations, 'stack', None)
+    if stack is None:
+        stack = _invocations.stack = []
+    return stack
+
+
+def _track_invocations(name, function):
+    """Wrap a page object method so every call is on the invocation stack while it runs"""
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        stack = _active_invocations()
+        stack.append((name, next(_invocation_ids)))
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stack.pop()
+
+    wrapper._tracks_invocations = True
+    return wrapper
+
+
+def instrument_page_objects():
+    """
+    Import every page object module and wrap the methods of its classes so each call
+    gets its own invocation ID
+
+    Calling it again only wraps classes that are not instrumented yet.
+
+    :return: Number of methods wrapped
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    wrapped = 0
+    for package in PAGE_OBJECT_PACKAGES:
+        package = package.rstrip('.')
+        for module_info in pkgutil.iter_modules([os.path.join(root, package)]):
+            try:
+                module = importlib.import_module(f"{package}.{module_info.name}")
+            except ImportError as e:
+                logger.warning(f"Could not instrument {package}.{module_info.name}: {e}")
+                continue
+            for cls in vars(module).values():
+                if not isinstance(cls, type) or cls.__module__ != module.__name__:
+                    continue
+                for attr, function in list(vars(cls).items()):
+                    if not inspect.isfunction(function) or getattr(function, '_tracks_invocations', False):
+                        continue
+                    if attr.startswith('__') and attr != '__init__':
+                        continue
+                    setattr(cls, attr, _track_invocations(f"{cls.__name__}.{attr}", function))
+                    wrapped += 1
+    return wrapped
+
+
+class CommandProfiler(CommandListener):
+    """
+    Counts WebDriver commands and their latency per page object method.
+
+    Counts are inclusive: a command issued by LoginPage.enter_username while
+    LoginPage.login is running is attributed to both methods. A method's calls
+    are its invocations that issued at least one command; page object methods are
+    wrapped (instrument_page_objects) so every invocation, including each
+    iteration of a loop, is told apart.
+    """
+
+    def __init__(self, output_dir=None):
+        """
+        Initialize the command profiler
+
+        :param output_dir: Directory for the profile file (defaults to reports/profiles)
+        """
+        self.output_dir = output_dir or os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), 'reports', 'profiles'
+        )
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        self.profile_path = os.path.join(self.output_dir, f"command_profile_{run_id}.csv")
+
+        self._methods = defaultdict(lambda: {
+            'calls': 0, 'commands': 0, 'errors': 0, 'time': 0.0, 'by_command': defaultdict(int)
+        })
+        # ID of the invocation last seen per method, used to count calls
+        self._last_invocations = {}
+        instrument_page_objects()
+
+    def after_command(self, command, params, elapsed, error=None):
+        invocations = list(_active_invocations())
+        if not invocations:
+            invocations = [('<step code>', None)]
+
+        seen = set()
+        for method, invocation in invocations:
+            if method in seen:
+                continue
+            seen.add(method)
+
+            stats = self._methods[method]
+            if invocation is None or self._last_invocations.get(method) != invocation:
+                stats['calls'] += 1
+                self._last_invocations[method] = invocation
+            stats['commands'] += 1
+            stats['time'] += elapsed
+            stats['by_command'][command] += 1
+            if error is not None:
+                stats['errors'] += 1
+
+    def get_profile(self):
+        """
+        Get the per-method profile, ordered by total command time
+
+        :return: List of dictionaries
+        """
+        profile = []
+        for method, stats in self._methods.items():
+            top_commands = sorted(stats['by_command'].items(), key=lambda item: item[1], reverse=True)[:5]
+            profile.append({
+                "method": method,
+                "calls": stats['calls'],
+                "commands": stats['commands'],
+                "commands_per_call": round(stats['commands'] / stats['calls'], 1) if stats['calls'] else 0,
+                "errors": stats['errors'],
+                "total_ms": round(stats['time'] * 1000, 1),
+                "ms_per_call": round(stats['time'] * 1000 / stats['calls'], 1) if stats['calls'] else 0,
+                "top_commands": " ".join(f"{name}={count}" for name, count in top_commands)
+            })
+        return sorted(profile, key=lambda row: row['total_ms'], reverse=True)
+
+    def finish(self):
+        """
+        Write the per-run profile
+
+        :return: Path to the profile file
+        """
+        self._last_invocations.clear()
+        profile = self.get_profile()
+
+        with open(self.profile_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=[
+                'method', 'calls', 'commands', 'commands_per_call', 'errors', 'total_ms', 'ms_per_call', 'top_commands'
+            ])
+            writer.writeheader()
+            writer.writerows(profile)
+
+        logger.info(f"WebDriver command profile saved to {self.profile_path}")
+        for row in profile[:10]:
+            logger.info(
+                f"{row['method']}: {row['calls']} calls, {row['commands_per_call']} round trips/call, "
+                f"{row['ms_per_call']} ms/call"
+            )
+        return self.profile_path
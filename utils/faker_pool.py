@@ -0,0 +1,111 @@
+import os
+import json
+import logging
+
+import faker
+import numpy as np
+from faker import Faker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'test_data', 'faker_pools')
+POOL_SIZE = 2000
+POOL_SEED = 0
+
+# Faker providers sampled into the pool, with the arguments DataGenerator calls them with
+FIELDS = {
+    "first_name": {},
+    "last_name": {},
+    "email": {},
+    "password": {"length": 12, "special_chars": True, "digits": True, "upper_case": True, "lower_case": True},
+    "street_address": {},
+    "city": {},
+    "state": {},
+    "zipcode": {},
+    "phone_number": {},
+    "company": {},
+}
+
+
+class FakerPool:
+    """
+    Pre-sampled Faker values served by index.
+
+    Faker's providers cost 50-150 microseconds per call; the pool samples POOL_SIZE values of
+    each field once per locale (from a fixed seed, so the pool is identical everywhere), keeps
+    them as arrays on disk and in memory, and serves a value by drawing an index from the
+    caller's seeded RNG.
+    """
+
+    def __init__(self, locale="en_US", size=POOL_SIZE, pool_dir=None):
+        """
+        Initialize the pool, loading it from disk or sampling it
+
+        :param locale: Faker locale
+        :param size: Values per field
+        :param pool_dir: Directory caching sampled pools (test_data/faker_pools if None)
+        """
+        self.locale = locale
+        self.size = size
+        self.path = os.path.join(pool_dir or DEFAULT_POOL_DIR, f"{locale}-{size}-faker{faker.VERSION}.json")
+        values = self._load() or self._sample()
+        self.values = {field: np.array(values[field], dtype=object) for field in FIELDS}
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                values = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if all(len(values.get(field, ())) == self.size for field in FIELDS):
+            return values
+        return None
+
+    def _sample(self):
+        logger.info(f"Sampling {self.size} Faker values per field for locale {self.locale}")
+        fake = Faker(self.locale)
+        fake.seed_instance(POOL_SEED)
+        values = {field: [getattr(fake, field)(**kwargs) for _ in range(self.size)] for field, kwargs in FIELDS.items()}
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(values, f)
+        os.replace(temp_path, self.path)
+        return values
+
+    def draw(self, field, rng):
+        """
+        Draw one value
+
+        :param field: Field name from FIELDS, e.g. 'first_name'
+        :param rng: random.Random instance choosing the index
+        :return: Value string
+        """
+        return self.values[field][rng.randrange(self.size)]
+
+    def sample(self, field, count, rng):
+        """
+        Draw many values at once
+
+        :param field: Field name from FIELDS
+        :param count: Number of values
+        :param rng: numpy Generator choosing the indices
+        :return: NumPy object array
+        """
+        return self.values[field][rng.integers(0, self.size, count)]
+
+
+_pools = {}
+
+
+def get_faker_pool(locale="en_US"):
+    """
+    Get the shared pool for a locale
+
+    :param locale: Faker locale
+    :return: FakerPool
+    """
+    if locale not in _pools:
+        _pools[locale] = FakerPool(locale)
+    return _pools[locale]
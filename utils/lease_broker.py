@@ -0,0 +1,177 @@
+import os
+import json
+import time
+import errno
+import random
+import logging
+from urllib.parse import quote, unquote
+
+logger = logging.getLogger(__name__)
+
+
+class Lease:
+    """
+    An exclusively held pool resource
+    """
+
+    def __init__(self, resource_id, data, path):
+        self.resource_id = resource_id
+        self.data = data
+        self.path = path
+
+    def __repr__(self):
+        return f"Lease({self.resource_id!r})"
+
+
+class LeaseBroker:
+    """
+    Lock-free local broker that hands out pool resources exclusively across processes.
+
+    Each resource is a JSON file in <pool_dir>/available. Acquiring renames the file into
+    <pool_dir>/leased/<pid>/; rename is atomic, so exactly one process wins each file and
+    no lock file or server is needed. Leases held by processes that no longer exist are
+    returned by reclaim_stale().
+    """
+
+    def __init__(self, pool_dir):
+        """
+        Initialize the broker
+
+        :param pool_dir: Directory holding the pool
+        """
+        self.pool_dir = pool_dir
+        self.available_dir = os.path.join(pool_dir, "available")
+        self.leased_dir = os.path.join(pool_dir, "leased")
+        os.makedirs(self.available_dir, exist_ok=True)
+        os.makedirs(self.leased_dir, exist_ok=True)
+
+    @staticmethod
+    def _filename(resource_id):
+        return quote(str(resource_id), safe='') + ".json"
+
+    def add(self, resource_id, data):
+        """
+        Add a resource to the pool
+
+        :param resource_id: Unique resource ID
+        :param data: JSON-serializable resource data
+        """
+        filename = self._filename(resource_id)
+        temp_path = os.path.join(self.pool_dir, f".{filename}.{os.getpid()}.tmp")
+        with open(temp_path, 'w') as f:
+            json.dump(data, f, default=str)
+        os.replace(temp_path, os.path.join(self.available_dir, filename))
+
+    def available(self):
+        """Number of resources that can be leased"""
+        return len([name for name in os.listdir(self.available_dir) if name.endswith(".json")])
+
+    def resource_ids(self):
+        """
+        IDs of every resource in the pool, available or leased
+
+        :return: Set of resource IDs
+        """
+        names = os.listdir(self.available_dir)
+        for owner in os.listdir(self.leased_dir):
+            owner_dir = os.path.join(self.leased_dir, owner)
+            if os.path.isdir(owner_dir):
+                names.extend(os.listdir(owner_dir))
+        return {unquote(name[:-len(".json")]) for name in names if name.endswith(".json")}
+
+    def discard(self, resource_id):
+        """
+        Remove an available resource from the pool
+
+        :param resource_id: Resource ID
+        :return: True if the resource was available and has been removed
+        """
+        try:
+            os.remove(os.path.join(self.available_dir, self._filename(resource_id)))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def acquire(self, timeout=60, poll_interval=0.05):
+        """
+        Lease a resource exclusively
+
+        :param timeout: Seconds to wait for a resource to become available
+        :param poll_interval: Seconds between scans of the pool while it is empty
+        :return: Lease
+        :raises TimeoutError: If no resource becomes available in time
+        """
+        owner_dir = os.path.join(self.leased_dir, str(os.getpid()))
+        os.makedirs(owner_dir, exist_ok=True)
+        deadline = time.monotonic() + timeout
+
+        while True:
+            candidates = [name for name in os.listdir(self.available_dir) if name.endswith(".json")]
+            # Start at a random point so concurrent workers rarely race for the same file
+            random.shuffle(candidates)
+            for name in candidates:
+                leased_path = os.path.join(owner_dir, name)
+                try:
+                    os.rename(os.path.join(self.available_dir, name), leased_path)
+                except FileNotFoundError:
+                    continue
+                with open(leased_path, 'r') as f:
+                    data = json.load(f)
+                return Lease(unquote(name[:-len(".json")]), data, leased_path)
+
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"No resource available in {self.pool_dir} after {timeout}s")
+            time.sleep(poll_interval)
+
+    def release(self, lease, data=None):
+        """
+        Return a leased resource to the pool
+
+        :param lease: Lease from acquire
+        :param data: Updated resource data to store (keeps the leased data if None)
+        """
+        if data is not None:
+            with open(lease.path, 'w') as f:
+                json.dump(data, f, default=str)
+        os.rename(lease.path, os.path.join(self.available_dir, os.path.basename(lease.path)))
+
+    def retire(self, lease):
+        """
+        Remove a leased resource from the pool permanently
+
+        :param lease: Lease from acquire
+        """
+        os.remove(lease.path)
+
+    def reclaim_stale(self):
+        """
+        Return resources leased by processes that are no longer running
+
+        :return: Number of resources reclaimed
+        """
+        reclaimed = 0
+        for owner in os.listdir(self.leased_dir):
+            if not owner.isdigit() or _pid_alive(int(owner)):
+                continue
+            owner_dir = os.path.join(self.leased_dir, owner)
+            for name in os.listdir(owner_dir):
+                try:
+                    os.rename(os.path.join(owner_dir, name), os.path.join(self.available_dir, name))
+                    reclaimed += 1
+                except FileNotFoundError:
+                    pass
+            try:
+                os.rmdir(owner_dir)
+            except OSError:
+                pass
+        if reclaimed:
+            logger.info(f"Reclaimed {reclaimed} stale leases in {self.pool_dir}")
+        return reclaimed
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno == errno.EPERM
+    return True
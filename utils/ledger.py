@@ -0,0 +1,122 @@
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+
+def to_cents(amounts):
+    """
+    Convert amounts to exact integer cents
+
+    :param amounts: Iterable of Decimal, string or integer-cent values
+    :return: int64 NumPy array
+    """
+    return np.array([int(Decimal(str(amount)) * 100) for amount in amounts], dtype=np.int64)
+
+
+def format_cents(cents):
+    """
+    Format integer cents as decimal amount strings ("-12.05")
+
+    :param cents: Series of integer cents
+    :return: Series of strings
+    """
+    magnitude = cents.abs()
+    sign = np.where(cents < 0, "-", "")
+    return sign + (magnitude // 100).astype(str) + "." + (magnitude % 100).astype(str).str.zfill(2)
+
+
+def _opening_cents(opening_balances):
+    return {account_id: int(Decimal(str(balance)) * 100) for account_id, balance in opening_balances.items()}
+
+
+def apply_running_balance(transactions, opening_balances):
+    """
+    Sort transactions by account and date and compute the balance after each one
+
+    :param transactions: DataFrame with account_id, date, is_debit and amount_cents columns
+    :param opening_balances: Dictionary of account ID to balance before the first transaction
+    :return: Sorted DataFrame with an added balance_after_cents column
+    """
+    ledger = transactions.sort_values(["account_id", "date", "transaction_id"], kind="stable").reset_index(drop=True)
+    signed = np.where(ledger["is_debit"].to_numpy(), -ledger["amount_cents"].to_numpy(), ledger["amount_cents"].to_numpy())
+    opening = ledger["account_id"].map(_opening_cents(opening_balances)).to_numpy(dtype=np.int64)
+    ledger["balance_after_cents"] = opening + pd.Series(signed).groupby(ledger["account_id"]).cumsum().to_numpy()
+    return ledger
+
+
+def daily_snapshots(ledger, opening_balances, end_date=None):
+    """
+    Build end-of-day balances for every day from each account's first transaction to end_date
+
+    :param ledger: DataFrame returned by apply_running_balance
+    :param opening_balances: Dictionary of account ID to balance before the first transaction
+    :param end_date: Last snapshot date (the latest transaction date if None)
+    :return: DataFrame with account_id, date and balance_cents columns
+    """
+    end_of_day = ledger.groupby(["account_id", "date"], sort=True)["balance_after_cents"].last()
+    end_date = pd.Timestamp(end_date) if end_date is not None else ledger["date"].max()
+    opening = _opening_cents(opening_balances)
+
+    frames = []
+    for account_id, balances in end_of_day.groupby(level="account_id"):
+        balances = balances.droplevel("account_id")
+        days = pd.date_range(balances.index.min(), max(end_date, balances.index.max()), freq="D")
+        filled = balances.reindex(days).ffill().fillna(opening.get(account_id, 0)).astype(np.int64)
+        frames.append(pd.DataFrame({"account_id": account_id, "date": days, "balance_cents": filled.to_numpy()}))
+
+    if not frames:
+        return pd.DataFrame({"account_id": [], "date": [], "balance_cents": []})
+    return pd.concat(frames, ignore_index=True)
+
+
+class BalanceLookup:
+    """
+    Constant-time account balance at any date, backed by daily snapshots.
+
+    Dates before the first snapshot return the opening balance; dates after the
+    last snapshot return the latest balance.
+    """
+
+    def __init__(self, snapshots, opening_balances=None):
+        """
+        Initialize the lookup
+
+        :param snapshots: DataFrame from daily_snapshots (or loaded records with date strings and balance strings)
+        :param opening_balances: Dictionary of account ID to balance before the first transaction
+        """
+        self._opening = _opening_cents(opening_balances or {})
+        self._accounts = {}
+
+        if "balance_cents" not in snapshots:
+            snapshots = snapshots.assign(balance_cents=to_cents(snapshots["balance"]))
+        dates = pd.to_datetime(snapshots["date"]).dt.date
+        for account_id, rows in snapshots.assign(date=dates).sort_values("date").groupby("account_id"):
+            self._accounts[account_id] = (rows["date"].iloc[0], rows["balance_cents"].to_numpy(dtype=np.int64))
+
+    def balance_at(self, account_id, on_date):
+        """
+        Get the end-of-day balance of an account
+
+        :param account_id: Account ID
+        :param on_date: date, datetime or "YYYY-MM-DD" string
+        :return: Decimal balance
+        """
+        if isinstance(on_date, str):
+            on_date = datetime.strptime(on_date, "%Y-%m-%d").date()
+        elif isinstance(on_date, datetime):
+            on_date = on_date.date()
+
+        if account_id not in self._accounts:
+            if account_id in self._opening:
+                return Decimal(self._opening[account_id]).scaleb(-2)
+            raise KeyError(f"No balance history for account {account_id}")
+
+        start, balances = self._accounts[account_id]
+        offset = (on_date - start).days
+        if offset < 0:
+            cents = self._opening.get(account_id, 0)
+        else:
+            cents = balances[min(offset, len(balances) - 1)]
+        return Decimal(int(cents)).scaleb(-2)
@@ -0,0 +1,255 @@
+from html import escape
+
+TITLE = "MyBank - Banking Application"
+
+# Amount above which external transfers need additional verification
+VERIFICATION_THRESHOLD = 3000
+
+
+def _money(amount):
+    return f"${amount:,.2f}"
+
+
+def _document(body, script=""):
+    return (
+        "<!DOCTYPE html><html><head>"
+        f"<meta charset='utf-8'><title>{TITLE}</title>"
+        "</head><body>"
+        f"{body}"
+        f"{'<script>' + script + '</script>' if script else ''}"
+        "</body></html>"
+    )
+
+
+def _options(names, selected=None):
+    return "".join(
+        f"<option{' selected' if name == selected else ''}>{escape(name)}</option>" for name in names
+    )
+
+
+def login_page(error=None, locked=False, two_factor=False, username=""):
+    """
+    Render the login page
+
+    :param error: Error message to display
+    :param locked: Whether to show the account locked message
+    :param two_factor: Whether to show the 2FA code prompt instead of the credentials form
+    :param username: Username carried over to the 2FA form
+    """
+    if two_factor:
+        form = f"""
+        <form method="post" action="/login/2fa">
+            <input type="hidden" name="username" value="{escape(username)}">
+            <label for="security-code">Security code</label>
+            <input id="security-code" name="code" type="text" autocomplete="one-time-code">
+            <button id="verify-code-btn" type="submit">Verify</button>
+            <button id="resend-code-btn" type="button">Resend Code</button>
+            <a id="2fa-help-link" href="#">Need help?</a>
+        </form>
+        """
+    else:
+        form = """
+        <form method="post" action="/login">
+            <input id="login-username" name="username" type="text">
+            <input id="login-password" name="password" type="password">
+            <label><input id="remember-me" name="remember_me" type="checkbox"> Remember me</label>
+            <button id="btn-login" type="submit">Log In</button>
+        </form>
+        <a href="#">Forgot Password</a>
+        <a href="#">Forgot Username</a>
+        <a href="/register">Register</a>
+        """
+
+    messages = ""
+    if error:
+        messages += f'<div class="login-error-message">{escape(error)}</div>'
+    if locked:
+        messages += '<div id="account-locked-message">Your account has been locked for security reasons</div>'
+
+    return _document(f"<h1>Sign in to MyBank</h1>{messages}{form}")
+
+
+def dashboard_page(checking_balance, savings_balance, payees):
+    return _document(f"""
+        <h1 id="dashboard-header">Dashboard</h1>
+        <section id="account-summary">
+            <div>Checking <span id="checking-balance">{_money(checking_balance)}</span></div>
+            <div>Savings <span id="savings-balance">{_money(savings_balance)}</span></div>
+        </section>
+        <nav>
+            <a id="transaction-history-link" href="/transactions">Transaction History</a>
+            <a id="transfer-funds-link" href="/transfer">Transfer Funds</a>
+            <a id="bill-pay-link" href="/bill-pay">Pay Bills</a>
+            <a id="external-transfer-link" href="/external-transfer">External Transfer</a>
+            <a href="/profile">Profile</a>
+        </nav>
+        <ul id="registered-payees">{''.join(f'<li>{escape(payee["name"])}</li>' for payee in payees)}</ul>
+    """)
+
+
+def transactions_page(transactions):
+    rows = "".join(
+        '<li class="transaction-item">'
+        f'<span class="transaction-date">{escape(transaction["display_date"])}</span>'
+        f'<span class="transaction-description">{escape(transaction["description"])}</span>'
+        f'<span class="transaction-amount">{"-" if transaction["is_debit"] else ""}{_money(transaction["amount"])}</span>'
+        '</li>'
+        for transaction in transactions
+    )
+    return _document(f"""
+        <h1 id="transaction-history-header">Transaction History</h1>
+        <form method="get" action="/transactions">
+            <select id="filter-transactions" name="type">
+                <option value="all">All</option>
+                <option value="deposits">Deposits</option>
+                <option value="withdrawals">Withdrawals</option>
+                <option value="transfers">Transfers</option>
+            </select>
+            <input id="date-range-start" name="from" type="text">
+            <input id="date-range-end" name="to" type="text">
+            <button id="apply-filter" type="submit">Apply</button>
+        </form>
+        <button id="download-csv" type="button">Download CSV</button>
+        <ul id="transaction-list">{rows}</ul>
+        <button id="pagination-prev" class="disabled" type="button">Previous</button>
+        <button id="pagination-next" class="disabled" type="button">Next</button>
+    """)
+
+
+def transfer_page(account_names, reference=None, error=None):
+    result = ""
+    if reference:
+        result = (
+            '<div class="success-message">Transfer completed successfully</div>'
+            f'<div>Reference: <span id="confirmation-reference">{escape(reference)}</span></div>'
+        )
+    if error:
+        result = f'<div class="error-message">{escape(error)}</div>'
+
+    return _document(f"""
+        <h1 id="transfer-funds-header">Transfer Funds</h1>
+        {result}
+        <form method="post" action="/transfer">
+            <select id="from-account" name="from_account">{_options(account_names)}</select>
+            <select id="to-account" name="to_account">{_options(account_names, account_names[-1] if account_names else None)}</select>
+            <input id="transfer-amount" name="amount" type="text">
+            <input id="transfer-date" name="date" type="text">
+            <input id="transfer-memo" name="memo" type="text">
+            <button id="confirm-transfer" type="submit">Confirm Transfer</button>
+        </form>
+    """)
+
+
+def bill_payment_page(payee_names, account_names, confirmation=None, error=None):
+    result = ""
+    if confirmation:
+        result = (
+            '<div class="success-message">Payment scheduled successfully</div>'
+            f'<div>Confirmation: <span id="confirmation-number">{escape(confirmation)}</span></div>'
+        )
+    if error:
+        result = f'<div class="error-message">{escape(error)}</div>'
+
+    return _document(f"""
+        <h1 id="bill-payment-header">Pay Bills</h1>
+        {result}
+        <form method="post" action="/bill-pay">
+            <select id="payee-selection" name="payee">{_options(payee_names)}</select>
+            <select id="payment-account" name="account">{_options(account_names)}</select>
+            <input id="payment-amount" name="amount" type="text">
+            <input id="payment-date" name="date" type="text">
+            <input id="payment-memo" name="memo" type="text">
+            <button id="confirm-payment" type="submit">Confirm Payment</button>
+        </form>
+        <button id="add-new-payee" type="button">Add New Payee</button>
+    """)
+
+
+def external_transfer_page(recipient_names, account_names, status=None):
+    # Large amounts reveal the verification section as soon as they are typed
+    script = f"""
+        document.getElementById('transfer-amount').addEventListener('input', function (event) {{
+            var amount = parseFloat(event.target.value.replace(/[$,]/g, '')) || 0;
+            document.getElementById('additional-verification').hidden = amount < {VERIFICATION_THRESHOLD};
+        }});
+    """
+    status_html = f'<div id="transaction-status">{escape(status)}</div>' if status else ""
+
+    return _document(f"""
+        <h1 id="external-transfer-header">External Transfer</h1>
+        {status_html}
+        <form method="post" action="/external-transfer">
+            <select id="saved-recipients" name="recipient">{_options(recipient_names)}</select>
+            <input id="recipient-name" name="recipient_name" type="text">
+            <input id="recipient-account" name="recipient_account" type="text">
+            <input id="recipient-routing" name="recipient_routing" type="text">
+            <input id="recipient-bank" name="recipient_bank" type="text">
+            <select id="from-account" name="from_account">{_options(account_names)}</select>
+            <input id="transfer-amount" name="amount" type="text">
+            <input id="transfer-date" name="date" type="text">
+            <input id="transfer-memo" name="memo" type="text">
+            <button id="confirm-transfer" type="submit">Confirm Transfer</button>
+            <section id="additional-verification" hidden>
+                <p id="regulatory-information">Transfers of ${VERIFICATION_THRESHOLD:,} or more are subject to
+                regulatory review and require additional verification.</p>
+                <input id="verification-code" name="verification_code" type="text">
+                <button id="submit-verification" type="submit">Verify</button>
+            </section>
+        </form>
+    """, script)
+
+
+def profile_page(user):
+    address = user.get("address", {})
+    mailing_address = ", ".join(
+        part for part in (address.get("street"), address.get("city"), address.get("state"), address.get("zipcode")) if part
+    )
+    return _document(f"""
+        <h1 id="profile-management-header">Profile Management</h1>
+        <ul id="profile-menu">
+            <li><a href="#personal-information-section">Personal Information</a></li>
+            <li><a href="#">Change Password</a></li>
+            <li><a href="#">Security Questions</a></li>
+            <li><a href="#">Two-Factor Authentication</a></li>
+            <li><a href="#">Notification Preferences</a></li>
+            <li><a href="#">Statement Preferences</a></li>
+            <li><a href="#">Trusted Devices</a></li>
+        </ul>
+        <section id="personal-information-section">
+            <div id="full-name">{escape(user.get("first_name", ""))} {escape(user.get("last_name", ""))}</div>
+            <div id="email-address">{escape(user.get("email", ""))}</div>
+            <div id="phone-number">{escape(user.get("phone", ""))}</div>
+            <div id="mailing-address">{escape(mailing_address)}</div>
+        </section>
+        <button id="edit-button" type="button">Edit</button>
+        <a id="logout-button" href="/logout">Log Out</a>
+    """)
+
+
+def registration_page(success=False):
+    if success:
+        return _document('<div class="registration-success">Registration complete</div>')
+
+    return _document("""
+        <div id="registration-progress">Step 1 of 5</div>
+        <form method="post" action="/register">
+            <h2>Personal Information</h2>
+            <input id="first-name" name="first_name" type="text">
+            <input id="last-name" name="last_name" type="text">
+            <input id="email" name="email" type="text">
+            <input id="phone" name="phone" type="text">
+            <input id="date-of-birth" name="date_of_birth" type="text">
+            <input id="ssn" name="ssn" type="text">
+            <h2>Account Credentials</h2>
+            <input id="username" name="username" type="text">
+            <input id="password" name="password" type="password">
+            <input id="confirm-password" name="confirm_password" type="password">
+            <h2>Terms and Agreements</h2>
+            <input id="accept-terms" name="accept_terms" type="checkbox">
+            <input id="accept-privacy" name="accept_privacy" type="checkbox">
+            <input id="email-consent" name="email_consent" type="checkbox">
+            <button id="previous-btn" type="button">Previous</button>
+            <button id="next-btn" type="button">Next</button>
+            <button id="submit-registration-btn" type="submit">Submit</button>
+        </form>
+    """)
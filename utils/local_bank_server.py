@@ -0,0 +1,834 @@
+import os
+import re
+import sys
+import json
+import uuid
+import logging
+import argparse
+import threading
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pyotp
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import local_bank_pages as pages
+from utils.data_generator import DataGenerator
+from utils.data_writers import find_data_file, read_records
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/v1"
+
+# Credentials referenced by config.json, behave.ini and the feature files
+DEFAULT_PASSWORD = "SecureP@ss123"
+KNOWN_USERS = {
+    "standard_user@example.com": "SecureP@ss123!",
+    "premium_user@example.com": "PremiumP@ss456!",
+    "admin_user@example.com": "AdminP@ss789!",
+    "2fa_user@example.com": "2FAUserP@ss!",
+    "mobile_user@example.com": "MobileP@ss123",
+    "ios_user@example.com": "iOSP@ss123",
+    "testuser": DEFAULT_PASSWORD,
+    "testuser1": DEFAULT_PASSWORD,
+    "testuser2": DEFAULT_PASSWORD,
+    "2fauser": DEFAULT_PASSWORD,
+}
+TWO_FACTOR_USERS = {"2fauser": "BASE32SECRET3232", "2fa_user@example.com": "BASE32SECRET3232"}
+# User shown when a page is opened without logging in first
+DEFAULT_USER = "standard_user@example.com"
+
+# Failed logins before an account is locked
+MAX_FAILED_LOGINS = 3
+
+
+class BankState:
+    """
+    In-memory state of the stand-in bank: users, accounts, transactions and payees.
+    """
+
+    def __init__(self):
+        self.users = {}
+        self.accounts = {}
+        self.transactions = {}
+        self.payees = []
+        self.tokens = {}
+        self.failed_logins = {}
+        self.audit_log = {}
+        self.statements = {}
+        # Accounts created with a user through the admin API, replaced by provisioned accounts of the same type
+        self.placeholder_accounts = set()
+        self.lock = threading.RLock()
+
+    @classmethod
+    def from_data_generator(cls, generator=None, num_users=3, num_transactions=20, num_payees=5):
+        """
+        Seed the state with the known test users plus DataGenerator output
+
+        :param generator: DataGenerator instance (a new one is created if None)
+        :param num_users: Number of additional generated users
+        :param num_transactions: Number of transactions per account
+        :param num_payees: Number of generated payees
+        :return: BankState
+        """
+        generator = generator or DataGenerator()
+        state = cls()
+
+        # Known users get the balances the feature files expect
+        for username, password in KNOWN_USERS.items():
+            user = generator.generate_user(with_2fa=username in TWO_FACTOR_USERS)
+            user.update({"username": username, "password": password})
+            if username in TWO_FACTOR_USERS:
+                user["totp_secret"] = TWO_FACTOR_USERS[username]
+            accounts = [
+                generator.generate_account("checking", starting_balance=Decimal("5000.00")),
+                generator.generate_account("savings", starting_balance=Decimal("10000.00")),
+            ]
+            state.add_user(user, accounts, [
+                generator.generate_transaction(account["account_id"])
+                for account in accounts for _ in range(num_transactions)
+            ])
+
+        for i in range(num_users):
+            user = generator.generate_user(with_2fa=i == 1)
+            accounts = [generator.generate_account("checking"), generator.generate_account("savings")]
+            state.add_user(user, accounts, [
+                generator.generate_transaction(account["account_id"])
+                for account in accounts for _ in range(num_transactions)
+            ])
+
+        config_payees = _load_config().get("test_data", {}).get("test_payees", [])
+        state.payees = [
+            dict(generator.generate_payee(), name=payee["name"], account_number=payee["account_number"])
+            for payee in config_payees
+        ]
+        state.payees.append(dict(generator.generate_payee(), name="Water Utility"))
+        state.payees.extend(generator.generate_payee() for _ in range(num_payees))
+        return state
+
+    @classmethod
+    def from_test_data(cls, test_data_path):
+        """
+        Load the state from files written by DataGenerator.generate_test_data_set
+
+        :param test_data_path: Directory containing users, accounts, transactions and payees files (any output format)
+        :return: BankState
+        """
+        def load(name):
+            path = find_data_file(test_data_path, name)
+            if path is None:
+                raise FileNotFoundError(f"No {name} data file in {test_data_path}")
+            return read_records(path)
+
+        state = cls()
+        accounts_by_user = {}
+        for account in load("accounts"):
+            account["balance"] = Decimal(account["balance"])
+            accounts_by_user.setdefault(account["user_id"], []).append(account)
+
+        transactions_by_account = {}
+        for transaction in load("transactions"):
+            transaction["amount"] = Decimal(transaction["amount"])
+            transactions_by_account.setdefault(transaction["account_id"], []).append(transaction)
+
+        for user in load("users"):
+            accounts = accounts_by_user.get(user["username"], [])
+            state.add_user(user, accounts, [
+                transaction for account in accounts for transaction in transactions_by_account.get(account["account_id"], [])
+            ])
+
+        state.payees = list(load("payees"))
+        return state
+
+    def add_user(self, user, accounts, transactions):
+        with self.lock:
+            user.setdefault("status", "active")
+            self.users[user["username"]] = user
+            for account in accounts:
+                account["user_id"] = user["username"]
+                self.accounts[account["account_id"]] = account
+                self.transactions.setdefault(account["account_id"], [])
+            for transaction in transactions:
+                self.transactions.setdefault(transaction["account_id"], []).append(transaction)
+
+    def user_accounts(self, username):
+        return [account for account in self.accounts.values() if account.get("user_id") == username]
+
+    def account_by_type(self, username, account_type):
+        for account in self.user_accounts(username):
+            if account["account_type"].lower() == account_type.lower():
+                return account
+        return None
+
+    def account_transactions(self, account_id):
+        return sorted(self.transactions.get(account_id, []), key=lambda transaction: transaction["date"], reverse=True)
+
+    def record_audit(self, username, action):
+        self.audit_log.setdefault(username, []).append({"timestamp": datetime.now().isoformat(), "action": action})
+
+    def check_login(self, username, password):
+        """
+        Validate credentials and track failed attempts
+
+        :return: Tuple (status, user) where status is 'ok', 'invalid' or 'locked'
+        """
+        with self.lock:
+            user = self.users.get(username)
+            if user and user.get("status") == "locked":
+                return "locked", user
+            if user and user.get("password") == password:
+                self.failed_logins.pop(username, None)
+                self.record_audit(username, "login")
+                return "ok", user
+
+            self.failed_logins[username] = self.failed_logins.get(username, 0) + 1
+            if user and self.failed_logins[username] >= MAX_FAILED_LOGINS:
+                user["status"] = "locked"
+                self.record_audit(username, "locked")
+                return "locked", user
+            return "invalid", user
+
+    def issue_token(self, username):
+        token = f"local-{uuid.uuid4().hex}"
+        self.tokens[token] = username
+        return token
+
+    def post_transaction(self, account, amount, is_debit, description, status="cleared"):
+        with self.lock:
+            account["balance"] += -amount if is_debit else amount
+            transaction = {
+                "transaction_id": f"TX-{uuid.uuid4().hex[:12].upper()}",
+                "account_id": account["account_id"],
+                "date": datetime.now().strftime("%Y-%m-%d"),
+                "amount": amount,
+                "is_debit": is_debit,
+                "description": description,
+                "category": "Transfer",
+                "balance_after": account["balance"],
+                "status": status,
+            }
+            self.transactions.setdefault(account["account_id"], []).append(transaction)
+            return transaction
+
+    def transfer(self, from_account, to_account, amount, memo=None):
+        reference = f"TRF-{uuid.uuid4().hex[:10].upper()}"
+        with self.lock:
+            self.post_transaction(from_account, amount, True, f"Transfer Out {reference} {memo or ''}".strip())
+            self.post_transaction(to_account, amount, False, f"Transfer In {reference} {memo or ''}".strip())
+        return reference
+
+
+def _load_config():
+    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.json')
+    try:
+        with open(config_path, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Error loading configuration: {e}")
+        return {}
+
+
+def _parse_amount(value):
+    try:
+        return Decimal(str(value).replace('$', '').replace(',', '')).quantize(Decimal("0.01"))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _json_default(obj):
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError
+
+
+def _public_user(user):
+    return {key: value for key, value in user.items() if key not in ("password", "totp_secret")}
+
+
+class LocalBankRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the stand-in web pages and the /v1 REST API used by AccountsAPI and UserManagementAPI.
+    """
+
+    server_version = "LocalBank/1.0"
+    protocol_version = "HTTP/1.1"
+
+    # (method, path pattern, handler name)
+    API_ROUTES = [
+        ("POST", r"auth/login", "api_login"),
+        ("GET", r"accounts", "api_get_accounts"),
+        ("GET", r"accounts/(?P<account_id>[^/]+)", "api_get_account"),
+        ("GET", r"accounts/(?P<account_id>[^/]+)/transactions", "api_get_transactions"),
+        ("GET", r"accounts/(?P<account_id>[^/]+)/balance", "api_get_balance"),
+        ("GET", r"accounts/(?P<account_id>[^/]+)/statements", "api_get_statements"),
+        ("GET", r"statements/(?P<statement_id>[^/]+)/pdf", "api_get_statement_pdf"),
+        ("POST", r"transfers", "api_transfer"),
+        ("POST", r"external-transfers", "api_external_transfer"),
+        ("GET", r"users/profile", "api_get_profile"),
+        ("PUT", r"users/profile", "api_update_profile"),
+        ("GET", r"users/(?P<user_id>[^/]+)/profile", "api_get_profile"),
+        ("POST", r"users/password", "api_change_password"),
+        ("POST", r"admin/users", "api_create_user"),
+        ("POST", r"admin/accounts", "api_create_account"),
+        ("POST", r"payees", "api_create_payee"),
+        ("GET", r"admin/users/(?P<user_id>[^/]+)/status", "api_get_user_status"),
+        ("PUT", r"admin/users/(?P<user_id>[^/]+)/status", "api_set_user_status"),
+        ("PUT", r"admin/users/(?P<user_id>[^/]+)/password", "api_set_user_password"),
+        ("POST", r"auth/password-reset", "api_accepted"),
+        ("POST", r"auth/password-reset/confirm", "api_accepted"),
+        ("GET", r"auth/security-questions", "api_get_security_questions"),
+        ("PUT", r"users/security-questions", "api_accepted"),
+        ("POST", r"auth/security-questions/verify", "api_accepted"),
+        ("POST", r"users/2fa/enable", "api_enable_2fa"),
+        ("POST", r"users/2fa/verify", "api_verify_2fa"),
+        ("POST", r"users/2fa/disable", "api_disable_2fa"),
+        ("GET", r"users/audit-log", "api_get_audit_log"),
+        ("GET", r"admin/users/(?P<user_id>[^/]+)/audit-log", "api_get_audit_log"),
+    ]
+
+    PAGE_ROUTES = {
+        ("GET", "/"): "page_dashboard",
+        ("GET", "/dashboard"): "page_dashboard",
+        ("GET", "/login"): "page_login",
+        ("POST", "/login"): "page_login_submit",
+        ("POST", "/login/2fa"): "page_login_2fa",
+        ("GET", "/logout"): "page_logout",
+        ("GET", "/transactions"): "page_transactions",
+        ("GET", "/transfer"): "page_transfer",
+        ("POST", "/transfer"): "page_transfer_submit",
+        ("GET", "/bill-pay"): "page_bill_pay",
+        ("POST", "/bill-pay"): "page_bill_pay_submit",
+        ("GET", "/external-transfer"): "page_external_transfer",
+        ("POST", "/external-transfer"): "page_external_transfer_submit",
+        ("GET", "/profile"): "page_profile",
+        ("GET", "/register"): "page_register",
+        ("POST", "/register"): "page_register_submit",
+    }
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        parsed = urlparse(self.path)
+        self.query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        self.body = self._read_body()
+
+        try:
+            if parsed.path.startswith(API_PREFIX + "/"):
+                endpoint = parsed.path[len(API_PREFIX) + 1:].rstrip('/')
+                for route_method, pattern, handler_name in self.API_ROUTES:
+                    match = re.fullmatch(pattern, endpoint)
+                    if route_method == method and match:
+                        return getattr(self, handler_name)(**match.groupdict())
+                return self._send_json({"error": f"Unknown endpoint {method} {endpoint}"}, 404)
+
+            handler_name = self.PAGE_ROUTES.get((method, parsed.path.rstrip('/') or "/"))
+            if handler_name is None:
+                return self._send_html("<h1>Not Found</h1>", 404)
+            return getattr(self, handler_name)()
+        except Exception as e:
+            logger.exception(f"Error handling {method} {self.path}")
+            return self._send_json({"error": str(e)}, 500)
+
+    # Helpers
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b""
+        if not raw:
+            return {}
+        content_type = self.headers.get('Content-Type', '')
+        if 'application/json' in content_type:
+            try:
+                return json.loads(raw)
+            except ValueError:
+                return {}
+        return {key: values[-1] for key, values in parse_qs(raw.decode()).items()}
+
+    def _send(self, body, status, content_type, headers=None):
+        payload = body if isinstance(body, bytes) else body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_json(self, data, status=200):
+        self._send(json.dumps(data, default=_json_default), status, 'application/json')
+
+    def _send_html(self, html, status=200, headers=None):
+        self._send(html, status, 'text/html; charset=utf-8', headers)
+
+    def _redirect(self, location, headers=None):
+        self._send("", 303, 'text/html', dict(headers or {}, Location=location))
+
+    def _session_user(self):
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        username = cookie['session'].value if 'session' in cookie else DEFAULT_USER
+        return self.state.users.get(username) or self.state.users[DEFAULT_USER]
+
+    def _api_user(self):
+        authorization = self.headers.get('Authorization', '')
+        token = authorization[len("Bearer "):] if authorization.startswith("Bearer ") else None
+        username = self.state.tokens.get(token, DEFAULT_USER)
+        return self.state.users.get(username) or self.state.users[DEFAULT_USER]
+
+    def _account_names(self, user):
+        return [account["account_type"].title() for account in self.state.user_accounts(user["username"])]
+
+    # API handlers
+
+    def api_login(self):
+        status, user = self.state.check_login(self.body.get("username"), self.body.get("password"))
+        if status == "ok":
+            return self._send_json({"token": self.state.issue_token(user["username"]), "expiresIn": 1800})
+        if status == "locked":
+            return self._send_json({"error": "Account locked"}, 423)
+        return self._send_json({"error": "Invalid username or password"}, 401)
+
+    def api_get_accounts(self):
+        accounts = self.state.user_accounts(self._api_user()["username"])
+        if self.query.get("type"):
+            accounts = [account for account in accounts if account["account_type"] == self.query["type"]]
+        if self.query.get("status"):
+            accounts = [account for account in accounts if account["status"] == self.query["status"]]
+        return self._send_json({"accounts": accounts})
+
+    def _owned_account(self, account_id):
+        account = self.state.accounts.get(account_id)
+        if account is None:
+            self._send_json({"error": f"Account {account_id} not found"}, 404)
+        return account
+
+    def api_get_account(self, account_id):
+        account = self._owned_account(account_id)
+        if account:
+            self._send_json(account)
+
+    def api_get_transactions(self, account_id):
+        if not self._owned_account(account_id):
+            return
+        transactions = self.state.account_transactions(account_id)
+        if self.query.get("fromDate"):
+            transactions = [t for t in transactions if t["date"] >= self.query["fromDate"]]
+        if self.query.get("toDate"):
+            transactions = [t for t in transactions if t["date"] <= self.query["toDate"]]
+        if self.query.get("type") in ("debit", "credit"):
+            transactions = [t for t in transactions if t["is_debit"] == (self.query["type"] == "debit")]
+        self._send_json({"transactions": transactions})
+
+    def api_get_balance(self, account_id):
+        account = self._owned_account(account_id)
+        if account:
+            self._send_json({
+                "accountId": account_id,
+                "balance": account["balance"],
+                "availableBalance": account["balance"],
+                "currency": account.get("currency", "USD"),
+            })
+
+    def api_get_statements(self, account_id):
+        if not self._owned_account(account_id):
+            return
+        today = datetime.now().replace(day=1)
+        statements = []
+        for months_back in range(1, 4):
+            period_end = today - timedelta(days=1) if months_back == 1 else statements[-1]["periodStart"] - timedelta(days=1)
+            period_start = period_end.replace(day=1)
+            statements.append({
+                "statementId": f"STMT-{account_id}-{period_end.strftime('%Y%m')}",
+                "periodStart": period_start,
+                "periodEnd": period_end,
+            })
+        for statement in statements:
+            self.state.statements[statement["statementId"]] = account_id
+            statement["periodStart"] = statement["periodStart"].strftime("%Y-%m-%d")
+            statement["periodEnd"] = statement["periodEnd"].strftime("%Y-%m-%d")
+        self._send_json({"statements": statements})
+
+    def api_get_statement_pdf(self, statement_id):
+        if statement_id not in self.state.statements:
+            return self._send_json({"error": f"Statement {statement_id} not found"}, 404)
+        pdf = b"%PDF-1.4\n% Local stand-in statement " + statement_id.encode() + b"\n%%EOF\n"
+        self._send(pdf, 200, 'application/pdf')
+
+    def api_transfer(self):
+        from_account = self.state.accounts.get(self.body.get("fromAccountId"))
+        to_account = self.state.accounts.get(self.body.get("toAccountId"))
+        amount = _parse_amount(self.body.get("amount"))
+        if not from_account or not to_account:
+            return self._send_json({"error": "Unknown account"}, 404)
+        if amount is None or amount <= 0:
+            return self._send_json({"error": "Invalid amount"}, 400)
+        if amount > from_account["balance"]:
+            return self._send_json({"error": "Insufficient funds"}, 422)
+        reference = self.state.transfer(from_account, to_account, amount, self.body.get("memo"))
+        self._send_json({"referenceNumber": reference, "status": "Completed"}, 201)
+
+    def api_external_transfer(self):
+        from_account = self.state.accounts.get(self.body.get("fromAccountId"))
+        amount = _parse_amount(self.body.get("amount"))
+        if not from_account:
+            return self._send_json({"error": "Unknown account"}, 404)
+        if amount is None or amount <= 0:
+            return self._send_json({"error": "Invalid amount"}, 400)
+        status = "Pending Review" if amount >= pages.VERIFICATION_THRESHOLD else "Completed"
+        transaction = self.state.post_transaction(from_account, amount, True, "External Transfer", status.lower())
+        self._send_json({"referenceNumber": transaction["transaction_id"], "status": status}, 201)
+
+    def api_get_profile(self, user_id=None):
+        user = self.state.users.get(user_id) if user_id else self._api_user()
+        if user is None:
+            return self._send_json({"error": f"User {user_id} not found"}, 404)
+        self._send_json(_public_user(user))
+
+    def api_update_profile(self):
+        user = self._api_user()
+        with self.state.lock:
+            user.update({key: value for key, value in self.body.items() if key not in ("username", "password")})
+            self.state.record_audit(user["username"], "profile_update")
+        self._send_json(_public_user(user))
+
+    def api_change_password(self):
+        user = self._api_user()
+        if self.body.get("currentPassword") != user.get("password"):
+            return self._send_json({"error": "Current password is incorrect"}, 400)
+        user["password"] = self.body.get("newPassword")
+        self.state.record_audit(user["username"], "password_change")
+        self._send_json({"message": "Password changed"})
+
+    def api_create_user(self):
+        username = self.body.get("username")
+        if not username:
+            return self._send_json({"error": "username is required"}, 400)
+        # New users get the same starting balances as the known test users
+        accounts = [
+            {"account_id": f"{account_type.upper()}-{uuid.uuid4().int % 10 ** 10:010d}", "account_type": account_type,
+             "balance": balance, "currency": "USD", "status": "active"}
+            for account_type, balance in (("checking", Decimal("5000.00")), ("savings", Decimal("10000.00")))
+        ]
+        with self.state.lock:
+            if username in self.state.users:
+                return self._send_json({"error": f"User {username} already exists"}, 409)
+            self.state.add_user(dict(self.body), accounts, [])
+            self.state.placeholder_accounts.update(account["account_id"] for account in accounts)
+            self.state.record_audit(username, "created")
+            user = _public_user(self.state.users[username])
+        self._send_json(user, 201)
+
+    def api_create_account(self):
+        account_id, username = self.body.get("account_id"), self.body.get("user_id")
+        balance = _parse_amount(self.body.get("balance", "0"))
+        if not account_id or not self.body.get("account_type") or balance is None:
+            return self._send_json({"error": "account_id, account_type and a valid balance are required"}, 400)
+        with self.state.lock:
+            if username not in self.state.users:
+                return self._send_json({"error": f"User {username} not found"}, 404)
+            if account_id in self.state.accounts:
+                return self._send_json({"error": f"Account {account_id} already exists"}, 409)
+            placeholder = self.state.account_by_type(username, self.body["account_type"])
+            if placeholder and placeholder["account_id"] in self.state.placeholder_accounts:
+                self.state.placeholder_accounts.discard(placeholder["account_id"])
+                del self.state.accounts[placeholder["account_id"]]
+                self.state.transactions.pop(placeholder["account_id"], None)
+            account = dict(self.body, balance=balance)
+            account.setdefault("currency", "USD")
+            account.setdefault("status", "active")
+            self.state.add_user(self.state.users[username], [account], [])
+        self._send_json(account, 201)
+
+    def api_create_payee(self):
+        if not self.body.get("payee_id") or not self.body.get("name"):
+            return self._send_json({"error": "payee_id and name are required"}, 400)
+        with self.state.lock:
+            if any(payee.get("payee_id") == self.body["payee_id"] for payee in self.state.payees):
+                return self._send_json({"error": f"Payee {self.body['payee_id']} already exists"}, 409)
+            self.state.payees.append(dict(self.body))
+        self._send_json(self.body, 201)
+
+    def api_get_user_status(self, user_id):
+        user = self.state.users.get(user_id)
+        if user is None:
+            return self._send_json({"error": f"User {user_id} not found"}, 404)
+        self._send_json({"userId": user_id, "status": user.get("status", "active")})
+
+    def api_set_user_status(self, user_id):
+        user = self.state.users.get(user_id)
+        if user is None:
+            return self._send_json({"error": f"User {user_id} not found"}, 404)
+        with self.state.lock:
+            user["status"] = self.body.get("status", "active")
+            if user["status"] == "active":
+                self.state.failed_logins.pop(user_id, None)
+            self.state.record_audit(user_id, f"status:{user['status']}")
+        self._send_json({"userId": user_id, "status": user["status"]})
+
+    def api_set_user_password(self, user_id):
+        user = self.state.users.get(user_id)
+        if user is None:
+            return self._send_json({"error": f"User {user_id} not found"}, 404)
+        if not self.body.get("password"):
+            return self._send_json({"error": "password is required"}, 400)
+        with self.state.lock:
+            user["password"] = self.body["password"]
+            self.state.record_audit(user_id, "password_reset")
+        self._send_json({"userId": user_id, "message": "Password set"})
+
+    def api_accepted(self):
+        self._send_json({"message": "Accepted"})
+
+    def api_get_security_questions(self):
+        self._send_json({"questions": [
+            {"id": "q1", "question": "What was the name of your first pet?"},
+            {"id": "q2", "question": "In what city were you born?"},
+            {"id": "q3", "question": "What is your mother's maiden name?"},
+        ]})
+
+    def api_enable_2fa(self):
+        user = self._api_user()
+        user["pending_totp_secret"] = pyotp.random_base32()
+        self._send_json({
+            "secret": user["pending_totp_secret"],
+            "otpauthUrl": pyotp.TOTP(user["pending_totp_secret"]).provisioning_uri(user["username"], "MyBank"),
+        })
+
+    def api_verify_2fa(self):
+        user = self._api_user()
+        secret = user.get("pending_totp_secret")
+        if not secret or not pyotp.TOTP(secret).verify(str(self.body.get("code", "")), valid_window=1):
+            return self._send_json({"error": "Invalid verification code"}, 400)
+        user.update({"totp_secret": user.pop("pending_totp_secret"), "has_2fa": True})
+        self._send_json({"enabled": True, "recoveryCodes": [uuid.uuid4().hex[:10] for _ in range(8)]})
+
+    def api_disable_2fa(self):
+        user = self._api_user()
+        user.update({"has_2fa": False})
+        user.pop("totp_secret", None)
+        self._send_json({"enabled": False})
+
+    def api_get_audit_log(self, user_id=None):
+        username = user_id or self._api_user()["username"]
+        self._send_json({"entries": self.state.audit_log.get(username, [])})
+
+    # Page handlers
+
+    def page_dashboard(self):
+        user = self._session_user()
+        checking = self.state.account_by_type(user["username"], "checking")
+        savings = self.state.account_by_type(user["username"], "savings")
+        self._send_html(pages.dashboard_page(
+            checking["balance"] if checking else Decimal("0"),
+            savings["balance"] if savings else Decimal("0"),
+            self.state.payees,
+        ))
+
+    def page_login(self):
+        self._send_html(pages.login_page())
+
+    def page_login_submit(self):
+        username = self.body.get("username", "")
+        status, user = self.state.check_login(username, self.body.get("password", ""))
+        if status == "locked":
+            return self._send_html(pages.login_page(error="Your account has been locked", locked=True))
+        if status == "invalid":
+            return self._send_html(pages.login_page(error="Invalid username or password"))
+        if user.get("totp_secret"):
+            return self._send_html(pages.login_page(two_factor=True, username=username))
+        self._redirect("/dashboard", {"Set-Cookie": f"session={username}; Path=/"})
+
+    def page_login_2fa(self):
+        username = self.body.get("username", "")
+        user = self.state.users.get(username)
+        if not user or not pyotp.TOTP(user["totp_secret"]).verify(self.body.get("code", ""), valid_window=1):
+            return self._send_html(pages.login_page(error="Invalid security code", two_factor=True, username=username))
+        self._redirect("/dashboard", {"Set-Cookie": f"session={username}; Path=/"})
+
+    def page_logout(self):
+        self._redirect("/login", {"Set-Cookie": "session=; Path=/; Max-Age=0"})
+
+    def page_transactions(self):
+        user = self._session_user()
+        checking = self.state.account_by_type(user["username"], "checking")
+        transactions = self.state.account_transactions(checking["account_id"]) if checking else []
+
+        transaction_type = self.query.get("type", "all")
+        if transaction_type == "deposits":
+            transactions = [t for t in transactions if not t["is_debit"]]
+        elif transaction_type == "withdrawals":
+            transactions = [t for t in transactions if t["is_debit"]]
+        elif transaction_type == "transfers":
+            transactions = [t for t in transactions if "transfer" in t["description"].lower()]
+
+        for key, compare in (("from", lambda a, b: a >= b), ("to", lambda a, b: a <= b)):
+            if self.query.get(key):
+                try:
+                    limit = datetime.strptime(self.query[key], "%m/%d/%Y").strftime("%Y-%m-%d")
+                    transactions = [t for t in transactions if compare(t["date"], limit)]
+                except ValueError:
+                    pass
+
+        rows = [
+            dict(t, display_date=datetime.strptime(t["date"], "%Y-%m-%d").strftime("%m/%d/%Y"))
+            for t in transactions
+        ]
+        self._send_html(pages.transactions_page(rows))
+
+    def page_transfer(self):
+        self._send_html(pages.transfer_page(self._account_names(self._session_user())))
+
+    def page_transfer_submit(self):
+        user = self._session_user()
+        names = self._account_names(user)
+        from_account = self.state.account_by_type(user["username"], self.body.get("from_account", ""))
+        to_account = self.state.account_by_type(user["username"], self.body.get("to_account", ""))
+        amount = _parse_amount(self.body.get("amount", ""))
+
+        if not from_account or not to_account or from_account is to_account:
+            return self._send_html(pages.transfer_page(names, error="Please select two different accounts"))
+        if amount is None or amount <= 0:
+            return self._send_html(pages.transfer_page(names, error="Please enter a valid amount"))
+        if amount > from_account["balance"]:
+            return self._send_html(pages.transfer_page(names, error="Insufficient funds"))
+
+        reference = self.state.transfer(from_account, to_account, amount, self.body.get("memo"))
+        self._send_html(pages.transfer_page(names, reference=reference))
+
+    def page_bill_pay(self):
+        user = self._session_user()
+        self._send_html(pages.bill_payment_page([p["name"] for p in self.state.payees], self._account_names(user)))
+
+    def page_bill_pay_submit(self):
+        user = self._session_user()
+        payee_names = [p["name"] for p in self.state.payees]
+        account = self.state.account_by_type(user["username"], self.body.get("account") or "checking")
+        amount = _parse_amount(self.body.get("amount", ""))
+
+        if amount is None or amount <= 0 or account is None:
+            return self._send_html(pages.bill_payment_page(
+                payee_names, self._account_names(user), error="Please enter a valid amount"
+            ))
+
+        transaction = self.state.post_transaction(account, amount, True, f"Bill Payment - {self.body.get('payee', '')}")
+        self._send_html(pages.bill_payment_page(
+            payee_names, self._account_names(user), confirmation=transaction["transaction_id"]
+        ))
+
+    def page_external_transfer(self):
+        user = self._session_user()
+        recipients = ["External Account"] + [p["name"] for p in self.state.payees]
+        self._send_html(pages.external_transfer_page(recipients, self._account_names(user)))
+
+    def page_external_transfer_submit(self):
+        user = self._session_user()
+        recipients = ["External Account"] + [p["name"] for p in self.state.payees]
+        account = self.state.account_by_type(user["username"], self.body.get("from_account") or "checking")
+        amount = _parse_amount(self.body.get("amount", ""))
+
+        status = "Rejected"
+        if account is not None and amount is not None and amount > 0:
+            status = "Pending Review" if amount >= pages.VERIFICATION_THRESHOLD else "Completed"
+            self.state.post_transaction(account, amount, True, "External Transfer", status.lower())
+        self._send_html(pages.external_transfer_page(recipients, self._account_names(user), status=status))
+
+    def page_profile(self):
+        self._send_html(pages.profile_page(self._session_user()))
+
+    def page_register(self):
+        self._send_html(pages.registration_page())
+
+    def page_register_submit(self):
+        username = self.body.get("username")
+        if username and username not in self.state.users:
+            self.state.add_user(dict(self.body), [], [])
+        self._send_html(pages.registration_page(success=True))
+
+
+class LocalBankServer:
+    """
+    Stand-in bank web app and API server running in a background thread.
+
+    Usage:
+        server = LocalBankServer().start()
+        ... run tests against server.base_url / server.api_base_url ...
+        server.stop()
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, state=None):
+        """
+        Initialize the server
+
+        :param host: Interface to bind to
+        :param port: Port to listen on (0 picks a free port)
+        :param state: BankState to serve (seeded from DataGenerator if None)
+        """
+        self.state = state or BankState.from_data_generator()
+        self.httpd = ThreadingHTTPServer((host, port), LocalBankRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = self.state
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_base_url(self):
+        return f"{self.base_url}{API_PREFIX}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="local-bank-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Local bank server listening on {self.base_url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+        logger.info("Local bank server stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the local stand-in bank web app and API server')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind to (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on (default: 8080)')
+    parser.add_argument('--test-data', help='Load state from DataGenerator output in this directory instead of generating it')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    state = BankState.from_test_data(args.test_data) if args.test_data else BankState.from_data_generator()
+    server = LocalBankServer(args.host, args.port, state)
+    print(f"Web app: {server.base_url}\nAPI: {server.api_base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,10 +5,27 @@ from selenium.webdriver.support import expected_conditions as EC
 import logging
 import os
 import json
-import tempfile
+import time
+import hashlib
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.actions import interaction
+from selenium.webdriver.common.actions.action_builder import ActionBuilder
+from selenium.webdriver.common.actions.pointer_input import PointerInput
+from mobile_page_objects.locator_registry import forget_session
+from utils.artifact_store import get_artifact_store
+from utils.driver_instrumentation import instrument_context_driver
+from utils.page_source import PageSnapshot
 
 logger = logging.getLogger(__name__)
 
+# Session ID -> window size, which does not change during a session
+_window_sizes = {}
+
+# Values returned by driver.query_app_state
+APP_NOT_INSTALLED = 0
+APP_NOT_RUNNING = 1
+APP_RUNNING_IN_FOREGROUND = 4
+
 def load_config():
     """Load configuration from config file."""
     config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.json')
@@ -19,6 +36,20 @@ def load_config():
         logger.error(f"Error loading configuration: {e}")
         return {}
 
+def _apply_leased_device(context, desired_caps, appium_server):
+    """Target the device leased from the device registry, if any; returns the Appium server URL."""
+    device = getattr(context, 'mobile_device', None)
+    if device is None:
+        return appium_server
+    if device.get('udid'):
+        desired_caps['udid'] = device['udid']
+    if device.get('device_name'):
+        desired_caps['deviceName'] = device['device_name']
+    if device.get('platform_version'):
+        desired_caps['platformVersion'] = device['platform_version']
+    desired_caps.update(device.get('capabilities', {}))
+    return device.get('appium_server_url', appium_server)
+
 def get_android_driver(context):
     """Initialize and return Android driver for Appium."""
     config = load_config()
@@ -47,12 +78,14 @@ def get_android_driver(context):
     # Add additional capabilities from config
     additional_caps = context.config.userdata.get('android_capabilities', {})
     desired_caps.update(additional_caps)
+    appium_server = _apply_leased_device(context, desired_caps, appium_server)
     
     logger.info(f"Initializing Android driver with capabilities: {desired_caps}")
     
     try:
         driver = webdriver.Remote(appium_server, desired_caps)
         driver.implicitly_wait(10)
+        instrument_context_driver(context, driver)
         logger.info("Android driver initialized successfully")
         return driver
     except Exception as e:
@@ -85,43 +118,262 @@ def get_ios_driver(context):
     # Add additional capabilities from config
     additional_caps = context.config.userdata.get('ios_capabilities', {})
     desired_caps.update(additional_caps)
+    appium_server = _apply_leased_device(context, desired_caps, appium_server)
     
     logger.info(f"Initializing iOS driver with capabilities: {desired_caps}")
     
     try:
         driver = webdriver.Remote(appium_server, desired_caps)
         driver.implicitly_wait(10)
+        instrument_context_driver(context, driver)
         logger.info("iOS driver initialized successfully")
         return driver
     except Exception as e:
         logger.error(f"Failed to initialize iOS driver: {e}")
         raise
 
-def take_screenshot(driver, scenario_name, step_name=None):
-    """Take a screenshot and save it to a temporary file."""
-    try:
-        # Create a temp dir if it doesn't exist
-        screenshot_dir = os.path.join(tempfile.gettempdir(), 'mobile_screenshots')
-        os.makedirs(screenshot_dir, exist_ok=True)
-        
-        # Generate filename
-        import time
-        timestamp = time.strftime("%Y%m%d-%H%M%S")
-        scenario_name = scenario_name.replace(' ', '_').replace('/', '_')
-        
-        if step_name:
-            step_name = step_name.replace(' ', '_').replace('/', '_')
-            filename = f"{timestamp}_{scenario_name}_{step_name}.png"
-        else:
-            filename = f"{timestamp}_{scenario_name}.png"
+def get_app_id(context, platform):
+    """Return the Android app package or iOS bundle ID under test."""
+    mobile_config = load_config().get('mobile', {})
+    if platform.lower() == 'android':
+        return context.config.userdata.get('android_app_package',
+                                           mobile_config.get('android_app_package', 'com.mybank.banking'))
+    return context.config.userdata.get('ios_bundle_id', mobile_config.get('ios_bundle_id', 'com.mybank.banking'))
+
+class MobileSessionManager:
+    """
+    Keeps one Appium session per device across scenarios.
+
+    Creating a session and cold-launching the app dominates mobile scenario time, so
+    after the first scenario the app is reset inside the existing session instead:
+    terminate, clear app data (Android, 'mobile: clearApp'), activate. A session that
+    no longer responds, or an app that cannot be reset, falls back to a new session.
+    """
+    
+    def __init__(self, clear_data=True):
+        """
+        Initialize the manager
+        
+        :param clear_data: Clear Android app data between scenarios (matches noReset=False);
+                           iOS app data cannot be cleared without reinstalling, so iOS is only relaunched
+        """
+        self.clear_data = clear_data
+        self.sessions = {}
+    
+    def get_driver(self, context, platform):
+        """
+        Get a driver with the app freshly launched, reusing the device's session when possible
+        
+        :param context: Behave context
+        :param platform: 'android' or 'ios'
+        :return: Appium driver
+        """
+        platform = platform.lower()
+        leased = getattr(context, 'mobile_device', None)
+        device = leased['id'] if leased else context.config.userdata.get(f'{platform}_device_name', platform)
+        key = (platform, device)
+        app_id = get_app_id(context, platform)
         
-        filepath = os.path.join(screenshot_dir, filename)
+        driver = self.sessions.get(key)
+        if driver is not None:
+            try:
+                self.reset_app(driver, platform, app_id)
+                logger.info(f"Reusing Appium session {driver.session_id} on {device}")
+                return driver
+            except WebDriverException as e:
+                logger.warning(f"Appium session on {device} is unusable, starting a new one: {e}")
+                close_driver(driver)
+                del self.sessions[key]
         
-        # Take the screenshot
-        driver.save_screenshot(filepath)
-        logger.info(f"Screenshot saved to {filepath}")
+        driver = get_android_driver(context) if platform == 'android' else get_ios_driver(context)
+        self.sessions[key] = driver
+        return driver
+    
+    def reset_app(self, driver, platform, app_id):
+        """
+        Return the app to a just-launched state without a new session
         
-        return filepath
+        :param driver: Appium driver
+        :param platform: 'android' or 'ios'
+        :param app_id: App package or bundle ID
+        :raises WebDriverException: If the session is dead or the app is not installed
+        """
+        if driver.query_app_state(app_id) == APP_NOT_INSTALLED:
+            raise WebDriverException(f"{app_id} is not installed")
+        driver.terminate_app(app_id)
+        if platform == 'android' and self.clear_data:
+            driver.execute_script('mobile: clearApp', {'appId': app_id})
+        driver.activate_app(app_id)
+    
+    def close_all(self):
+        """Quit every session."""
+        for driver in self.sessions.values():
+            close_driver(driver)
+        self.sessions.clear()
+
+# Screen name -> deep link path under the app's URL scheme; {placeholders} are filled from navigate() arguments
+DEEP_LINK_ROUTES = {
+    "dashboard": "dashboard",
+    "accounts": "accounts",
+    "account_details": "accounts/{account_type}",
+    "transfer": "transfer",
+    "bill_pay": "billpay",
+    "deposit": "deposit",
+    "more": "more",
+}
+
+class DeepLinkNavigator:
+    """
+    Opens app screens directly through the app's URL scheme.
+
+    Walking the bottom navigation costs a tap and a wait per hop; a deep link is one
+    command. Use it when the navigation itself is not under test. Android opens the
+    link with 'mobile: deepLink' into the app package, iOS opens the URL through the
+    system, which hands it to the app registered for the scheme.
+    """
+    
+    def __init__(self, driver, platform, app_id, scheme="mybank", routes=None):
+        """
+        Initialize the navigator
+        
+        :param driver: Appium driver
+        :param platform: 'android' or 'ios'
+        :param app_id: App package (Android) or bundle ID (iOS)
+        :param scheme: URL scheme the app registers, without '://'
+        :param routes: Screen name to path mapping (DEEP_LINK_ROUTES if None)
+        """
+        self.driver = driver
+        self.platform = platform.lower()
+        self.app_id = app_id
+        self.scheme = scheme
+        self.routes = routes or DEEP_LINK_ROUTES
+    
+    @classmethod
+    def from_context(cls, context):
+        """
+        Create a navigator for the scenario's mobile driver, with the scheme and extra
+        routes from config.json ("mobile" -> "deep_link_scheme" / "deep_link_routes")
+        
+        :param context: Behave context with mobile_driver and driver_type
+        :return: DeepLinkNavigator
+        """
+        mobile_config = load_config().get('mobile', {})
+        scheme = context.config.userdata.get('deep_link_scheme', mobile_config.get('deep_link_scheme', 'mybank'))
+        routes = dict(DEEP_LINK_ROUTES, **mobile_config.get('deep_link_routes', {}))
+        return cls(context.mobile_driver, context.driver_type, get_app_id(context, context.driver_type),
+                   scheme, routes)
+    
+    def url(self, screen, **params):
+        """
+        Build the deep link for a screen
+        
+        :param screen: Screen name from the routing table
+        :param params: Values for the route's placeholders, e.g. account_type='checking'
+        :return: URL string
+        :raises ValueError: If the screen has no route
+        """
+        if screen not in self.routes:
+            raise ValueError(f"No deep link route for screen '{screen}'")
+        return f"{self.scheme}://{self.routes[screen].format(**params)}"
+    
+    def navigate(self, screen, **params):
+        """
+        Open a screen by deep link
+        
+        :param screen: Screen name from the routing table
+        :param params: Values for the route's placeholders
+        :return: The URL that was opened
+        """
+        url = self.url(screen, **params)
+        if self.platform == 'android':
+            self.driver.execute_script('mobile: deepLink', {'url': url, 'package': self.app_id})
+        else:
+            self.driver.get(url)
+        logger.info(f"Opened {screen} screen via {url}")
+        return url
+
+def wait_for_app_ready(driver, app_id, timeout=30, poll_interval=0.1):
+    """
+    Wait until the app is running in the foreground and (Android) its current activity has settled.
+    
+    :param driver: Appium driver
+    :param app_id: App package or bundle ID
+    :param timeout: Seconds to wait
+    :param poll_interval: Seconds between polls
+    :return: Seconds waited
+    :raises TimeoutException: If the app is not ready in time
+    """
+    is_android = driver.capabilities.get('platformName', '').lower() == 'android'
+    started = time.monotonic()
+    previous_activity = None
+    while True:
+        if driver.query_app_state(app_id) == APP_RUNNING_IN_FOREGROUND:
+            if not is_android:
+                break
+            # Splash screens hand over to the main activity; ready once two polls agree
+            activity = driver.current_activity
+            if activity == previous_activity:
+                break
+            previous_activity = activity
+        if time.monotonic() - started >= timeout:
+            raise TimeoutException(f"{app_id} not in the foreground after {timeout}s")
+        time.sleep(poll_interval)
+    waited = time.monotonic() - started
+    logger.debug(f"{app_id} ready after {waited:.2f}s")
+    return waited
+
+def list_signature(driver, locator):
+    """Return the IDs of the elements currently matching a locator, without waiting."""
+    implicit_wait = driver.timeouts.implicit_wait
+    driver.implicitly_wait(0)
+    try:
+        return tuple(element.id for element in driver.find_elements(*locator))
+    finally:
+        driver.implicitly_wait(implicit_wait)
+
+def wait_for_list_stable(driver, locator, timeout=10, settle=0.5, poll_interval=0.1, previous=None, change_timeout=2):
+    """
+    Wait until the elements matching a locator stop changing.
+    
+    The list is stable once the matching element IDs (re-rendered rows get new IDs) stay the
+    same for `settle` seconds. When `previous` is given, e.g. the list_signature taken before
+    submitting a search, the list must also differ from it first, unless it has not changed
+    within `change_timeout` seconds (the update produced an identical list).
+    
+    :param driver: Appium driver
+    :param locator: Locator of the list items
+    :param timeout: Maximum seconds to wait
+    :param settle: Seconds the list must stay unchanged
+    :param poll_interval: Seconds between polls
+    :param previous: Signature the list is expected to change from
+    :param change_timeout: Seconds to wait for a change from `previous`
+    :return: Number of matching elements
+    """
+    started = time.monotonic()
+    signature = list_signature(driver, locator)
+    stable_since = started
+    while True:
+        now = time.monotonic()
+        waiting_for_change = previous is not None and signature == previous and now - started < change_timeout
+        if not waiting_for_change and now - stable_since >= settle:
+            break
+        if now - started >= timeout:
+            logger.warning(f"List {locator} still changing after {timeout}s")
+            break
+        time.sleep(poll_interval)
+        current = list_signature(driver, locator)
+        if current != signature:
+            signature, stable_since = current, time.monotonic()
+    logger.debug(f"List {locator} stable with {len(signature)} items after {time.monotonic() - started:.2f}s")
+    return len(signature)
+
+def take_screenshot(driver, scenario_name, step_name=None):
+    """Take a screenshot and add it to the run's artifact store, alongside the web screenshots."""
+    try:
+        path = get_artifact_store().add_screenshot(driver, scenario_name, step_name, source="mobile").wait()
+        if path:
+            logger.info(f"Screenshot saved to {path}")
+        return path
     except Exception as e:
         logger.error(f"Failed to take screenshot: {e}")
         return None
@@ -130,6 +382,8 @@ def close_driver(driver):
     """Safely close the driver."""
     try:
         if driver:
+            forget_session(driver)
+            _window_sizes.pop(driver.session_id, None)
             driver.quit()
             logger.info("Mobile driver closed successfully")
     except Exception as e:
@@ -160,33 +414,152 @@ def wait_for_element_to_be_clickable(driver, locator, timeout=10):
     return element
 
 def scroll_to_text(driver, text):
-    """Scroll to find text (Android)."""
+    """Scroll until text is visible (UiScrollable on Android, ScrollEngine on iOS)."""
     try:
-        if hasattr(driver, 'find_element_by_android_uiautomator'):
+        if driver.capabilities.get('platformName', '').lower() != 'android':
+            found = ScrollEngine(driver).scroll_to_text(text)
+        elif hasattr(driver, 'find_element_by_android_uiautomator'):
             driver.find_element_by_android_uiautomator(
                 f'new UiScrollable(new UiSelector().scrollable(true).instance(0)).scrollIntoView('
                 f'new UiSelector().textContains("{text}").instance(0))'
             )
-            logger.info(f"Scrolled to text: {text}")
-            return True
+            found = True
         else:
             # For newer Appium versions
             driver.find_element(MobileBy.ANDROID_UIAUTOMATOR, 
                               f'new UiScrollable(new UiSelector().scrollable(true).instance(0)).scrollIntoView('
                               f'new UiSelector().textContains("{text}").instance(0))')
+            found = True
+        if found:
             logger.info(f"Scrolled to text: {text}")
-            return True
+        else:
+            logger.error(f"Text not found after scrolling: {text}")
+        return found
     except Exception as e:
         logger.error(f"Failed to scroll to text '{text}': {e}")
         return False
 
+def get_window_size(driver):
+    """Return the window size, fetched once per session."""
+    size = _window_sizes.get(driver.session_id)
+    if size is None:
+        size = _window_sizes[driver.session_id] = driver.get_window_size()
+    return size
+
+class ScrollEngine:
+    """
+    Scrolls lists with W3C touch pointer actions on Android and iOS.
+    
+    The window size is cached per session, and scroll_until reads the screen with one
+    page source fetch per gesture: the same snapshot feeds the caller's predicate and the
+    end-of-list check (the page source hash stops changing once nothing more scrolls in).
+    """
+    
+    def __init__(self, driver, distance=0.6, duration=300):
+        """
+        Initialize the engine
+        
+        :param driver: Appium driver
+        :param distance: Fraction of the screen height covered by one scroll
+        :param duration: Milliseconds each swipe takes (shorter swipes fling further)
+        """
+        self.driver = driver
+        self.distance = distance
+        self.duration = duration
+    
+    def swipe(self, start_x, start_y, end_x, end_y, duration=None):
+        """Swipe with a single W3C touch pointer."""
+        actions = ActionBuilder(self.driver, mouse=PointerInput(interaction.POINTER_TOUCH, "finger"),
+                                duration=duration or self.duration)
+        actions.pointer_action.move_to_location(start_x, start_y)
+        actions.pointer_action.pointer_down()
+        actions.pointer_action.move_to_location(end_x, end_y)
+        actions.pointer_action.release()
+        actions.perform()
+    
+    def scroll(self, direction="down"):
+        """
+        Scroll the content once
+        
+        :param direction: 'down' reveals content further down the list, 'up' goes back
+        """
+        size = get_window_size(self.driver)
+        x = size['width'] // 2
+        top = int(size['height'] * (1 - self.distance) / 2)
+        bottom = size['height'] - top
+        if direction == "down":
+            self.swipe(x, bottom, x, top)
+        else:
+            self.swipe(x, top, x, bottom)
+    
+    def scroll_until(self, predicate, direction="down", max_scrolls=50):
+        """
+        Scroll until a predicate holds or the end of the list is reached
+        
+        :param predicate: Function of a PageSnapshot returning a truthy value when done
+        :param direction: 'down' or 'up'
+        :param max_scrolls: Maximum number of gestures
+        :return: The predicate's truthy result, or None if the end was reached first
+        """
+        previous_hash = None
+        for scrolls in range(max_scrolls + 1):
+            snapshot = PageSnapshot.capture(self.driver)
+            result = predicate(snapshot)
+            if result:
+                logger.debug(f"Scroll predicate satisfied after {scrolls} scrolls")
+                return result
+            page_hash = hashlib.sha1(snapshot.source.encode('utf-8')).digest()
+            if page_hash == previous_hash:
+                logger.debug(f"End of list reached after {scrolls} scrolls")
+                return None
+            previous_hash = page_hash
+            if scrolls < max_scrolls:
+                self.scroll(direction)
+        logger.warning(f"Scroll predicate not satisfied after {max_scrolls} scrolls")
+        return None
+    
+    def scroll_to_text(self, text, max_scrolls=50):
+        """Scroll down until an element whose text contains `text` is on screen."""
+        def contains_text(snapshot):
+            return any(text in snapshot.text(node) for node in snapshot.root.iter())
+        return bool(self.scroll_until(contains_text, max_scrolls=max_scrolls))
+    
+    def collect(self, item_locator, read_item, key=None, max_scrolls=50):
+        """
+        Read every item of a long list, scrolling from the current position to the end
+        
+        Consecutive screens overlap; the longest run of items at the end of what has been read
+        that reappears at the top of the new screen is skipped, so repeated identical items
+        elsewhere in the list are kept.
+        
+        :param item_locator: Locator of the list items (ID or accessibility ID)
+        :param read_item: Function (snapshot, node) -> record
+        :param key: Function record -> identity used to match overlapping items (the record itself if None)
+        :param max_scrolls: Maximum number of gestures
+        :return: List of records in list order
+        """
+        key = key or (lambda record: record)
+        records = []
+        
+        def read_screen(snapshot):
+            screen = [read_item(snapshot, node) for node in snapshot.find_all(item_locator)]
+            keys = [key(record) for record in records[-len(screen):]] if screen else []
+            overlap = 0
+            for size in range(min(len(keys), len(screen)), 0, -1):
+                if keys[-size:] == [key(record) for record in screen[:size]]:
+                    overlap = size
+                    break
+            records.extend(screen[overlap:])
+            return False
+        
+        self.scroll_until(read_screen, max_scrolls=max_scrolls)
+        return records
+
+
 def swipe(driver, start_x, start_y, end_x, end_y, duration=None):
-    """Perform a swipe gesture."""
+    """Perform a swipe gesture with a W3C touch pointer."""
     try:
-        if duration is None:
-            driver.swipe(start_x, start_y, end_x, end_y)
-        else:
-            driver.swipe(start_x, start_y, end_x, end_y, duration)
+        ScrollEngine(driver).swipe(start_x, start_y, end_x, end_y, duration)
         logger.info(f"Swiped from ({start_x}, {start_y}) to ({end_x}, {end_y})")
         return True
     except Exception as e:
@@ -195,20 +568,18 @@ def swipe(driver, start_x, start_y, end_x, end_y, duration=None):
 
 def swipe_down(driver):
     """Swipe down on the screen."""
-    size = driver.get_window_size()
+    size = get_window_size(driver)
     start_x = size['width'] // 2
     start_y = size['height'] // 3
     end_y = size['height'] * 2 // 3
-    
     return swipe(driver, start_x, start_y, start_x, end_y)
 
 def swipe_up(driver):
     """Swipe up on the screen."""
-    size = driver.get_window_size()
+    size = get_window_size(driver)
     start_x = size['width'] // 2
     start_y = size['height'] * 2 // 3
     end_y = size['height'] // 3
-    
     return swipe(driver, start_x, start_y, start_x, end_y)
 
 def tap_back_button(driver):
@@ -232,7 +603,6 @@ def enable_network_connection(driver, airplane_mode=False, wifi=True, data=True)
             mode += 2
         if data:
             mode += 4
-        
         driver.set_network_connection(mode)
         logger.info(f"Set network connection to: airplane={airplane_mode}, wifi={wifi}, data={data}")
         return True
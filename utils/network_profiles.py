@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Named network conditions for mobile performance runs, and per-step time-to-content recording.
+
+A profile is applied either to an Android emulator through its console ('network speed' and
+'network delay', sent with 'mobile: execEmuConsoleCommand') or by a local throttling proxy
+that relays the app's backend traffic with added latency, bandwidth limits and packet loss.
+Emulators cannot drop packets, so profiles with loss need the proxy; so do iOS and real devices.
+
+    python utils/network_profiles.py --list
+    python utils/network_profiles.py --proxy lossy --upstream api.test.mybank.example.com:443 --port 8899
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import random
+import socket
+import logging
+import argparse
+import threading
+from collections import deque
+from datetime import datetime
+from statistics import median
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.step_profiler import add_wait_observer, remove_wait_observer, step_pattern
+
+logger = logging.getLogger(__name__)
+
+# Latency is one-way delay added to every chunk (jitter is added on top at random);
+# bandwidth is in kbit/s (0 = unlimited); loss is the fraction of chunks that are "lost"
+# and arrive only after a retransmission timeout.
+NETWORK_PROFILES = {
+    "full": {"latency_ms": 0, "jitter_ms": 0, "down_kbps": 0, "up_kbps": 0, "loss": 0.0},
+    "lte": {"latency_ms": 50, "jitter_ms": 20, "down_kbps": 12000, "up_kbps": 5000, "loss": 0.0},
+    "3g": {"latency_ms": 150, "jitter_ms": 50, "down_kbps": 1600, "up_kbps": 750, "loss": 0.0},
+    "lossy": {"latency_ms": 200, "jitter_ms": 100, "down_kbps": 1000, "up_kbps": 500, "loss": 0.05},
+}
+
+# Minimum TCP retransmission timeout added to a lost chunk
+RETRANSMIT_MS = 200
+
+
+def get_network_profile(name):
+    """
+    Look up a profile
+
+    :param name: Profile name from NETWORK_PROFILES (case-insensitive)
+    :return: Profile dictionary
+    :raises ValueError: If the profile does not exist
+    """
+    profile = NETWORK_PROFILES.get(name.lower())
+    if profile is None:
+        raise ValueError(f"Unknown network profile '{name}' (choose from {', '.join(NETWORK_PROFILES)})")
+    return profile
+
+
+def apply_emulator_profile(driver, name):
+    """
+    Set an Android emulator's network speed and delay to a profile
+
+    :param driver: Appium UiAutomator2 driver of an emulator session
+    :param name: Profile name
+    """
+    profile = get_network_profile(name)
+    if profile["down_kbps"]:
+        speed = f"{profile['up_kbps']}:{profile['down_kbps']}"
+    else:
+        speed = "full"
+    if profile["latency_ms"]:
+        delay = f"{profile['latency_ms']}:{profile['latency_ms'] + profile['jitter_ms']}"
+    else:
+        delay = "none"
+    for command in (f"network speed {speed}", f"network delay {delay}"):
+        driver.execute_script('mobile: execEmuConsoleCommand', {'command': command})
+    if profile["loss"]:
+        logger.warning(f"Emulators cannot drop packets; profile '{name}' is applied without its "
+                       f"{profile['loss']:.0%} loss (use the throttling proxy for loss)")
+    logger.info(f"Applied network profile '{name}' to emulator (speed {speed}, delay {delay})")
+
+
+class ThrottlingProxy:
+    """
+    TCP relay that forwards connections to an upstream server under a network profile.
+
+    Each direction of a connection has a reader that timestamps chunks with their delivery
+    time (arrival + latency + jitter, plus a retransmission timeout for lost chunks) and a
+    writer that sends them in order no faster than the profile's bandwidth. Point the
+    app's backend URL at the proxy (10.0.2.2:<port> from an Android emulator).
+    """
+
+    def __init__(self, profile_name, upstream_host, upstream_port, listen_host="0.0.0.0", listen_port=8899):
+        """
+        Initialize the proxy
+
+        :param profile_name: Profile name from NETWORK_PROFILES
+        :param upstream_host: Host to forward connections to
+        :param upstream_port: Port to forward connections to
+        :param listen_host: Interface to listen on
+        :param listen_port: Port to listen on (0 picks a free port)
+        """
+        self.profile_name = profile_name
+        self.profile = get_network_profile(profile_name)
+        self.upstream = (upstream_host, int(upstream_port))
+        self.server = socket.create_server((listen_host, listen_port))
+        self.port = self.server.getsockname()[1]
+        self._running = False
+        self._rng = random.Random()
+
+    def start(self):
+        """Accept connections on a background thread."""
+        self._running = True
+        threading.Thread(target=self._accept, name="throttling-proxy", daemon=True).start()
+        logger.info(f"Throttling proxy ({self.profile_name}) on port {self.port} -> "
+                    f"{self.upstream[0]}:{self.upstream[1]}")
+        return self
+
+    def stop(self):
+        """Stop accepting connections; open connections end when either side closes."""
+        self._running = False
+        self.server.close()
+
+    def _accept(self):
+        while self._running:
+            try:
+                client, _ = self.server.accept()
+            except OSError:
+                break
+            try:
+                upstream = socket.create_connection(self.upstream, timeout=10)
+                upstream.settimeout(None)
+            except OSError as e:
+                logger.warning(f"Throttling proxy could not reach {self.upstream}: {e}")
+                client.close()
+                continue
+            finished = []
+            lock = threading.Lock()
+
+            def close_when_both_finished(client=client, upstream=upstream, finished=finished, lock=lock):
+                # The second direction to finish closes both sockets
+                with lock:
+                    finished.append(True)
+                    if len(finished) < 2:
+                        return
+                client.close()
+                upstream.close()
+
+            self._relay(client, upstream, self.profile["up_kbps"], close_when_both_finished)
+            self._relay(upstream, client, self.profile["down_kbps"], close_when_both_finished)
+
+    def _delay(self):
+        """Seconds a chunk is held back: latency, jitter and, for lost chunks, a retransmission"""
+        delay = self.profile["latency_ms"] + self._rng.uniform(0, self.profile["jitter_ms"])
+        if self.profile["loss"] and self._rng.random() < self.profile["loss"]:
+            delay += max(RETRANSMIT_MS, 2 * self.profile["latency_ms"])
+        return delay / 1000
+
+    def _relay(self, source, destination, kbps, on_finished):
+        queue = deque()
+        ready = threading.Condition()
+
+        def read():
+            last = 0
+            while True:
+                try:
+                    data = source.recv(16384)
+                except OSError:
+                    data = b""
+                # Delivery never overtakes an earlier chunk, as on a TCP stream
+                last = max(time.monotonic() + self._delay(), last)
+                with ready:
+                    queue.append((last, data))
+                    ready.notify()
+                if not data:
+                    break
+
+        def write():
+            while True:
+                with ready:
+                    while not queue:
+                        ready.wait()
+                    deliver_at, data = queue.popleft()
+                wait = deliver_at - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                if not data:
+                    try:
+                        destination.shutdown(socket.SHUT_WR)
+                    except OSError:
+                        pass
+                    break
+                if kbps:
+                    time.sleep(len(data) * 8 / (kbps * 1000))
+                try:
+                    destination.sendall(data)
+                except OSError:
+                    break
+            on_finished()
+
+        threading.Thread(target=read, daemon=True).start()
+        threading.Thread(target=write, daemon=True).start()
+
+
+class NetworkConditions:
+    """
+    Applies one network profile for a test run, through the emulator console or a throttling proxy.
+    """
+
+    def __init__(self, profile_name, mode="emulator", proxy_upstream=None, proxy_port=8899):
+        """
+        Initialize the conditions
+
+        :param profile_name: Profile name from NETWORK_PROFILES
+        :param mode: 'emulator' or 'proxy'
+        :param proxy_upstream: 'host:port' the proxy forwards to (proxy mode)
+        :param proxy_port: Port the proxy listens on (proxy mode)
+        """
+        get_network_profile(profile_name)
+        if mode not in ("emulator", "proxy"):
+            raise ValueError(f"Unknown network throttle mode '{mode}' (use 'emulator' or 'proxy')")
+        if mode == "proxy" and not proxy_upstream:
+            raise ValueError("Proxy mode needs network_proxy_upstream (host:port of the app backend)")
+        self.profile_name = profile_name.lower()
+        self.mode = mode
+        self.proxy = None
+        self._sessions = {}
+        if mode == "proxy":
+            host, port = proxy_upstream.rsplit(":", 1)
+            self.proxy = ThrottlingProxy(self.profile_name, host, port, listen_port=int(proxy_port)).start()
+
+    def apply(self, driver):
+        """
+        Apply the profile to a driver's device, once per session (a no-op in proxy mode)
+
+        :param driver: Appium driver
+        """
+        if self.mode != "emulator" or driver.session_id in self._sessions:
+            return
+        if driver.capabilities.get('platformName', '').lower() != 'android':
+            raise ValueError("Emulator network profiles need an Android emulator; use network_throttle_mode=proxy")
+        apply_emulator_profile(driver, self.profile_name)
+        self._sessions[driver.session_id] = driver
+
+    def close(self):
+        """Restore full speed on the emulators that were throttled and stop the proxy."""
+        for driver in self._sessions.values():
+            try:
+                apply_emulator_profile(driver, "full")
+            except Exception as e:
+                logger.warning(f"Could not restore emulator network speed: {e}")
+        self._sessions.clear()
+        if self.proxy:
+            self.proxy.stop()
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class NetworkPerfRecorder:
+    """
+    Records each step's time-to-content under a network profile.
+
+    Time-to-content is the time from the start of a step until the last explicit wait in
+    the step finished, i.e. until the content the step waited for was on screen; steps
+    without waits count their full wall time. Every step is written to a CSV trace, and
+    the run ends with a summary per step pattern (median and p90) that can be compared
+    with the summary of an earlier run to catch latency regressions.
+    """
+
+    TRACE_COLUMNS = ['profile', 'feature', 'scenario', 'step_pattern', 'step', 'status', 'wall_ms',
+                     'time_to_content_ms', 'waits']
+
+    def __init__(self, profile_name, output_dir=None):
+        """
+        Initialize the recorder
+
+        :param profile_name: Network profile the run uses
+        :param output_dir: Directory for the trace and summary (defaults to reports/profiles)
+        """
+        self.profile_name = profile_name
+        self.output_dir = output_dir or os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), 'reports', 'profiles'
+        )
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        self.trace_path = os.path.join(self.output_dir, f"network_{profile_name}_{run_id}.csv")
+        self.summary_path = os.path.join(self.output_dir, f"network_{profile_name}_{run_id}.json")
+
+        self._trace_file = open(self.trace_path, 'w', newline='')
+        self._writer = csv.writer(self._trace_file)
+        self._writer.writerow(self.TRACE_COLUMNS)
+
+        self._start = None
+        self._content_at = None
+        self._waits = 0
+        self._times = {}
+        add_wait_observer(self)
+
+    def record_wait(self, seconds):
+        """Mark the end of an explicit wait in the current step."""
+        if self._start is not None:
+            self._content_at = time.perf_counter()
+            self._waits += 1
+
+    def before_step(self, step):
+        self._start = time.perf_counter()
+        self._content_at = None
+        self._waits = 0
+
+    def after_step(self, context, step):
+        if self._start is None:
+            return
+        end = time.perf_counter()
+        wall = end - self._start
+        time_to_content = (self._content_at or end) - self._start
+        self._start = None
+
+        pattern = step_pattern(step)
+        feature = getattr(context, 'feature', None)
+        scenario = getattr(context, 'scenario', None)
+        status = getattr(step.status, 'name', step.status)
+        self._writer.writerow([
+            self.profile_name,
+            feature.name if feature else '',
+            scenario.name if scenario else '',
+            pattern,
+            step.name,
+            status,
+            f"{wall * 1000:.1f}",
+            f"{time_to_content * 1000:.1f}",
+            self._waits
+        ])
+        if status == 'passed':
+            self._times.setdefault(f"{step.keyword} {pattern}", []).append(time_to_content * 1000)
+
+    def build_summary(self):
+        """
+        Summarize passed steps by step pattern
+
+        :return: Dictionary with the profile and, per step pattern, count, median_ms and p90_ms
+        """
+        return {
+            "profile": self.profile_name,
+            "steps": {
+                pattern: {"count": len(times), "median_ms": round(median(times), 1),
+                          "p90_ms": round(_percentile(times, 0.9), 1)}
+                for pattern, times in sorted(self._times.items())
+            },
+        }
+
+    def finish(self, baseline_path=None, tolerance=1.25):
+        """
+        Close the trace, write the summary and compare it with a baseline summary
+
+        :param baseline_path: Summary JSON of an earlier run under the same profile (optional)
+        :param tolerance: Ratio of median time-to-content over the baseline that counts as a regression
+        :return: List of (step pattern, baseline median_ms, median_ms) regressions
+        """
+        remove_wait_observer(self)
+        self._trace_file.close()
+
+        summary = self.build_summary()
+        with open(self.summary_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+        logger.info(f"Network profile '{self.profile_name}' trace saved to {self.trace_path}")
+        logger.info(f"Time-to-content summary saved to {self.summary_path}")
+
+        regressions = []
+        if baseline_path:
+            with open(baseline_path, 'r') as f:
+                baseline = json.load(f)
+            if baseline.get("profile") != self.profile_name:
+                logger.warning(f"Baseline {baseline_path} was recorded under '{baseline.get('profile')}', "
+                               f"not '{self.profile_name}'")
+            for pattern, stats in summary["steps"].items():
+                before = baseline.get("steps", {}).get(pattern)
+                if before and stats["median_ms"] > before["median_ms"] * tolerance:
+                    regressions.append((pattern, before["median_ms"], stats["median_ms"]))
+            for pattern, before_ms, after_ms in regressions:
+                logger.warning(f"Time-to-content regression under '{self.profile_name}': {pattern} "
+                               f"{before_ms:.0f}ms -> {after_ms:.0f}ms")
+        return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Network profiles for mobile performance runs')
+    parser.add_argument('--list', action='store_true', help='List the network profiles')
+    parser.add_argument('--proxy', metavar='PROFILE', help='Run a throttling proxy with this profile until interrupted')
+    parser.add_argument('--upstream', help='host:port the proxy forwards to')
+    parser.add_argument('--port', type=int, default=8899, help='Port the proxy listens on (default: 8899)')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if args.list or not args.proxy:
+        for name, profile in NETWORK_PROFILES.items():
+            print(f"{name:<6} latency {profile['latency_ms']}+{profile['jitter_ms']}ms, "
+                  f"down {profile['down_kbps'] or 'unlimited'} kbps, up {profile['up_kbps'] or 'unlimited'} kbps, "
+                  f"loss {profile['loss']:.0%}")
+        return
+    if not args.upstream:
+        parser.error('--proxy needs --upstream host:port')
+    host, port = args.upstream.rsplit(":", 1)
+    proxy = ThrottlingProxy(args.proxy, host, port, listen_port=args.port).start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        proxy.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Sharded, reproducible test data generation across worker processes.
+
+Users are partitioned into contiguous shards; every user, account and payee list
+is generated from a seed derived from the run seed and its own index, so a given
+seed produces byte-identical files whatever the number of workers:
+
+    python utils/parallel_data_generator.py --seed 42 --users 100 --transactions 10000 --workers 8
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import tempfile
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.data_generator import DataGenerator
+from utils.data_writers import JsonlWriter, open_writer
+
+ENTITIES = ("users", "accounts", "transactions", "balance_snapshots")
+
+
+def derive_seed(seed, *parts):
+    """
+    Derive an independent 64-bit seed for one part of the data set
+
+    :param seed: Run seed
+    :param parts: Identifying parts, e.g. ('user', 3) or ('account', 3, 1)
+    :return: Integer seed
+    """
+    key = ":".join(str(part) for part in (seed,) + parts)
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], 'big')
+
+
+def _generate_shard(shard_dir, user_indices, seed, reference_date, num_accounts_per_user, num_transactions, bulk,
+                    chunk_size, ledger):
+    """
+    Generate the users in one shard into uncompressed JSON lines files in shard_dir
+    """
+    generator = DataGenerator(reference_date=reference_date)
+    writers = {name: JsonlWriter(os.path.join(shard_dir, f"{name}.jsonl")) for name in ENTITIES}
+    try:
+        for i in user_indices:
+            records = generator.generate_user_records(
+                i, num_accounts_per_user, num_transactions, bulk, chunk_size,
+                user_seed=derive_seed(seed, "user", i),
+                account_seeds=[derive_seed(seed, "account", i, j) for j in range(num_accounts_per_user)],
+                ledger=ledger
+            )
+            for name, record in records:
+                if isinstance(record, pd.DataFrame):
+                    writers[name].write_frame(record)
+                else:
+                    writers[name].write(record)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return shard_dir
+
+
+def _shards(num_users, workers):
+    size, remainder = divmod(num_users, workers)
+    start = 0
+    for k in range(workers):
+        end = start + size + (1 if k < remainder else 0)
+        if end > start:
+            yield range(start, end)
+        start = end
+
+
+def generate_sharded_test_data_set(seed, num_users=3, num_accounts_per_user=2, num_transactions=50, num_payees=5,
+                                   workers=None, bulk=False, output_format="jsonl", chunk_size=100000,
+                                   reference_date=None, output_dir=None, ledger=True, entities=None):
+    """
+    Generate a test data set in parallel and merge the shards into one file per entity
+
+    :param seed: Run seed
+    :param num_users: Number of test users to generate
+    :param num_accounts_per_user: Number of accounts per user
+    :param num_transactions: Number of transactions per account
+    :param num_payees: Number of payees to generate
+    :param workers: Number of worker processes (CPU count if None)
+    :param bulk: Generate transactions with DataGenerator.generate_transactions_bulk
+    :param output_format: 'jsonl', 'parquet' or 'json'
+    :param chunk_size: Transactions per bulk chunk / Parquet row group
+    :param reference_date: Date that relative dates count back from (today at midnight if None)
+    :param output_dir: Output directory (DataGenerator's test_data directory if None)
+    :param ledger: Compute balance_after and daily balance snapshots (see DataGenerator.apply_ledger)
+    :param entities: Entity names to write, e.g. {'payees'} (every entity if None); shards are only
+                     generated when a user, account, transaction or snapshot file is requested
+    :return: Dictionary of entity name to output path
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    reference_date = reference_date or datetime.combine(datetime.now().date(), datetime.min.time())
+    generator = DataGenerator(reference_date=reference_date)
+    output_dir = output_dir or generator.test_data_path
+    os.makedirs(output_dir, exist_ok=True)
+    sharded = [name for name in (ENTITIES if ledger else ENTITIES[:-1]) if entities is None or name in entities]
+
+    with tempfile.TemporaryDirectory(dir=output_dir, prefix=".shards-") as shards_root:
+        tasks = []
+        for k, user_indices in enumerate(_shards(num_users, workers) if sharded else []):
+            shard_dir = os.path.join(shards_root, f"shard-{k:04d}")
+            os.makedirs(shard_dir)
+            tasks.append((shard_dir, user_indices, seed, reference_date, num_accounts_per_user, num_transactions,
+                          bulk, chunk_size, ledger))
+
+        if len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=len(tasks)) as executor:
+                shard_dirs = list(executor.map(_generate_shard, *zip(*tasks)))
+        else:
+            shard_dirs = [_generate_shard(*task) for task in tasks]
+
+        paths = {}
+        for name in sharded:
+            shard_files = [os.path.join(shard_dir, f"{name}.jsonl") for shard_dir in shard_dirs]
+            paths[name] = _merge(shard_files, output_dir, name, output_format, chunk_size)
+
+        if entities is None or "payees" in entities:
+            generator.reseed(derive_seed(seed, "payees"))
+            payees = [generator.generate_payee() for _ in range(num_payees)]
+            paths["payees"] = _write_records(payees, output_dir, "payees", output_format, chunk_size)
+
+    return paths
+
+
+def _merge(shard_files, output_dir, name, output_format, chunk_size):
+    """
+    Concatenate shard files in shard order into the final output file
+    """
+    if output_format == "json":
+        records = []
+        for path in shard_files:
+            with open(path, 'r', encoding='utf-8') as f:
+                records.extend(json.loads(line) for line in f)
+        return _write_records(records, output_dir, name, output_format, chunk_size)
+
+    writer = open_writer(output_dir, name, output_format, chunk_size)
+    try:
+        for path in shard_files:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if output_format == "jsonl":
+                        writer.write_line(line)
+                    else:
+                        writer.write(json.loads(line))
+    finally:
+        writer.close()
+    print(f"Saved {writer.count} records to {writer.path}")
+    return writer.path
+
+
+def _write_records(records, output_dir, name, output_format, chunk_size):
+    if output_format == "json":
+        path = os.path.join(output_dir, f"{name}.json")
+        with open(path, 'w') as f:
+            json.dump(records, f, indent=4, default=str)
+        print(f"Saved {len(records)} records to {path}")
+        return path
+
+    writer = open_writer(output_dir, name, output_format, chunk_size)
+    try:
+        for record in records:
+            writer.write(record)
+    finally:
+        writer.close()
+    print(f"Saved {writer.count} records to {writer.path}")
+    return writer.path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate reproducible test data across worker processes')
+    parser.add_argument('--seed', type=int, required=True, help='Run seed')
+    parser.add_argument('--users', type=int, default=3, help='Number of users (default: 3)')
+    parser.add_argument('--accounts', type=int, default=2, help='Accounts per user (default: 2)')
+    parser.add_argument('--transactions', type=int, default=50, help='Transactions per account (default: 50)')
+    parser.add_argument('--payees', type=int, default=5, help='Number of payees (default: 5)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--bulk', action='store_true', help='Generate transactions in bulk mode')
+    parser.add_argument('--format', choices=['jsonl', 'parquet', 'json'], default='jsonl',
+                        help='Output format (default: jsonl)')
+    parser.add_argument('--reference-date', help='Date relative dates count back from, YYYY-MM-DD (default: today)')
+    parser.add_argument('--output-dir', help='Output directory (default: test_data)')
+
+    args = parser.parse_args()
+    generate_sharded_test_data_set(
+        args.seed, args.users, args.accounts, args.transactions, args.payees, args.workers, args.bulk, args.format,
+        reference_date=datetime.strptime(args.reference_date, "%Y-%m-%d") if args.reference_date else None,
+        output_dir=args.output_dir
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -5,47 +5,38 @@ import logging
 import requests
 from PIL import Image
 from io import BytesIO
+from utils.artifact_store import get_artifact_store, sanitize_filename
 
 class ReportingUtils:
     """
     Utility class for test reporting functions, including:
-    - Screenshot capture
+    - Screenshot capture (through the run's artifact store)
     - Test results logging
     - Report generation helpers
     """
     
     def __init__(self):
         self.reports_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'reports')
-        self.screenshots_dir = os.path.join(self.reports_dir, 'screenshots')
         self.logger = logging.getLogger('reporting')
         
         # Create directories if they don't exist
-        os.makedirs(self.screenshots_dir, exist_ok=True)
+        os.makedirs(self.reports_dir, exist_ok=True)
     
-    def take_screenshot(self, driver, scenario_name, step_name=None):
+    def take_screenshot(self, driver, scenario_name, step_name=None, source="web"):
         """
-        Take a screenshot and save it to the screenshots directory
+        Take a screenshot and add it to the run's artifact store
         
-        :param driver: Selenium WebDriver instance
+        :param driver: Selenium WebDriver or Appium driver instance
         :param scenario_name: Name of the scenario
         :param step_name: Optional name of the step
-        :return: Path to the saved screenshot
+        :param source: 'web' or 'mobile'
+        :return: Path of the written screenshot, or None on failure
         """
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        scenario_name = self._sanitize_filename(scenario_name)
-        
-        if step_name:
-            step_name = self._sanitize_filename(step_name)
-            filename = f"{timestamp}_{scenario_name}_{step_name}.png"
-        else:
-            filename = f"{timestamp}_{scenario_name}.png"
-        
-        file_path = os.path.join(self.screenshots_dir, filename)
-        
         try:
-            driver.save_screenshot(file_path)
-            self.logger.info(f"Screenshot saved to {file_path}")
-            return file_path
+            path = get_artifact_store().add_screenshot(driver, scenario_name, step_name, source).wait()
+            if path:
+                self.logger.info(f"Screenshot saved to {path}")
+            return path
         except Exception as e:
             self.logger.error(f"Failed to take screenshot: {e}")
             return None
@@ -57,16 +48,7 @@ class ReportingUtils:
         :param name: Name to sanitize
         :return: Sanitized name
         """
-        # Replace spaces with underscores
-        name = name.replace(' ', '_')
-        
-        # Remove invalid filename characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            name = name.replace(char, '')
-        
-        # Limit length
-        return name[:50]
+        return sanitize_filename(name)
     
     def capture_full_page_screenshot(self, driver, scenario_name, step_name=None):
         """
@@ -77,17 +59,6 @@ class ReportingUtils:
         :param step_name: Optional name of the step
         :return: Path to the saved screenshot
         """
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        scenario_name = self._sanitize_filename(scenario_name)
-        
-        if step_name:
-            step_name = self._sanitize_filename(step_name)
-            filename = f"{timestamp}_{scenario_name}_{step_name}_full.png"
-        else:
-            filename = f"{timestamp}_{scenario_name}_full.png"
-        
-        file_path = os.path.join(self.screenshots_dir, filename)
-        
         try:
             # Get the total height of the page
             total_width = driver.execute_script("return document.body.offsetWidth")
@@ -123,10 +94,12 @@ class ReportingUtils:
                 box = (rect[0], rect[1], rect[0] + rect[2], rect[1] + rect[3])
                 stitched_image.paste(screenshot, box)
             
-            # Save the stitched image
-            stitched_image.save(file_path)
-            self.logger.info(f"Full page screenshot saved to {file_path}")
-            return file_path
+            # Hand the stitched image to the artifact store, which encodes it in the background
+            artifact = get_artifact_store().add_image(stitched_image, scenario_name, step_name, kind="full_page")
+            path = artifact.wait()
+            if path:
+                self.logger.info(f"Full page screenshot saved to {path}")
+            return path
         except Exception as e:
             self.logger.error(f"Failed to take full page screenshot: {e}")
             return None
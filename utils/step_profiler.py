@@ -0,0 +1,212 @@
+import csv
+import logging
+import os
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.driver_instrumentation import CommandListener
+
+logger = logging.getLogger(__name__)
+
+# Objects with record_wait(seconds) that currently receive wait timings (profilers of the running test run)
+_wait_observers = []
+
+
+def _install_wait_hooks():
+    """Wrap WebDriverWait.until/until_not once so time spent in waits is attributed to the active step."""
+    if getattr(WebDriverWait, '_step_profiler_hooked', False):
+        return
+
+    original_until = WebDriverWait.until
+    original_until_not = WebDriverWait.until_not
+
+    def until(self, method, message=""):
+        start = time.perf_counter()
+        try:
+            return original_until(self, method, message)
+        finally:
+            elapsed = time.perf_counter() - start
+            for observer in _wait_observers:
+                observer.record_wait(elapsed)
+
+    def until_not(self, method, message=""):
+        start = time.perf_counter()
+        try:
+            return original_until_not(self, method, message)
+        finally:
+            elapsed = time.perf_counter() - start
+            for observer in _wait_observers:
+                observer.record_wait(elapsed)
+
+    WebDriverWait.until = until
+    WebDriverWait.until_not = until_not
+    WebDriverWait._step_profiler_hooked = True
+
+
+def add_wait_observer(observer):
+    """
+    Start passing the duration of every WebDriverWait to observer.record_wait(seconds)
+
+    :param observer: Object with a record_wait(seconds) method
+    """
+    _install_wait_hooks()
+    if observer not in _wait_observers:
+        _wait_observers.append(observer)
+
+
+def remove_wait_observer(observer):
+    """Stop passing wait durations to an observer."""
+    if observer in _wait_observers:
+        _wait_observers.remove(observer)
+
+
+def step_pattern(step):
+    """
+    Get the step text with matched arguments replaced by their parameter names
+
+    :param step: Behave step
+    :return: Pattern such as 'I have a checking account with balance of ${balance}'
+    """
+    match = getattr(step, 'match', None)
+    arguments = getattr(match, 'arguments', None) or []
+    pattern = step.name
+
+    # Replace from the end so earlier offsets stay valid
+    for argument in sorted(arguments, key=lambda arg: arg.start, reverse=True):
+        placeholder = "{%s}" % (argument.name or "arg")
+        pattern = pattern[:argument.start] + placeholder + pattern[argument.end:]
+
+    return pattern
+
+
+class _StepTiming:
+    """Counters collected while a single step is running."""
+
+    __slots__ = ('start', 'commands', 'wait_time')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.commands = 0
+        self.wait_time = 0.0
+
+
+class StepProfiler(CommandListener):
+    """
+    Records wall time, WebDriver command count and wait time for every step.
+
+    Each step is appended to a CSV trace as it finishes, and a top-N report
+    grouped by step pattern is written at the end of the run.
+    """
+
+    TRACE_COLUMNS = ['feature', 'scenario', 'step_pattern', 'step', 'status', 'wall_ms', 'commands', 'wait_ms']
+
+    def __init__(self, output_dir=None):
+        """
+        Initialize the profiler
+
+        :param output_dir: Directory for trace and report files (defaults to reports/profiles)
+        """
+        self.output_dir = output_dir or os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), 'reports', 'profiles'
+        )
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        self.trace_path = os.path.join(self.output_dir, f"step_trace_{run_id}.csv")
+        self.report_path = os.path.join(self.output_dir, f"step_report_{run_id}.txt")
+
+        self._trace_file = open(self.trace_path, 'w', newline='')
+        self._writer = csv.writer(self._trace_file)
+        self._writer.writerow(self.TRACE_COLUMNS)
+
+        self._current = None
+        self._stats = defaultdict(lambda: {'count': 0, 'wall': 0.0, 'max': 0.0, 'commands': 0, 'wait': 0.0})
+
+    def start(self):
+        """Start collecting wait timings for this run."""
+        add_wait_observer(self)
+
+    def after_command(self, command, params, elapsed, error=None):
+        if self._current is not None:
+            self._current.commands += 1
+
+    def record_wait(self, seconds):
+        """Add time spent inside an explicit wait to the current step."""
+        if self._current is not None:
+            self._current.wait_time += seconds
+
+    def before_step(self, step):
+        self._current = _StepTiming()
+
+    def after_step(self, context, step):
+        timing = self._current
+        self._current = None
+        if timing is None:
+            return
+
+        wall = time.perf_counter() - timing.start
+        pattern = step_pattern(step)
+        feature = getattr(context, 'feature', None)
+        scenario = getattr(context, 'scenario', None)
+
+        self._writer.writerow([
+            feature.name if feature else '',
+            scenario.name if scenario else '',
+            pattern,
+            step.name,
+            getattr(step.status, 'name', step.status),
+            f"{wall * 1000:.1f}",
+            timing.commands,
+            f"{timing.wait_time * 1000:.1f}"
+        ])
+
+        stats = self._stats[f"{step.keyword} {pattern}"]
+        stats['count'] += 1
+        stats['wall'] += wall
+        stats['max'] = max(stats['max'], wall)
+        stats['commands'] += timing.commands
+        stats['wait'] += timing.wait_time
+
+    def build_report(self, top_n=20):
+        """
+        Build the top-N report of step patterns ordered by total wall time
+
+        :param top_n: Number of step patterns to include
+        :return: Report text
+        """
+        ranked = sorted(self._stats.items(), key=lambda item: item[1]['wall'], reverse=True)[:top_n]
+
+        lines = [
+            f"Top {len(ranked)} steps by total wall time",
+            f"{'total_s':>9} {'count':>6} {'mean_ms':>9} {'max_ms':>9} {'cmds/step':>9} {'wait%':>6}  step",
+        ]
+        for pattern, stats in ranked:
+            mean_ms = stats['wall'] / stats['count'] * 1000
+            wait_pct = (stats['wait'] / stats['wall'] * 100) if stats['wall'] else 0.0
+            lines.append(
+                f"{stats['wall']:>9.2f} {stats['count']:>6} {mean_ms:>9.1f} {stats['max'] * 1000:>9.1f} "
+                f"{stats['commands'] / stats['count']:>9.1f} {wait_pct:>5.0f}%  {pattern}"
+            )
+        return "\n".join(lines)
+
+    def finish(self, top_n=20):
+        """
+        Close the trace and write the top-N report
+
+        :param top_n: Number of step patterns to include in the report
+        :return: Path to the report file
+        """
+        remove_wait_observer(self)
+
+        self._trace_file.close()
+
+        report = self.build_report(top_n)
+        with open(self.report_path, 'w') as f:
+            f.write(report + "\n")
+
+        logger.info(f"Step trace saved to {self.trace_path}")
+        logger.info(f"Step profile report saved to {self.report_path}\n{report}")
+        return self.report_path
@@ -0,0 +1,100 @@
+import re
+from functools import lru_cache
+
+# Category rules in priority order: the first rule with a keyword anywhere in the description wins
+CATEGORY_RULES = [
+    ("Cash", ["withdrawal"]),
+    ("Income", ["deposit"]),
+    ("Interest", ["interest"]),
+    ("Transfer", ["transfer"]),
+    ("Bill Payment", ["bill payment"]),
+    ("Dining", ["restaurant", "starbucks"]),
+    ("Shopping", ["amazon", "walmart", "target"]),
+    ("Entertainment", ["netflix"]),
+    ("Transportation", ["uber"]),
+    ("Auto & Transport", ["gas"]),
+    ("Groceries", ["grocery"]),
+]
+DEFAULT_CATEGORY = "Miscellaneous"
+
+
+class TransactionCategorizer:
+    """
+    Keyword rule engine that maps transaction descriptions to categories.
+
+    All keywords are compiled once into a single lookahead alternation, so one scan of
+    the lowercased description finds every keyword occurrence (including overlapping
+    ones); the matched rule with the highest priority decides the category.
+    """
+
+    def __init__(self, rules=None, default=DEFAULT_CATEGORY, cache_size=4096):
+        """
+        Initialize the categorizer
+
+        :param rules: List of (category, keywords) in priority order (CATEGORY_RULES if None)
+        :param default: Category when no keyword matches
+        :param cache_size: Number of distinct descriptions to memoize
+        """
+        self.rules = rules or CATEGORY_RULES
+        self.default = default
+        self._priority = {}
+        for priority, (category, keywords) in enumerate(self.rules):
+            for keyword in keywords:
+                self._priority.setdefault(keyword.lower(), priority)
+
+        # At one position the alternation tries higher-priority keywords first
+        keywords = sorted(self._priority, key=lambda keyword: (self._priority[keyword], -len(keyword)))
+        self._pattern = re.compile("(?=(" + "|".join(re.escape(keyword) for keyword in keywords) + "))")
+        self.categorize = lru_cache(maxsize=cache_size)(self._categorize)
+
+    def _categorize(self, description):
+        """
+        Get the category for a description
+
+        :param description: Transaction description
+        :return: Category string
+        """
+        matches = self._pattern.findall(description.lower())
+        best = min(map(self._priority.__getitem__, matches), default=len(self.rules))
+        return self.rules[best][0] if best < len(self.rules) else self.default
+
+    def categorize_many(self, descriptions):
+        """
+        Categorize a column of descriptions, categorizing each distinct description once
+
+        :param descriptions: Iterable of descriptions
+        :return: List of categories
+        """
+        categories = {}
+        result = []
+        for description in descriptions:
+            category = categories.get(description)
+            if category is None:
+                category = categories[description] = self.categorize(description)
+            result.append(category)
+        return result
+
+    def matches(self, description, category):
+        """
+        Check whether a displayed category agrees with the rules for a description
+
+        :param description: Transaction description
+        :param category: Category shown by the app
+        :return: True if the category is the expected one (case-insensitive)
+        """
+        return self.categorize(description).lower() == category.strip().lower()
+
+
+_default_categorizer = None
+
+
+def get_categorizer():
+    """
+    Get the shared categorizer for the default rules
+
+    :return: TransactionCategorizer
+    """
+    global _default_categorizer
+    if _default_categorizer is None:
+        _default_categorizer = TransactionCategorizer()
+    return _default_categorizer
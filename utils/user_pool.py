@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Pool of provisioned test users leased exclusively to scenarios.
+
+    python utils/user_pool.py --provision 20      # create 20 users through the admin API
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api_clients.user_management_api import UserManagementAPI
+from utils.data_generator import DataGenerator
+from utils.lease_broker import LeaseBroker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'test_data', 'user_pool')
+
+# Shared accounts named in feature files; scenarios holding a lease use their leased user instead
+SHARED_USERNAMES = {"testuser", "testuser1", "testuser2"}
+
+# Plain config.json users that a leased user can stand in for (admin_user and 2fa_user need their role / 2FA)
+SWAPPABLE_CONFIG_USERS = ("standard_user", "premium_user")
+
+
+def _load_config():
+    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.json')
+    with open(config_path, 'r') as f:
+        return json.load(f)
+
+
+class UserPool:
+    """
+    Provisions users through UserManagementAPI and leases them to one scenario at a time.
+    """
+
+    def __init__(self, pool_dir=None, api_base_url=None):
+        """
+        Initialize the pool
+
+        :param pool_dir: Directory holding the pool (one per API base URL under test_data/user_pool if None,
+                         since pooled users only exist on the backend they were created on)
+        :param api_base_url: API base URL (APIClient default if None)
+        """
+        self.config = _load_config()
+        self.api_base_url = api_base_url or os.environ.get('API_BASE_URL') or self.config.get('api_base_url')
+        if pool_dir is None:
+            url_hash = hashlib.sha1(self.api_base_url.encode()).hexdigest()[:10]
+            pool_dir = os.path.join(DEFAULT_POOL_DIR, url_hash)
+        self.broker = LeaseBroker(pool_dir)
+        self._admin_api = None
+
+    def _admin(self, refresh=False):
+        """Get a UserManagementAPI client authenticated as the admin user (logging in again if refresh)"""
+        if self._admin_api is None or refresh:
+            admin = self.config.get('users', {}).get('admin_user', {})
+            self._admin_api = UserManagementAPI(base_url=self.api_base_url)
+            self._admin_api.authenticate(admin.get('username'), admin.get('password'))
+        return self._admin_api
+
+    def _admin_request(self, method, *args, **kwargs):
+        """Call a UserManagementAPI method as the admin user, logging in again once if the token has expired"""
+        response = getattr(self._admin(), method)(*args, **kwargs)
+        if response.status_code == 401:
+            logger.info("Admin token rejected, authenticating again")
+            response = getattr(self._admin(refresh=True), method)(*args, **kwargs)
+        return response
+
+    def provision(self, count, workers=8, generator=None):
+        """
+        Create users in bulk and add them to the pool
+
+        :param count: Number of users to create
+        :param workers: Concurrent create_user requests
+        :param generator: DataGenerator to draw users from (a new one if None)
+        :return: Number of users added
+        """
+        generator = generator or DataGenerator()
+        users = [generator.generate_user() for _ in range(count)]
+        api = self._admin()
+
+        def create(user):
+            response = api.create_user(user)
+            if response.status_code not in (200, 201):
+                logger.error(f"Could not provision {user['username']}: {response.status_code} - {response.text}")
+                return None
+            return user
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            created = [user for user in executor.map(create, users) if user]
+
+        for user in created:
+            self.broker.add(user["username"], user)
+        logger.info(f"Provisioned {len(created)} of {count} users into {self.broker.pool_dir}")
+        return len(created)
+
+    def lease(self, timeout=60):
+        """
+        Lease a user exclusively
+
+        :param timeout: Seconds to wait for a free user
+        :return: Lease whose data is the user dictionary
+        """
+        self.broker.reclaim_stale()
+        lease = self.broker.acquire(timeout)
+        logger.debug(f"Leased user {lease.resource_id}")
+        return lease
+
+    def release(self, lease):
+        """
+        Reset a leased user (unlock, clear failed attempts, restore the pooled password) and return it to the pool
+
+        A user that cannot be reset may still be locked or have another password, so it is
+        retired from the pool instead of being handed to a later scenario.
+
+        :param lease: Lease from lease()
+        :return: True if the user was returned to the pool, False if it was retired
+        """
+        try:
+            failures = [
+                f"{name}: {response.status_code}" for name, response in (
+                    ("status", self._admin_request("set_user_status", lease.resource_id, "active",
+                                                   reason="Returned to test user pool")),
+                    ("password", self._admin_request("set_user_password", lease.resource_id, lease.data["password"])),
+                ) if response.status_code >= 400
+            ]
+        except Exception as e:
+            failures = [str(e)]
+        if failures:
+            logger.warning(f"Could not reset user {lease.resource_id} ({'; '.join(failures)}), retiring it from the pool")
+            self.broker.retire(lease)
+            return False
+        self.broker.release(lease)
+        logger.debug(f"Returned user {lease.resource_id}")
+        return True
+
+    def available(self):
+        """Number of users that can be leased"""
+        return self.broker.available()
+
+    def reset(self):
+        """Delete the pool, e.g. after a run against a backend that is discarded with it"""
+        shutil.rmtree(self.broker.pool_dir, ignore_errors=True)
+
+
+def leased_credentials(context, username, password=None):
+    """
+    Swap a shared feature-file user (or a plain config.json user) for the scenario's leased user
+
+    Admin and 2FA users are never swapped, since a pooled user has neither the role nor 2FA.
+
+    :param context: Behave context
+    :param username: Username from the step
+    :param password: Valid password from the step (None for steps that deliberately use a wrong password)
+    :return: Tuple (username, password); the password stays None when None was passed
+    """
+    lease = getattr(context, 'user_lease', None)
+    config_users = context.config_data.get('users', {})
+    shared = SHARED_USERNAMES | {config_users[name]['username'] for name in SWAPPABLE_CONFIG_USERS if name in config_users}
+    if not lease or username not in shared:
+        return username, password
+    return lease.data["username"], lease.data["password"] if password is not None else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Provision test users into the leasing pool')
+    parser.add_argument('--provision', type=int, required=True, help='Number of users to create')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent create requests (default: 8)')
+    parser.add_argument('--pool-dir', help='Pool directory (default: test_data/user_pool/<hash of the API base URL>)')
+    parser.add_argument('--api-base-url', help='API base URL (default: from config)')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    pool = UserPool(args.pool_dir, args.api_base_url)
+    pool.provision(args.provision, args.workers)
+    print(f"{pool.available()} users available in {pool.broker.pool_dir}")
+
+
+if __name__ == '__main__':
+    main()